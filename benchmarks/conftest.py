@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.harness import Baseline, FlowBenchmark
+from replica.server import ReplicaConfig, ReplicaServer
+
+BENCH_DIR = Path(__file__).resolve().parent
+_RESULTS = []
+# Przepływy bez wpisu w baseline - porównanie pominięte, raportowane w podsumowaniu.
+_NO_BASELINE = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("idream-bench", "Benchmarki page objectów na lokalnej replice")
+    group.addoption("--bench-iterations", type=int, default=10, help="Liczba mierzonych iteracji przepływu.")
+    group.addoption("--bench-warmup", type=int, default=1, help="Iteracje rozgrzewające (niemierzone).")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="Dopuszczalny wzrost p50/p90 względem baseline (0.25 = 25%%).")
+    group.addoption("--bench-baseline", default=str(BENCH_DIR / "baseline.json"), help="Plik z baseline.")
+    group.addoption("--bench-update-baseline", action="store_true", default=False,
+                    help="Zapisuje bieżące wyniki jako nowy baseline zamiast porównywać.")
+    group.addoption("--replica-latency-ms", type=int, default=0, help="Opóźnienie każdej odpowiedzi repliki.")
+    group.addoption("--replica-popup-delay-ms", type=int, default=-1,
+                    help="Po ilu ms replika pokazuje popup 'bhr' (-1 = wyłączony).")
+
+
+@pytest.fixture(scope="session")
+def replica_server(pytestconfig):
+    config = ReplicaConfig(
+        latency_ms=pytestconfig.getoption("--replica-latency-ms"),
+        popup_delay_ms=pytestconfig.getoption("--replica-popup-delay-ms"),
+    )
+    with ReplicaServer(config) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def baseline(pytestconfig) -> Baseline:
+    return Baseline(pytestconfig.getoption("--bench-baseline"), pytestconfig.getoption("--bench-threshold"))
+
+
+@pytest.fixture(scope="session")
+def flow_benchmark(pytestconfig, browser) -> FlowBenchmark:
+    return FlowBenchmark(browser, pytestconfig.getoption("--bench-iterations"), pytestconfig.getoption("--bench-warmup"))
+
+
+@pytest.fixture
+def check_flow(pytestconfig, baseline):
+    """Zapisuje wynik przepływu i oblewa test, jeśli przepływ zwolnił ponad próg względem baseline."""
+    update = pytestconfig.getoption("--bench-update-baseline")
+
+    def check(stats):
+        _RESULTS.append(stats)
+        if update:
+            return
+        if stats.flow not in baseline.flows:
+            _NO_BASELINE.append(stats.flow)
+            return
+        regression = baseline.regression(stats)
+        assert regression is None, f"Regresja przepływu '{stats.flow}': {regression}"
+
+    return check
+
+
+def pytest_sessionfinish(session):
+    if not _RESULTS:
+        return
+    results_path = BENCH_DIR / "results" / "latest.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps([vars(stats) for stats in _RESULTS], indent=2), encoding="utf-8")
+
+    config = session.config
+    if config.getoption("--bench-update-baseline"):
+        Baseline(config.getoption("--bench-baseline"), config.getoption("--bench-threshold")).save(_RESULTS)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _RESULTS:
+        return
+    terminalreporter.section("Przepływy page objectów (ms)")
+    terminalreporter.write_line(f"{'przepływ':<28}{'n':>4}{'p50':>9}{'p90':>9}{'p95':>9}{'max':>9}")
+    for stats in _RESULTS:
+        terminalreporter.write_line(
+            f"{stats.flow:<28}{stats.iterations:>4}{stats.p50_ms:>9.0f}{stats.p90_ms:>9.0f}"
+            f"{stats.p95_ms:>9.0f}{stats.max_ms:>9.0f}"
+        )
+    if _NO_BASELINE:
+        terminalreporter.write_line(
+            f"Brak baseline dla: {', '.join(_NO_BASELINE)} - porównanie pominięte "
+            f"(zapisz bieżące wyniki z --bench-update-baseline)."
+        )
@@ -0,0 +1,87 @@
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from playwright.sync_api import Browser, Page
+
+
+@dataclass
+class FlowStats:
+    flow: str
+    iterations: int
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, flow: str, samples: list[float]) -> "FlowStats":
+        ordered = sorted(samples)
+        if len(ordered) > 1:
+            cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+            p50, p90, p95 = cuts[49], cuts[89], cuts[94]
+        else:
+            p50 = p90 = p95 = ordered[0]
+        return cls(flow=flow, iterations=len(ordered), p50_ms=p50, p90_ms=p90, p95_ms=p95, max_ms=ordered[-1])
+
+
+class FlowBenchmark:
+    """
+    Mierzy pojedynczy przepływ page objectów: każda iteracja dostaje świeży kontekst
+    (bez cookies, więc nakładki pojawiają się jak u nowego klienta), `setup` nie jest mierzony.
+    """
+
+    def __init__(self, browser: Browser, iterations: int, warmup: int):
+        self.browser = browser
+        self.iterations = iterations
+        self.warmup = warmup
+
+    def run(self, flow: str, action: Callable[[Page], None],
+            setup: Optional[Callable[[Page], None]] = None) -> FlowStats:
+        samples = []
+        for i in range(self.warmup + self.iterations):
+            context = self.browser.new_context(viewport={"width": 1920, "height": 1080})
+            try:
+                page = context.new_page()
+                if setup:
+                    setup(page)
+                started = time.perf_counter()
+                action(page)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            finally:
+                context.close()
+            if i >= self.warmup:
+                samples.append(elapsed_ms)
+        return FlowStats.from_samples(flow, samples)
+
+
+class Baseline:
+    """Zapisany punkt odniesienia (p50/p90 per przepływ) i porównanie z bieżącym pomiarem."""
+
+    def __init__(self, path: Path, threshold: float):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.flows: dict[str, dict] = {}
+        if self.path.exists():
+            self.flows = json.loads(self.path.read_text(encoding="utf-8")).get("flows", {})
+
+    def regression(self, stats: FlowStats) -> Optional[str]:
+        """Zwraca opis regresji, jeśli p50 lub p90 wzrósł ponad próg, albo None."""
+        reference = self.flows.get(stats.flow)
+        if not reference:
+            return None
+        problems = []
+        for metric in ("p50_ms", "p90_ms"):
+            limit = reference[metric] * (1 + self.threshold)
+            current = getattr(stats, metric)
+            if current > limit:
+                problems.append(f"{metric} {current:.0f} ms > {reference[metric]:.0f} ms +{self.threshold:.0%}")
+        return "; ".join(problems) or None
+
+    def save(self, results: list[FlowStats]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"threshold": self.threshold, "flows": {stats.flow: asdict(stats) for stats in results}}
+        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
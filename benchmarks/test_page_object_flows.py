@@ -0,0 +1,75 @@
+# benchmarks/test_page_object_flows.py
+# Uruchamianie: pytest benchmarks/ [--bench-iterations=20] [--replica-latency-ms=50] [--bench-update-baseline]
+import pytest
+from playwright.sync_api import Page
+
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from replica import templates
+
+pytestmark = pytest.mark.benchmark
+
+PRODUCT_PATH = templates.PRODUCTS[0][1]
+
+
+def _home(page: Page, replica_server) -> HomePage:
+    home_page = HomePage(page)
+    home_page.URL = replica_server.url
+    return home_page
+
+
+def _opened_home(page: Page, replica_server) -> HomePage:
+    home_page = _home(page, replica_server)
+    home_page.open_page_and_handle_initial_popups()
+    return home_page
+
+
+def _opened_product(page: Page, replica_server) -> ProductPage:
+    product_page = ProductPage(page)
+    product_page.URL = replica_server.url + PRODUCT_PATH.lstrip("/")
+    product_page.open_specific_product_and_handle_popups(product_page.URL)
+    return product_page
+
+
+def test_flow_open_and_handle_popups(flow_benchmark, replica_server, check_flow):
+    stats = flow_benchmark.run(
+        "open+popups",
+        action=lambda page: _home(page, replica_server).open_page_and_handle_initial_popups(),
+    )
+    check_flow(stats)
+
+
+def test_flow_search(flow_benchmark, replica_server, check_flow):
+    stats = flow_benchmark.run(
+        "search",
+        setup=lambda page: _opened_home(page, replica_server),
+        action=lambda page: _home(page, replica_server).perform_search("iPad"),
+    )
+    check_flow(stats)
+
+
+def test_flow_menu_extraction(flow_benchmark, replica_server, check_flow):
+    stats = flow_benchmark.run(
+        "menu extraction",
+        setup=lambda page: _opened_home(page, replica_server),
+        action=lambda page: _home(page, replica_server).get_main_menu_links(),
+    )
+    check_flow(stats)
+
+
+def test_flow_pdp_verification(flow_benchmark, replica_server, check_flow):
+    stats = flow_benchmark.run(
+        "pdp verification",
+        setup=lambda page: _opened_product(page, replica_server),
+        action=lambda page: ProductPage(page).verify_product_details_displayed(),
+    )
+    check_flow(stats)
+
+
+def test_flow_add_to_cart(flow_benchmark, replica_server, check_flow):
+    stats = flow_benchmark.run(
+        "add to cart",
+        setup=lambda page: _opened_product(page, replica_server),
+        action=lambda page: ProductPage(page).add_product_to_cart(),
+    )
+    check_flow(stats)
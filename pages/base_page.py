@@ -1,15 +1,116 @@
 import logging
-from playwright.sync_api import Page, expect, TimeoutError, Locator
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, Union
+from playwright.sync_api import Page, Response, expect, TimeoutError, Locator, Error
+from pages.overlays import (BLOCKING_OVERLAYS, COOKIE_BANNER, INITIAL_POPUPS, OVERLAY_REGISTRY,
+                            settle_overlays)
+from utils.consent_state import CONSENT_FLAG, report_stale
+from utils.performance import (COLLECT_SCRIPT, PERFORMANCE_RECORDER, VITALS_SCRIPT, PerformanceBudget,
+                               PerformanceCheck, PerformanceSnapshot, WebVitals, install_performance_observer)
+from utils.step_timing import instrument_page_object
 
 logger = logging.getLogger(__name__)
 
+# Obserwator mutacji instalowany leniwie w stronie. Pomijamy zmiany atrybutów, bo karuzele
+# i animacje zmieniają je bez przerwy - interesuje nas dokładanie/zmiana treści.
+DOM_QUIET_SCRIPT = """
+quietMs => {
+    if (!window.__domQuiet) {
+        window.__domQuiet = { last: performance.now() };
+        new MutationObserver(() => { window.__domQuiet.last = performance.now(); })
+            .observe(document, { subtree: true, childList: true, characterData: true });
+    }
+    return performance.now() - window.__domQuiet.last >= quietMs;
+}
+"""
+
+# Układ jest stabilny, gdy rozmiar okna i prostokąty wskazanych elementów nie zmieniły się
+# przez `quietMs` ms (wywoływany co klatkę, więc łapie też przejścia CSS po zmianie rozmiaru).
+LAYOUT_STABLE_SCRIPT = """
+([selectors, quietMs]) => {
+    const rects = selectors.map(selector => {
+        const el = document.querySelector(selector);
+        if (!el) return null;
+        const r = el.getBoundingClientRect();
+        return [r.x, r.y, r.width, r.height];
+    });
+    const snapshot = JSON.stringify([innerWidth, innerHeight, rects]);
+    const now = performance.now();
+    const state = window.__layoutStable;
+    if (!state || state.snapshot !== snapshot) {
+        window.__layoutStable = { snapshot, since: now };
+        return false;
+    }
+    return now - state.since >= quietMs;
+}
+"""
+
+# Jedno wywołanie evaluate_all zamiast osobnego round-tripu na każde pole każdego elementu.
+# Pola-adresy rozwiązujemy względem baseURI elementu (bieżący dokument i ewentualny <base>),
+# tak jak przeglądarka zrobiłaby to przy kliknięciu.
+EXTRACT_SCRIPT = """
+(elements, { fields, urlFields }) => elements.map(el => {
+    const row = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        if (spec === 'text') {
+            row[name] = (el.textContent || '').trim();
+        } else if (spec === 'first_line') {
+            row[name] = (el.textContent || '').trim().split('\\n')[0].trim();
+        } else if (spec === 'inner_text') {
+            row[name] = (el.innerText || '').trim();
+        } else if (spec === 'visible') {
+            const rect = el.getBoundingClientRect();
+            const style = getComputedStyle(el);
+            row[name] = rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+        } else {
+            row[name] = el.getAttribute(spec.slice(1));
+        }
+        if (urlFields.includes(name) && row[name]) {
+            try { row[name] = new URL(row[name], el.baseURI).href; } catch (e) {}
+        }
+    }
+    return row;
+})
+"""
+FIELD_SPECS = ("text", "first_line", "inner_text", "visible")
+
 
 class BasePage:
     URL = "https://idream.pl/"
+    # Wspólne okno na popupy startowe oraz czas "ciszy", po którym uznajemy stronę za czystą.
+    POPUP_WINDOW_MS = 10000
+    POPUP_QUIET_MS = 4000
+    # Jak długo po nawigacji czekamy na baner cookies, zanim uznamy wstrzyknięty stan zgody za działający.
+    CONSENT_BANNER_GRACE_MS = 1500
+    # Nakładki zamykane automatycznie przed każdą akcją (page.add_locator_handler).
+    # Podklasy mogą rozszerzyć tę listę o własne.
+    OVERLAYS = BLOCKING_OVERLAYS + (COOKIE_BANNER,)
+    # Rozmiar okna wymagany przez page object; None = zostawiamy ten z kontekstu
+    # (domyślnie 1920x1080 z `browser_context_args` w conftest).
+    VIEWPORT: Optional[dict] = None
+    # Limity wydajności strony otwieranej przez page object (patrz check_performance_budget).
+    PERFORMANCE_BUDGET = PerformanceBudget(
+        "home", ttfb_ms=1500, dom_content_loaded_ms=4000, transfer_bytes=6 * 1024 * 1024,
+        third_party_share=0.5, long_tasks=20,
+    )
 
-    def __init__(self, page: Page):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_page_object(cls)
+
+    def __init__(self, page: Page, viewport: Optional[dict] = None):
         self.page = page
-        self.page.set_viewport_size({"width": 1920, "height": 1080})
+        viewport = viewport or self.VIEWPORT
+        if viewport:
+            self.set_viewport(viewport)
+        OVERLAY_REGISTRY.install(self.page, self.OVERLAYS)
+        install_performance_observer(self.page)
+
+    def set_viewport(self, viewport: dict):
+        """Zmienia rozmiar okna tylko wtedy, gdy jest inny niż obecny (viewport_size nie odpytuje przeglądarki)."""
+        if self.page.viewport_size != viewport:
+            self.page.set_viewport_size(viewport)
 
     def open_page_and_handle_initial_popups(self):
         """
@@ -19,47 +120,171 @@ class BasePage:
         logger.info(f"Navigating to {self.URL}...")
         self.page.goto(self.URL, wait_until="domcontentloaded", timeout=45000)
         logger.info("Page navigation complete and network is idle.")
+        self._record_navigation_performance()
+        self.handle_initial_popups()
 
-        # KROK 1: Obsługa cookies
-        cookie_btn = self.page.get_by_role("button", name="Zezwól na wszystkie")
+    def handle_initial_popups(self):
+        """Obsługuje popupy startowe na już załadowanej stronie (pomija je, jeśli zgoda jest wstrzyknięta)."""
+        if self._consent_is_seeded():
+            logger.info("--- Consent state pre-seeded, skipping popup probing. ---")
+            return
 
-        if cookie_btn.is_visible(timeout=5000):
-            try:
-                cookie_btn.click()
-                logger.info("✅ Cookie consent handled.")
-            except Exception:
-                # Na wypadek, gdyby kliknięcie zostało przerwane
-                logger.warning("Cookie click failed, but element was visible.")  # <--- Poprawione wcięcie
-        else:
+        self._handle_initial_popups()
+        logger.info("--- Page is clean and ready for testing. ---")
+
+    def _handle_initial_popups(self):
+        """
+        Obsługuje cookies i popup 'bhr' jednym wspólnym oknem czasowym - reagujemy
+        na ten, który pojawi się pierwszy, zamiast czekać na każdy po kolei.
+        """
+        result = settle_overlays(self.page, INITIAL_POPUPS, timeout=self.POPUP_WINDOW_MS, quiet=self.POPUP_QUIET_MS)
+        if COOKIE_BANNER.name not in result.handled:
             # To jest oczekiwany stan, jeśli cookies zostały już zaakceptowane.
-            logger.info("Cookie banner not visible. Assuming consent already given.")  # <--- Poprawione wcięcie
+            logger.info("Cookie banner not visible. Assuming consent already given.")
+        if result.failed:
+            logger.error(f"Could not close initial popups: {result.failed}")
+            # Robimy zrzut ekranu, żeby zobaczyć, co poszło nie tak
+            self.page.screenshot(path="error_bhr_popup.png")
+
+    # ----------------------------------------------------------------------
+    # Sygnały gotowości - zamiast ogólnego czekania na 'networkidle'
+    # ----------------------------------------------------------------------
+
+    @contextmanager
+    def expect_ready_response(self, pattern: Union[str, Callable[[Response], bool]], timeout: int = 30000,
+                              replaces: Optional[str] = None, budget_ms: int = 0):
+        """
+        Czeka na konkretną odpowiedź wywołaną akcją w bloku `with` (np. dispatch wyszukiwania
+        albo AJAX zestawu). `pattern` to fragment URL-a albo predykat na Response.
+        `replaces`/`budget_ms` opisują zastąpione czekanie - do logu z zaoszczędzonym czasem.
+        """
+        predicate = pattern if callable(pattern) else (lambda response: pattern in response.url)
+        started = time.perf_counter()
+        with self.page.expect_response(predicate, timeout=timeout) as response_info:
+            yield response_info
+        response = response_info.value
+        self._log_readiness(f"response {response.status} {response.url}", started, replaces, budget_ms)
+
+    def wait_for_dom_quiet(self, quiet_ms: int = 500, timeout: int = 10000, replaces: Optional[str] = None,
+                           budget_ms: int = 0):
+        """Czeka, aż przez `quiet_ms` ms w DOM nie pojawi się żadna nowa treść (MutationObserver)."""
+        started = time.perf_counter()
+        self.page.wait_for_function(DOM_QUIET_SCRIPT, arg=quiet_ms, polling=100, timeout=timeout)
+        self._log_readiness(f"DOM quiet for {quiet_ms} ms", started, replaces, budget_ms)
+
+    def wait_for_layout_stable(self, selectors: Iterable[str] = (), quiet_ms: int = 300, timeout: int = 10000):
+        """
+        Czeka, aż rozmiar okna i położenie `selectors` przestaną się zmieniać przez `quiet_ms` ms.
+        Sygnał gotowości po zmianie rozmiaru okna - DOM zwykle się wtedy nie zmienia, zmienia się układ.
+        """
+        started = time.perf_counter()
+        self.page.wait_for_function(LAYOUT_STABLE_SCRIPT, arg=[list(selectors), quiet_ms], polling="raf",
+                                    timeout=timeout)
+        self._log_readiness(f"layout stable for {quiet_ms} ms", started, None, 0)
+
+    @staticmethod
+    def _log_readiness(signal: str, started: float, replaces: Optional[str], budget_ms: int):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if replaces:
+            logger.info(f"Ready on {signal} after {elapsed_ms:.0f} ms "
+                        f"(replaces {replaces}, saved up to {max(budget_ms - elapsed_ms, 0):.0f} ms).")
+        else:
+            logger.info(f"Ready on {signal} after {elapsed_ms:.0f} ms.")
+
+    # ----------------------------------------------------------------------
+    # Wydajność (Navigation/Resource Timing, długie zadania)
+    # ----------------------------------------------------------------------
 
-        # KROK 2: Obsługa NOWEGO popupa 'bhr'
+    def collect_performance(self) -> PerformanceSnapshot:
+        """Metryki bieżącego dokumentu jednym evaluate (długie zadania tylko po nawigacji z tym page objectem)."""
+        return PerformanceSnapshot(**self.page.evaluate(COLLECT_SCRIPT))
+
+    def collect_web_vitals(self, timeout: int = 45000) -> WebVitals:
+        """LCP, CLS i TTFB bieżącego dokumentu po zdarzeniu load i ciszy w DOM."""
+        self.page.wait_for_load_state("load", timeout=timeout)
+        self.wait_for_dom_quiet(timeout=timeout)
+        return WebVitals(**self.page.evaluate(VITALS_SCRIPT))
+
+    def check_performance_budget(self, budget: Optional[PerformanceBudget] = None,
+                                 wait_for_load: bool = False) -> PerformanceCheck:
+        """
+        Porównuje bieżącą stronę z budżetem (domyślnie PERFORMANCE_BUDGET page objectu) i zapisuje
+        wynik do raportu testu. `wait_for_load=True` czeka na zdarzenie load, żeby liczniki
+        zasobów były kompletne - dla testów, które sprawdzają budżet wprost.
+        """
+        budget = budget or self.PERFORMANCE_BUDGET
+        if wait_for_load:
+            self.page.wait_for_load_state("load", timeout=45000)
+        snapshot = self.collect_performance()
+        check = PerformanceCheck(budget.name, snapshot, budget.check(snapshot))
+        PERFORMANCE_RECORDER.record(check)
+        if check.ok:
+            logger.info(f"Performance {check.describe()}")
+        else:
+            logger.warning(f"Performance budget exceeded {check.describe()}")
+        return check
+
+    def _record_navigation_performance(self, budget: Optional[PerformanceBudget] = None):
+        """
+        Po nawigacji: zapisuje pomiar do raportu testu, jeśli budżety są włączone. Nie czekamy na load
+        (to spowolniłoby każdy test), więc pomiar sprzed load jest w raporcie oznaczony jako częściowy.
+        """
+        if not PERFORMANCE_RECORDER.active:
+            return
         try:
-            # Używamy bardziej stabilnej części klasy jako selektora
-            popup_container = self.page.locator("div.bhr-board__canvas.type--POPUP")
+            self.check_performance_budget(budget)
+        except Error as e:
+            logger.warning(f"Could not collect performance metrics: {e}")
 
-            logger.info("Checking for the 'bhr' popup...")
-            if popup_container.is_visible(timeout=10000):
-                logger.info("'bhr' popup found. Attempting to close it.")
+    # ----------------------------------------------------------------------
+    # Hurtowe pobieranie danych z DOM
+    # ----------------------------------------------------------------------
 
-                # Używamy get_by_title - jest bardzo czytelny i niezawodny
-                close_button = self.page.get_by_title("Kliknij tutaj!")
-                expect(close_button).to_be_enabled(timeout=2000)
-                close_button.click()
+    def extract_all(self, selector: str, fields: dict[str, str], url_fields: Iterable[str] = ("href",),
+                    dedupe_by: Optional[str] = None) -> list[dict]:
+        """
+        Pobiera dane ze wszystkich elementów pasujących do `selector` jednym wywołaniem.
 
-                # Weryfikujemy, czy popup zniknął po kliknięciu
-                expect(popup_container).not_to_be_visible(timeout=5000)
-                logger.info("✅ 'bhr' popup handled successfully.")
-            else:
-                logger.info("'bhr' popup did not appear within the timeout. Continuing...")
+        `fields` mapuje nazwę pola na specyfikację: 'text' (textContent), 'first_line'
+        (pierwsza linia tekstu), 'inner_text', 'visible' albo '@atrybut' (np. '@href').
+        Pola z `url_fields` są zamieniane na pełne URL-e względem bieżącego dokumentu
+        (nie `self.URL` - link względny na /kategoria/ wskazuje w głąb kategorii),
+        a `dedupe_by` usuwa powtórzenia po wskazanym polu (zostaje pierwsze wystąpienie).
+        """
+        for name, spec in fields.items():
+            if spec not in FIELD_SPECS and not spec.startswith("@"):
+                raise ValueError(f"Nieznana specyfikacja pola '{name}': '{spec}'")
 
-        except Exception as e:
-            logger.error(f"An unexpected error occurred while handling the 'bhr' popup: {e}")
-            # Robimy zrzut ekranu, żeby zobaczyć, co poszło nie tak
-            self.page.screenshot(path="error_bhr_popup.png")
+        rows = self.page.locator(selector).evaluate_all(EXTRACT_SCRIPT, {"fields": fields,
+                                                                         "urlFields": list(url_fields)})
 
-        logger.info("--- Page is clean and ready for testing. ---")
+        if dedupe_by:
+            unique = {}
+            for row in rows:
+                unique.setdefault(row.get(dedupe_by), row)
+            rows = list(unique.values())
+        return rows
+
+    def _consent_is_seeded(self) -> bool:
+        """
+        Sprawdza, czy kontekst dostał gotowy stan zgody (storage_state + skrypt ukrywający 'bhr').
+        Jeśli mimo to baner cookies jest widoczny, snapshot jest nieaktualny - zgłaszamy to
+        i wracamy do pełnej obsługi popupów.
+        """
+        try:
+            seeded = self.page.evaluate(f"() => window.{CONSENT_FLAG} === true")
+        except Error:
+            return False
+        if not seeded:
+            return False
+
+        # Baner potrafi wyrenderować się chwilę po DOMContentLoaded - dajemy mu krótkie okno.
+        try:
+            COOKIE_BANNER.target(self.page).wait_for(state="visible", timeout=self.CONSENT_BANNER_GRACE_MS)
+        except TimeoutError:
+            return True
+        report_stale("cookie banner visible despite seeded consent state")
+        return False
 
     def _close_known_overlays(self):
         """
@@ -67,40 +292,13 @@ class BasePage:
         potencjalnie blokujące nakładki. Działa cicho, jeśli ich nie znajdzie.
         """
         logger.info("Auto-healing: Checking for known overlays to close...")
-
-        # Używamy selektorów, które zidentyfikowałeś
-        bhr_div_overlay = self.page.locator('#bhr-items div').first
-        bhr_iframe_overlay = self.page.frame_locator('#bhr-items iframe').locator('div').nth(3)
-        salesmanago_iframe_button = self.page.frame_locator(
-            'iframe[title="salesmanago-consent-form-title"]').get_by_role('button', {'name': 'Nie'})
-        
-        # Nowy overlay zidentyfikowany w analizie Gemini
-        gemini_identified_overlay = self.page.locator("#wes-77605808-07d1-43c9-bace-421e2a2ddec8")
-
-        overlays_to_check = [
-            (bhr_div_overlay, "BHR Div Overlay"),
-            (bhr_iframe_overlay, "BHR IFrame Div Overlay"),
-            (salesmanago_iframe_button, "Salesmanago Consent Button"),
-            (gemini_identified_overlay, "Gemini Analysis Identified Overlay (#wes-...)")
-        ]
-
-        for overlay_locator, name in overlays_to_check:
-            try:
-                # Sprawdzamy, czy element jest widoczny, z bardzo krótkim timeoutem
-                if overlay_locator.is_visible(timeout=500):
-                    logger.warning(f"Found active overlay: '{name}'. Attempting to click it.")
-                    overlay_locator.click(timeout=2000)
-                    # Czekamy na zniknięcie po kliknięciu
-                    expect(overlay_locator).not_to_be_visible(timeout=3000)
-                    logger.info(f"✅ Successfully closed overlay: '{name}'.")
-            except Exception:
-                # Ignorujemy błędy, bo overlay mógł zniknąć w międzyczasie
-                logger.debug(f"Could not interact with '{name}' (it might have already disappeared).")
+        settle_overlays(self.page, BLOCKING_OVERLAYS, timeout=5000, quiet=500)
 
     def safe_click(self, locator: Locator, **kwargs):
         """
         "Pancerna" wersja metody .click().
-        Jeśli standardowe kliknięcie zawiedzie z powodu zasłonięcia elementu,
+        Znane nakładki zamyka już rejestr OVERLAYS przed akcją; ta ścieżka łapie tylko
+        nakładki spoza rejestru. Jeśli kliknięcie zawiedzie z powodu zasłonięcia elementu,
         uruchamia procedurę czyszczenia nakładek i ponawia próbę.
         """
         try:
@@ -117,4 +315,7 @@ class BasePage:
                 locator.click(**kwargs)
             else:
                 # Jeśli błąd był inny (np. element nie został znaleziony), rzucamy go dalej
-                raise e
\ No newline at end of file
+                raise e
+
+
+instrument_page_object(BasePage)
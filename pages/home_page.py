@@ -1,40 +1,109 @@
 import logging
-from playwright.sync_api import Page, expect, TimeoutError
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlencode, urljoin
+from playwright.sync_api import Page, Route, expect, TimeoutError
 from pages.base_page import BasePage
+from utils.performance import PerformanceBudget
+from utils.page_pool import NavigationOutcome, PagePool
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SearchResult:
+    query: str
+    url: str
+    status: Optional[int]
+    heading: Optional[str]
+    elapsed_ms: float
+    waf_blocked: bool
+    dialogs: list[str] = field(default_factory=list)
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class SocialTarget:
+    network: str
+    href: Optional[str]
+    captured_url: Optional[str] = None
+    error: Optional[str] = None
+
+
 class HomePage(BasePage):
     # NOWE LOKATORY ZWIĄZANE Z WYSZUKIWANIEM
     SEARCH_INPUT = "input#search_input"  # Standardowe pole wyszukiwania
     SEARCH_BUTTON = "button.ty-search-magnifier"  # Przycisk lupy
     SEARCH_RESULTS_CONTAINER = "span.ty-mainbox-title__left"  # Kontener, który się zmienia po wyszukiwaniu
+    SEARCH_DISPATCH = "dispatch=products.search"  # Fragment URL-a odpowiedzi z wynikami (CS-Cart)
+    # Parametry, które wysyła formularz wyszukiwania CS-Cart - dzięki nim URL daje te same wyniki co UI.
+    SEARCH_PARAMS = {
+        "dispatch": "products.search",
+        "subcats": "Y",
+        "pcode_from_q": "Y",
+        "pshort": "Y",
+        "pfull": "Y",
+        "pname": "Y",
+        "pkeywords": "Y",
+        "search_performed": "Y",
+    }
+    SEARCH_RESULTS_BUDGET = PerformanceBudget(
+        "search", ttfb_ms=2500, dom_content_loaded_ms=5000, transfer_bytes=6 * 1024 * 1024,
+        third_party_share=0.5, long_tasks=20,
+    )
+    MAIN_MENU_LINKS = ".ut2-lfl > p > a[href]"
+    SEARCH_RESULT_LINKS = "a.product-title, .ut2-gl__name a, .ut2-gl__body a"
+    # Fragmenty adresów profili społecznościowych - z nich budujemy selektory przycisków.
+    SOCIAL_MEDIA_HREFS = {
+        'instagram': "instagram.com/idream_pl",
+        'facebook': "facebook.com/iDreamPolska",
+        'tiktok': "tiktok.com/@idream_pl",
+        'youtube': "youtube.com/user/iDreamPL",
+    }
+    # Nawigacje do serwisów społecznościowych przechwytujemy i przerywamy (patrz capture_social_media_targets).
+    SOCIAL_MEDIA_NAVIGATION = re.compile(r"^https?://([^/]+\.)?(instagram|facebook|tiktok|youtube)\.com/")
+    WAF_INDICATORS = [
+        "Access Denied",
+        "403 Forbidden",
+        "cloudflare",  # Często używane przez WAFy oparte na Cloudflare
+        "web application firewall"
+    ]
 
     def __init__(self, page: Page):
         super().__init__(page)
 
         self.social_media_buttons = {
-            'instagram': "a[href*='instagram.com/idream_pl']",
-            'facebook': "a[href*='facebook.com/iDreamPolska']",
-            'tiktok': "a[href*='tiktok.com/@idream_pl']",
-            'youtube': "a[href*='youtube.com/user/iDreamPL']"
+            name: f"a[href*='{fragment}']" for name, fragment in self.SOCIAL_MEDIA_HREFS.items()
         }
 
         self.hamburger_icon = self.page.locator("#sw_dropdown_541 i").first
         # NOWY, POPRAWNY LOKATOR CSS dla głównych kategorii w bocznym menu:
-        self.main_menu_links_locator = self.page.locator(".ut2-lfl > p > a[href]")
+        self.main_menu_links_locator = self.page.locator(self.MAIN_MENU_LINKS)
 
     # ----------------------------------------------------------------------
     # NOWE METODY DO OBSŁUGI WYSZUKIWANIA
     # ----------------------------------------------------------------------
 
-    def perform_search(self, query: str):
+    @classmethod
+    def search_url(cls, query: str) -> str:
+        """Zwraca URL strony wyników CS-Cart dla zapytania (z poprawnie zakodowanym `q`)."""
+        return urljoin(cls.URL, "index.php?" + urlencode({**cls.SEARCH_PARAMS, "q": query}))
+
+    def perform_search(self, query: str, via_url: bool = False):
         """
         Wyszukuje produkt, wpisując tekst do paska wyszukiwania i zatwierdzając.
         Ulepszona wersja z bardziej precyzyjnymi oczekiwaniami i wydłużonymi timeoutami
         dla większej stabilności testów (szczególnie test_input_validation).
+
+        `via_url=True` pomija UI i przechodzi od razu na URL wyników - do testów, które
+        nie sprawdzają samego paska wyszukiwania.
         """
+        if via_url:
+            self._search_via_url(query)
+            return
+
         logger.info(f"Wykonywanie wyszukiwania dla zapytania: '{query}'")
         search_input_locator = self.page.locator(self.SEARCH_INPUT)
         search_button_locator = self.page.locator(self.SEARCH_BUTTON)
@@ -50,20 +119,57 @@ class HomePage(BasePage):
         # 2. Oczekiwanie na dostępność przycisku wyszukiwania przed kliknięciem
         expect(search_button_locator).to_be_visible(timeout=15000)
         expect(search_button_locator).to_be_enabled(timeout=15000)
-        search_button_locator.click()
 
-        # 3. Oczekiwanie na załadowanie strony z wynikami z wydłużonym timeoutem
-        # Zwiększony timeout z 10s do 30s dla większej odporności na wolne odpowiedzi serwera
-        # Dodatkowo używamy expect zamiast wait_for_selector dla lepszej integracji z Playwright
+        # 3. Czekamy na odpowiedź z dispatchem wyszukiwania zamiast na 'networkidle',
+        # które przy widgetach i beaconach analitycznych potrafi się nie ustabilizować.
+        with self.expect_ready_response(self.SEARCH_DISPATCH, replaces="networkidle", budget_ms=30000):
+            search_button_locator.click()
+
         results_container_locator = self.page.locator(self.SEARCH_RESULTS_CONTAINER)
         expect(results_container_locator).to_be_visible(timeout=30000)
-        
-        # 4. Oczekiwanie na uspokojenie się sieci (AJAX, lazy loading itp.)
-        # Zwiększony timeout dla networkidle z domyślnego do 30s
-        self.page.wait_for_load_state("networkidle", timeout=30000)
 
+        # 4. Krótka cisza w DOM - lista produktów (lazy loading) jest już dołożona.
+        self.wait_for_dom_quiet()
+        self._record_navigation_performance(self.SEARCH_RESULTS_BUDGET)
+
+        logger.info("Strona z wynikami wyszukiwania załadowana.")
+
+    def _search_via_url(self, query: str):
+        logger.info(f"Wyszukiwanie przez URL dla zapytania: '{query[:80]}'")
+        self.page.goto(self.search_url(query), wait_until="domcontentloaded", timeout=30000)
+        expect(self.page.locator(self.SEARCH_RESULTS_CONTAINER)).to_be_visible(timeout=30000)
+        self.wait_for_dom_quiet()
+        self._record_navigation_performance(self.SEARCH_RESULTS_BUDGET)
         logger.info("Strona z wynikami wyszukiwania załadowana.")
 
+    def perform_searches(self, queries: Iterable[str], pool_size: int = 3, with_content: bool = False,
+                         settle_ms: int = 0) -> Iterator[SearchResult]:
+        """
+        Wykonuje wiele wyszukiwań przez URL na małej puli dodatkowych stron i zwraca
+        wyniki w kolejności, w jakiej się załadują. Strona `self.page` nie jest ruszana.
+        """
+        def collect(page: Page, query: str, outcome: NavigationOutcome) -> SearchResult:
+            content = None
+            headings = []
+            if outcome.error is None:
+                headings = page.locator(self.SEARCH_RESULTS_CONTAINER).all_text_contents()
+                if with_content:
+                    content = page.content()
+            return SearchResult(
+                query=query,
+                url=outcome.url,
+                status=outcome.status,
+                heading=headings[0].strip() if headings else None,
+                elapsed_ms=outcome.elapsed_ms,
+                waf_blocked=outcome.status == 403 or (content is not None and self._content_blocked_by_waf(content)),
+                dialogs=outcome.dialogs,
+                content=content,
+                error=outcome.error,
+            )
+
+        with PagePool(self.page.context, size=pool_size) as pool:
+            yield from pool.map_unordered(queries, self.search_url, collect, settle=settle_ms)
+
     def verify_search_results_exist(self):
         """
         Weryfikuje, czy wyniki wyszukiwania są widoczne (pojawia się kontener z wynikami).
@@ -86,8 +192,44 @@ class HomePage(BasePage):
         popup_page.wait_for_load_state("domcontentloaded")
         return popup_page
 
-    def get_main_menu_links(self) -> list[dict]:
-        # Wracamy do zwracania listy dict, nie int
+    def capture_social_media_targets(self, button_types: Optional[list[str]] = None) -> dict[str, SocialTarget]:
+        """
+        Klika przyciski społecznościowe, ale nie ładuje stron docelowych: nawigacja popupu
+        jest przechwytywana na poziomie route, zapisujemy jej URL i przerywamy żądanie.
+        Nie czekamy więc na Instagram/Facebook/TikTok/YouTube ani na ich strony zgody.
+        """
+        context = self.page.context
+        hrefs = self.get_social_media_hrefs()
+        targets = {}
+
+        def abort_navigation(route: Route):
+            route.abort("blockedbyclient")
+
+        def is_social_navigation(request) -> bool:
+            return request.is_navigation_request() and bool(self.SOCIAL_MEDIA_NAVIGATION.match(request.url))
+
+        context.route(self.SOCIAL_MEDIA_NAVIGATION, abort_navigation)
+        try:
+            for button_type in button_types or list(self.social_media_buttons):
+                target = SocialTarget(network=button_type, href=hrefs.get(button_type))
+                button_locator = self.page.locator(self.social_media_buttons[button_type]).first
+                try:
+                    button_locator.scroll_into_view_if_needed()
+                    with context.expect_event("request", is_social_navigation, timeout=10000) as request_info:
+                        with self.page.expect_popup(timeout=10000) as popup_info:
+                            self.safe_click(button_locator)
+                    target.captured_url = request_info.value.url
+                    popup_info.value.close()
+                    logger.info(f"Przechwycono nawigację {button_type}: {target.captured_url}")
+                except TimeoutError as e:
+                    target.error = f"Nie przechwycono nawigacji: {e}"
+                    logger.error(f"{button_type}: {target.error}")
+                targets[button_type] = target
+        finally:
+            context.unroute(self.SOCIAL_MEDIA_NAVIGATION, abort_navigation)
+        return targets
+
+    def _open_main_menu(self) -> bool:
         logger.info("Test: Klika w ikonę hamburgera i zbiera główne linki menu.")
 
         # ... KROK 1: Kliknięcie hamburgera ...
@@ -102,44 +244,40 @@ class HomePage(BasePage):
         try:
             expect(mac_link_locator).to_be_visible(timeout=10000)
             logger.info("Potwierdzono widoczność menu bocznego.")
+            return True
         except Exception:
             logger.error("Menu boczne nie wysunęło się lub jest niewidoczne.")
             self.page.screenshot(path="error_menu_not_visible.png")
-            return []
-
-        # KROK 3: Zbieranie linków (Używamy NOWEGO, precyzyjnego lokatora)
-        unique_links = {}
-
-        # Użycie nowego lokatora, który zbiera tylko linki głównych kategorii
-        all_main_category_locators = self.main_menu_links_locator.all()
-
-        for link_locator in all_main_category_locators:
-            text = (link_locator.text_content() or "").strip()
-            href = link_locator.get_attribute("href")
-            # Wyodrębnij tylko nazwę kategorii (Mac, iPhone, etc.)
-            # Tekst ma format: "Mac\nNowoczesne laptopy..." - Bierzemy tylko pierwszą linię
-
-            category_name = text.split('\n')[0].strip()
-            # Sprawdzamy tylko, czy znaleźliśmy link z tekstem i href
-            if category_name and href and href not in unique_links:
-                # Normalizujemy URL
-                if href.startswith('/'):
-                    href = f"https://idream.pl{href}"
+            return False
 
-                unique_links[href] = {'text': category_name, 'href': href}
-
-            # Filtrujemy, aby zbierać tylko główne linki (Mac, iPhone, iPad itd.)
-            # Na podstawie HTML, główny tekst to Mac, iPhone, etc.
-            if text.split('\n')[0].strip() in ["Mac", "iPhone", "iPad", "Watch", "Muzyka", "TV", "Akcesoria"]:
-                # Normalizujemy URL
-                if href.startswith('/'):
-                    href = f"https://idream.pl{href}"
-                unique_links[href] = {'text': text.split('\n')[0].strip(), 'href': href}
+    def get_main_menu_links(self, open_menu: bool = True) -> list[dict]:
+        """
+        Zwraca tekst i href głównych linków menu. Z `open_menu=False` czyta je z DOM bez
+        klikania hamburgera (menu jest renderowane z HTML strony) - strona zostaje nietknięta.
+        """
+        if open_menu and not self._open_main_menu():
+            return []
 
-        links_data = list(unique_links.values())
+        # KROK 3: Zbieranie linków jednym wywołaniem (tekst ma format "Mac\nNowoczesne laptopy...",
+        # więc bierzemy tylko pierwszą linię; URL-e są od razu znormalizowane i bez duplikatów)
+        rows = self.extract_all(self.MAIN_MENU_LINKS, {'text': 'first_line', 'href': '@href'}, dedupe_by='href')
+        links_data = [row for row in rows if row['text'] and row['href']]
         logger.info(f"Znaleziono {len(links_data)} głównych linków menu.")
         return links_data
 
+    def get_social_media_hrefs(self) -> dict[str, Optional[str]]:
+        """Zwraca href każdego przycisku społecznościowego (jedno wywołanie dla wszystkich)."""
+        rows = self.extract_all(", ".join(self.social_media_buttons.values()), {'href': '@href'})
+        return {
+            name: next((row['href'] for row in rows if fragment in (row['href'] or "")), None)
+            for name, fragment in self.SOCIAL_MEDIA_HREFS.items()
+        }
+
+    def get_search_results(self) -> list[dict]:
+        """Zwraca nazwy i adresy produktów z listy wyników wyszukiwania."""
+        rows = self.extract_all(self.SEARCH_RESULT_LINKS, {'name': 'text', 'href': '@href'}, dedupe_by='href')
+        return [row for row in rows if row['name']]
+
     def get_social_media_expected_url(self, button_type: str) -> str:
         """
         Zwraca oczekiwany URL dla danego medium społecznościowego.
@@ -189,16 +327,8 @@ class HomePage(BasePage):
         Weryfikuje, czy strona została zablokowana przez WAF.
         Wymaga dostosowania wskaźników do faktycznej strony WAF!
         """
-        WAF_INDICATORS = [
-            "Access Denied",
-            "403 Forbidden",
-            "cloudflare",  # Często używane przez WAFy oparte na Cloudflare
-            "web application firewall"
-        ]
-
         # Sprawdzenie treści strony
-        page_source = self.page.content().lower()
-        if any(indicator.lower() in page_source for indicator in WAF_INDICATORS):
+        if self._content_blocked_by_waf(self.page.content()):
             logger.info("WAF indicator found in page content.")
             return True
 
@@ -217,4 +347,9 @@ class HomePage(BasePage):
             # Ignoruj błędy przy próbie pobrania odpowiedzi
             pass
 
-        return False
\ No newline at end of file
+        return False
+
+    @classmethod
+    def _content_blocked_by_waf(cls, content: str) -> bool:
+        page_source = content.lower()
+        return any(indicator.lower() in page_source for indicator in cls.WAF_INDICATORS)
\ No newline at end of file
@@ -1,12 +1,19 @@
 import logging
 from playwright.sync_api import Page, expect
 from pages.base_page import BasePage
+from utils.performance import PerformanceBudget
 
 logger = logging.getLogger(__name__)
 
 class LoginPage(BasePage):
 
     LOGIN_URL = "https://idream.pl/profil.html"
+    # Fragment HTML formularza logowania - jego brak na stronie profilu oznacza zalogowanego klienta.
+    LOGIN_FORM_MARKER = 'name="main_login_form"'
+    PERFORMANCE_BUDGET = PerformanceBudget(
+        "login", ttfb_ms=1200, dom_content_loaded_ms=3000, transfer_bytes=3 * 1024 * 1024,
+        third_party_share=0.5, long_tasks=10,
+    )
 
     def __init__(self, page: Page):
         super().__init__(page)
@@ -22,6 +29,7 @@ class LoginPage(BasePage):
         self.page.goto(self.LOGIN_URL)
         # Czekamy na załadowanie strony i widoczność pola email
         expect(self.email_input).to_be_visible(timeout=10000)
+        self._record_navigation_performance()
         logger.info("Login page is loaded and ready.")
 
     def login(self, email: str, password: str):
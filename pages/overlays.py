@@ -0,0 +1,209 @@
+import logging
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional, Sequence
+
+from playwright.sync_api import Page, Locator, expect
+
+from utils.sleep_detector import poll_pause
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Overlay:
+    """
+    Opis jednej znanej nakładki: jak ją rozpoznać (`target`) i co kliknąć, żeby ją zamknąć (`close`).
+    Lokatory budujemy leniwie, bo zależą od konkretnej instancji Page.
+    """
+    name: str
+    target: Callable[[Page], Locator]
+    close: Optional[Callable[[Page], Locator]] = None
+    wait_hidden: bool = True
+    # Element ukrywany, gdy zamknięcie się nie uda. Dla nakładek w ramce to sam <iframe> na stronie -
+    # ukryty element wewnątrz ramki dalej zostawiałby ramkę nad klikanym elementem.
+    hide: Optional[Callable[[Page], Locator]] = None
+
+    def close_locator(self, page: Page) -> Locator:
+        return (self.close or self.target)(page)
+
+    def hide_locator(self, page: Page) -> Locator:
+        return (self.hide or self.target)(page)
+
+
+@dataclass
+class SettleResult:
+    handled: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+COOKIE_BANNER = Overlay(
+    "Cookie Banner",
+    target=lambda page: page.get_by_role("button", name="Zezwól na wszystkie"),
+    wait_hidden=False,
+)
+BHR_POPUP = Overlay(
+    "BHR Popup",
+    target=lambda page: page.locator("div.bhr-board__canvas.type--POPUP"),
+    close=lambda page: page.get_by_title("Kliknij tutaj!"),
+)
+BHR_DIV = Overlay(
+    "BHR Div Overlay",
+    target=lambda page: page.locator('#bhr-items div').first,
+)
+BHR_IFRAME = Overlay(
+    "BHR IFrame Div Overlay",
+    target=lambda page: page.frame_locator('#bhr-items iframe').locator('div').nth(3),
+    hide=lambda page: page.locator('#bhr-items iframe'),
+)
+SALESMANAGO_CONSENT = Overlay(
+    "Salesmanago Consent Button",
+    target=lambda page: page.frame_locator(
+        'iframe[title="salesmanago-consent-form-title"]').get_by_role('button', name='Nie'),
+)
+# Overlay zidentyfikowany w analizie Gemini
+WES_OVERLAY = Overlay(
+    "Gemini Analysis Identified Overlay (#wes-...)",
+    target=lambda page: page.locator("#wes-77605808-07d1-43c9-bace-421e2a2ddec8"),
+)
+
+# Skrypt ukrywający nakładkę, której nie udało się zamknąć - bez tego Playwright uruchamiałby
+# handler w kółko, aż akcja testu przekroczy timeout.
+HIDE_SCRIPT = "el => el.style.setProperty('display', 'none', 'important')"
+
+# Popupy pojawiające się zaraz po wejściu na stronę.
+INITIAL_POPUPS = (COOKIE_BANNER, BHR_POPUP)
+# Nakładki, które potrafią zasłonić element w trakcie testu.
+BLOCKING_OVERLAYS = (BHR_DIV, BHR_IFRAME, SALESMANAGO_CONSENT, WES_OVERLAY)
+
+MAX_ATTEMPTS = 2
+
+
+def _dismiss(page: Page, overlay: Overlay):
+    overlay.close_locator(page).click(timeout=2000)
+    if overlay.wait_hidden:
+        expect(overlay.target(page)).not_to_be_visible(timeout=5000)
+
+
+def settle_overlays(page: Page, overlays: Sequence[Overlay], timeout: int = 10000, quiet: int = 1000,
+                    poll: int = 100) -> SettleResult:
+    """
+    Obserwuje wszystkie podane nakładki naraz (także te w iframe'ach) i zamyka tę, która
+    pojawi się pierwsza. Kończy, gdy wszystkie zostały obsłużone, gdy przez `quiet` ms
+    nic się nie pojawiło albo po upływie `timeout` ms - najgorszy przypadek to jedno okno
+    czasowe zamiast sumy osobnych timeoutów.
+    """
+    result = SettleResult()
+    started = time.monotonic()
+    deadline = started + timeout / 1000
+    last_activity = started
+    attempts = {overlay.name: 0 for overlay in overlays}
+
+    while time.monotonic() < deadline:
+        pending = [o for o in overlays if o.name not in result.handled and attempts[o.name] < MAX_ATTEMPTS]
+        if not pending:
+            break
+
+        # is_visible() nie czeka - to pojedyncze, natychmiastowe sprawdzenie każdej nakładki.
+        visible = next((o for o in pending if o.target(page).is_visible()), None)
+        if visible is None:
+            if (time.monotonic() - last_activity) * 1000 >= quiet:
+                break
+            # Nie time.sleep - Playwright w tym czasie obsługuje zdarzenia strony.
+            poll_pause(page, poll)
+            continue
+
+        logger.info(f"Overlay '{visible.name}' appeared. Attempting to close it.")
+        attempts[visible.name] += 1
+        try:
+            _dismiss(page, visible)
+            result.handled.append(visible.name)
+            logger.info(f"✅ Overlay '{visible.name}' handled.")
+        except Exception as e:
+            logger.warning(f"Could not close overlay '{visible.name}': {e}")
+            if attempts[visible.name] >= MAX_ATTEMPTS:
+                result.failed.append(visible.name)
+        last_activity = time.monotonic()
+
+    result.elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(f"Overlays settled in {result.elapsed_ms:.0f} ms (handled: {result.handled or 'none'}).")
+    return result
+
+
+@dataclass
+class OverlayStats:
+    hits: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, elapsed_ms: float, ok: bool):
+        self.hits += 1
+        self.failures += 0 if ok else 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+
+class OverlayRegistry:
+    """
+    Rejestr nakładek instalowanych przez `page.add_locator_handler`. Playwright sprawdza je
+    przed każdą akcją, więc nakładka jest zamykana zanim zasłoni kliknięcie, a nie po timeoucie.
+    Każda nakładka jest instalowana na danej stronie tylko raz, a rejestr zbiera liczniki
+    i czasy obsługi dla całego przebiegu.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, OverlayStats] = {}
+        self._installed: "weakref.WeakKeyDictionary[Page, set[str]]" = weakref.WeakKeyDictionary()
+
+    def install(self, page: Page, overlays: Sequence[Overlay]):
+        installed = self._installed.setdefault(page, set())
+        for overlay in overlays:
+            if overlay.name in installed:
+                continue
+            # Dla nakładek z wait_hidden=False (np. baner cookies) Playwright nie czeka na ich zniknięcie.
+            page.add_locator_handler(overlay.target(page), self._make_handler(page, overlay),
+                                     no_wait_after=not overlay.wait_hidden)
+            installed.add(overlay.name)
+            self.stats.setdefault(overlay.name, OverlayStats())
+
+    def _make_handler(self, page: Page, overlay: Overlay):
+        def handler(_locator: Locator):
+            started = time.perf_counter()
+            ok = True
+            try:
+                overlay.close_locator(page).click(timeout=2000)
+                logger.info(f"✅ Locator handler closed overlay '{overlay.name}'.")
+            except Exception as e:
+                ok = False
+                logger.warning(f"Locator handler could not close overlay '{overlay.name}': {e} - hiding it.")
+                try:
+                    overlay.hide_locator(page).evaluate(HIDE_SCRIPT, timeout=1000)
+                except Exception as hide_error:
+                    logger.warning(f"Could not hide overlay '{overlay.name}': {hide_error}")
+            self.stats[overlay.name].record((time.perf_counter() - started) * 1000, ok)
+
+        return handler
+
+    def export(self) -> dict:
+        """Liczniki w postaci do przesłania z workera xdist (workeroutput)."""
+        return {name: asdict(stats) for name, stats in self.stats.items() if stats.hits}
+
+    def merge(self, exported: dict):
+        """Dolicza liczniki z innego procesu (np. workera xdist) do podsumowania."""
+        for name, data in exported.items():
+            stats = self.stats.setdefault(name, OverlayStats())
+            stats.hits += data["hits"]
+            stats.failures += data["failures"]
+            stats.total_ms += data["total_ms"]
+            stats.max_ms = max(stats.max_ms, data["max_ms"])
+
+    def summary(self) -> list[tuple[str, OverlayStats]]:
+        """Nakładki, które faktycznie się pojawiły, posortowane od najbardziej kosztownej."""
+        hit = [(name, stats) for name, stats in self.stats.items() if stats.hits]
+        return sorted(hit, key=lambda item: item[1].total_ms, reverse=True)
+
+
+OVERLAY_REGISTRY = OverlayRegistry()
@@ -1,12 +1,83 @@
 import logging
-from playwright.sync_api import Page, Locator, expect
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import unquote_plus
+from playwright.sync_api import Page, Locator, Response, expect, TimeoutError
 from .base_page import BasePage
+from utils.performance import PerformanceBudget
 
 logger = logging.getLogger(__name__)
 
+# Kluczowe elementy PDP odczytane jednym evaluate (do przeglądu katalogu, gdzie liczy się każdy round-trip).
+# Dla każdego elementu zwraca tekst pierwszego widocznego dopasowania albo null.
+DETAILS_SCRIPT = """
+specs => {
+    const visible = el => {
+        const rect = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const read = ([selector, text]) => {
+        const el = Array.from(document.querySelectorAll(selector))
+            .find(el => visible(el) && (!text || el.textContent.includes(text)));
+        return el ? el.textContent.trim().split('\\n')[0].trim() : null;
+    };
+    return Object.fromEntries(Object.entries(specs).map(([name, spec]) => [name, read(spec)]));
+}
+"""
+
+# Licznik koszyka zmienił się względem wartości sprzed kliknięcia (albo pojawił się, gdy go nie było).
+CART_COUNT_CHANGED_SCRIPT = """
+([selector, before]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    const digits = (el.textContent || '').replace(/\\D/g, '');
+    return digits !== '' && Number(digits) !== before;
+}
+"""
+
+
+@dataclass
+class CartOperation:
+    """Czasy (ms od kliknięcia 'Do koszyka') kolejnych sygnałów dodania produktu do koszyka."""
+    status: Optional[int] = None
+    response_ms: float = 0.0
+    dialog_ms: float = 0.0
+    counter_before: Optional[int] = None
+    counter_after: Optional[int] = None
+    counter_ms: Optional[float] = None
+    dismissed_ms: float = 0.0
+
+    def describe(self) -> str:
+        counter = (f", licznik {self.counter_before} -> {self.counter_after} po {self.counter_ms:.0f} ms"
+                   if self.counter_ms is not None else "")
+        return (f"HTTP {self.status} po {self.response_ms:.0f} ms, komunikat po {self.dialog_ms:.0f} ms"
+                f"{counter}, zamknięty po {self.dismissed_ms:.0f} ms")
+
+
 class ProductPage(BasePage):
     # Możesz zdefiniować URL dla konkretnego produktu lub przyjmować go w metodzie
     URL = "https://idream.pl/ipad/apple-ipad-11-wi-fi-128gb-11-gen-niebieski.html"
+    # Dispatch AJAX-a dodającego do koszyka. CS-Cart wysyła go w treści formularza jako
+    # dispatch[checkout.add..<id produktu>] (jak dispatch[auth.login] przy logowaniu), rzadziej w URL-u.
+    CART_DISPATCH = "checkout.add"
+    CART_COUNTER = ".ty-minicart-count"
+    PERFORMANCE_BUDGET = PerformanceBudget(
+        "pdp", ttfb_ms=1500, dom_content_loaded_ms=4500, transfer_bytes=8 * 1024 * 1024,
+        third_party_share=0.5, long_tasks=25,
+    )
+    BUNDLE_BOX = "div.ab__bt_box"
+    BUNDLE_BUTTON = "div.cm-ab__bt-submit"
+    # Nazwa -> (selektor CSS, wymagany fragment tekstu); te same elementy co w lokatorach poniżej.
+    DETAIL_SPECS = {
+        'name': ("h1", None),
+        'price': (".ty-price-num", None),
+        'description': (".idr-accordion-title", "Skrócony opis"),
+        'specification': (".ty-tabs__a", "Dane techniczne"),
+        'bundle': (BUNDLE_BUTTON, "Dodaj zestaw do koszyka"),
+    }
 
     def __init__(self, page: Page):
         super().__init__(page)
@@ -24,48 +95,96 @@ class ProductPage(BasePage):
 
     def open_specific_product(self, product_url: str):
         self.page.goto(product_url)
+        self._record_navigation_performance()
 
     def open_specific_product_and_handle_popups(self, product_url: str):
         """Otwiera konkretną stronę produktu i obsługuje początkowe popupy."""
         logger.info(f"Otwieranie strony produktu: {product_url}")
         self.page.goto(product_url, wait_until="domcontentloaded", timeout=45000)
-        
-        # KROK 1: Obsługa cookies
-        cookie_btn = self.page.get_by_role("button", name="Zezwól na wszystkie")
-        if cookie_btn.is_visible(timeout=5000):
-            try:
-                cookie_btn.click()
-                logger.info("✅ Cookies zaakceptowane.")
-            except Exception:
-                logger.warning("Nie udało się kliknąć cookies.")
+        self._record_navigation_performance()
 
-        # KROK 2: Obsługa bhr popup
-        try:
-            popup_container = self.page.locator("div.bhr-board__canvas.type--POPUP")
-            if popup_container.is_visible(timeout=5000):
-                close_button = self.page.get_by_title("Kliknij tutaj!")
-                close_button.click()
-                logger.info("✅ 'bhr' popup zamknięty.")
-        except Exception as e:
-            logger.error(f"Błąd podczas zamykania bhr popup: {e}")
-
-    def add_product_to_cart(self):
+        if self._consent_is_seeded():
+            logger.info("Stan zgody wstrzyknięty - pomijam obsługę popupów.")
+            return
+
+        self._handle_initial_popups()
+
+    def add_product_to_cart(self, timeout: int = 15000) -> CartOperation:
+        """
+        Dodaje produkt do koszyka i czeka na konkretne sygnały zamiast stałych pauz:
+        odpowiedź AJAX `checkout.add`, komunikat z 'Kontynuuj zakupy', zmianę licznika koszyka
+        (jeśli jest na stronie) i zamknięcie komunikatu. Zwraca czasy poszczególnych etapów.
+        """
         logger.info("Attempting to add product to cart.")
         expect(self.add_to_cart_button_locator).to_be_visible(timeout=10000)
         expect(self.add_to_cart_button_locator).to_be_enabled(timeout=5000)
-        self.add_to_cart_button_locator.click()
+        operation = CartOperation(counter_before=self._cart_count())
+
+        started = time.perf_counter()
+        elapsed_ms = lambda: (time.perf_counter() - started) * 1000
+        with self.expect_ready_response(self._is_cart_response, timeout=timeout,
+                                        replaces="2 s sleep", budget_ms=2000) as response_info:
+            self.add_to_cart_button_locator.click()
+        operation.status = response_info.value.status
+        operation.response_ms = elapsed_ms()
         logger.info("Clicked 'Do koszyka' button.")
-        self.page.wait_for_timeout(2000)
+
         expect(self.continue_shopping_button_locator).to_be_visible(timeout=10000)
         expect(self.continue_shopping_button_locator).to_be_enabled(timeout=5000)
+        operation.dialog_ms = elapsed_ms()
+
+        if operation.counter_before is not None or self.page.locator(self.CART_COUNTER).count():
+            self.page.wait_for_function(CART_COUNT_CHANGED_SCRIPT,
+                                        arg=[self.CART_COUNTER, operation.counter_before], timeout=timeout)
+            operation.counter_after = self._cart_count()
+            operation.counter_ms = elapsed_ms()
+
         self.continue_shopping_button_locator.click()
-        self.page.wait_for_timeout(1000)
-        logger.info("Clicked 'Kontynuuj zakupy' button.")
+        expect(self.continue_shopping_button_locator).to_be_hidden(timeout=5000)
+        operation.dismissed_ms = elapsed_ms()
+        logger.info(f"Clicked 'Kontynuuj zakupy' button. Cart operation: {operation.describe()}")
+        return operation
+
+    def _is_cart_response(self, response: Response) -> bool:
+        request = response.request
+        if request.method != "POST":
+            return False
+        if f"dispatch={self.CART_DISPATCH}" in response.url:
+            return True
+        try:
+            body = unquote_plus(request.post_data or "")
+        except UnicodeDecodeError:  # treść binarna (np. załącznik) - to nie jest formularz koszyka
+            return False
+        return f"dispatch[{self.CART_DISPATCH}" in body
+
+    def _cart_count(self) -> Optional[int]:
+        texts = self.page.locator(self.CART_COUNTER).all_text_contents()
+        digits = re.sub(r"\D", "", texts[0]) if texts else ""
+        return int(digits) if digits else None
 
     def get_product_name(self) -> str:
         # Rezygnujemy z expect(), bo verify_product_details_displayed() już to zrobiło
         return self.product_name_locator.inner_text().strip()
 
+    def get_prices(self) -> list[dict]:
+        """Wszystkie ceny na stronie produktu (tekst i widoczność) jednym wywołaniem."""
+        return self.extract_all(".ty-price-num", {'price': 'text', 'visible': 'visible'}, url_fields=())
+
+    def read_details(self, bundle_timeout: int = 5000) -> dict:
+        """
+        Odczytuje nazwę, cenę, opis, zakładkę specyfikacji i przycisk zestawu jednym evaluate.
+        Zestaw ładuje się AJAX-em po przewinięciu, więc czekamy na niego najwyżej `bundle_timeout` ms;
+        `bundle_timeout=0` czyta stan DOM bez czekania (np. w puli stron, gdzie czekanie jednej
+        strony wstrzymałoby pozostałe). Brakujące elementy mają wartość None.
+        """
+        if bundle_timeout:
+            self.page.evaluate("window.scrollTo(0, 1000)")
+            try:
+                self.page.wait_for_selector(self.BUNDLE_BOX, state="attached", timeout=bundle_timeout)
+            except TimeoutError:
+                logger.debug(f"No bundle section within {bundle_timeout} ms on {self.page.url}")
+        return self.page.evaluate(DETAILS_SCRIPT, self.DETAIL_SPECS)
+
     def get_product_price(self) -> str:
         expect(self.product_price_locator).to_be_visible()
         return self.product_price_locator.inner_text().strip()
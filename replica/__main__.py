@@ -0,0 +1,67 @@
+"""
+Uruchamia lokalną replikę idream.pl, np.:
+
+    python -m replica --port 8080 --latency-ms 80 --jitter-ms 40 --resource-latency search=600 \
+        --resource-failure-rate cart=0.1 --popup-delay-ms 2000 --bhr-items-delay-ms 3000
+
+Testy kierujemy na replikę przez `pytest --base-url http://127.0.0.1:8080/`
+(albo zmienną środowiskową IDREAM_BASE_URL).
+"""
+import argparse
+import logging
+
+from replica.server import RESOURCE_KINDS, ReplicaConfig, ReplicaServer
+
+
+def _per_kind(cast):
+    def parse(value: str):
+        kind, _, amount = value.partition("=")
+        if kind not in RESOURCE_KINDS or not amount:
+            raise argparse.ArgumentTypeError(f"Oczekiwano RODZAJ=WARTOŚĆ, RODZAJ z {RESOURCE_KINDS}: {value!r}")
+        return kind, cast(amount)
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m replica", description="Lokalna replika idream.pl do testów.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Bazowe opóźnienie każdej odpowiedzi.")
+    parser.add_argument("--jitter-ms", type=int, default=0, help="Losowy rozrzut opóźnienia (+/-).")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Odsetek odpowiedzi 503 (0-1).")
+    parser.add_argument("--resource-latency", type=_per_kind(int), action="append", default=[],
+                        metavar="KIND=MS", help="Opóźnienie dla rodzaju zasobu (można powtarzać).")
+    parser.add_argument("--resource-failure-rate", type=_per_kind(float), action="append", default=[],
+                        metavar="KIND=RATE", help="Odsetek błędów dla rodzaju zasobu (można powtarzać).")
+    parser.add_argument("--no-cookie-banner", action="store_true", help="Nie pokazuj banera cookies.")
+    parser.add_argument("--popup-delay-ms", type=int, default=-1, help="Popup 'bhr' po N ms (-1 = wyłączony).")
+    parser.add_argument("--bhr-items-delay-ms", type=int, default=-1, help="'#bhr-items' po N ms (-1 = wyłączony).")
+    parser.add_argument("--salesmanago-delay-ms", type=int, default=-1,
+                        help="Ramka zgody salesmanago po N ms (-1 = wyłączona).")
+    parser.add_argument("--seed", type=int, default=None, help="Ziarno losowania opóźnień i błędów.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    config = ReplicaConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        resource_latency_ms=dict(args.resource_latency),
+        resource_failure_rate=dict(args.resource_failure_rate),
+        cookie_banner=not args.no_cookie_banner,
+        popup_delay_ms=args.popup_delay_ms,
+        bhr_items_delay_ms=args.bhr_items_delay_ms,
+        salesmanago_delay_ms=args.salesmanago_delay_ms,
+        seed=args.seed,
+    )
+    server = ReplicaServer(config, host=args.host, port=args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlparse
+
+from replica import templates
+
+logger = logging.getLogger(__name__)
+
+# Rodzaje zasobów, dla których można osobno ustawić opóźnienie i odsetek błędów.
+RESOURCE_KINDS = ("page", "search", "cart", "login", "frame", "asset")
+SESSION_COOKIE = "replica_session"
+
+
+@dataclass
+class ReplicaConfig:
+    """
+    Parametry lokalnej repliki. Opóźnienie odpowiedzi to `latency_ms` +/- `jitter_ms`
+    (albo wartość z `resource_latency_ms` dla danego rodzaju zasobu), a część odpowiedzi
+    może kończyć się błędem 503 z prawdopodobieństwem `failure_rate`.
+    Opóźnienia nakładek w ms liczone od załadowania strony, -1 = nakładka wyłączona.
+    """
+    latency_ms: int = 0
+    jitter_ms: int = 0
+    failure_rate: float = 0.0
+    resource_latency_ms: dict[str, int] = field(default_factory=dict)
+    resource_failure_rate: dict[str, float] = field(default_factory=dict)
+    cookie_banner: bool = True
+    popup_delay_ms: int = -1  # popup 'bhr'
+    bhr_items_delay_ms: int = -1  # '#bhr-items' (div + iframe)
+    salesmanago_delay_ms: int = -1  # iframe zgody salesmanago
+    accounts: dict[str, str] = field(default_factory=dict)  # pusty = każde niepuste dane logowania są poprawne
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        unknown = set(self.resource_latency_ms) | set(self.resource_failure_rate)
+        unknown -= set(RESOURCE_KINDS)
+        if unknown:
+            raise ValueError(f"Nieznany rodzaj zasobu: {sorted(unknown)}. Dostępne: {RESOURCE_KINDS}")
+
+    @property
+    def overlays(self) -> dict:
+        return {
+            "cookie_banner": self.cookie_banner,
+            "popup_delay_ms": self.popup_delay_ms,
+            "bhr_items_delay_ms": self.bhr_items_delay_ms,
+            "salesmanago_delay_ms": self.salesmanago_delay_ms,
+        }
+
+    def delay_for(self, kind: str, rng: random.Random) -> float:
+        """Zwraca opóźnienie odpowiedzi w sekundach dla danego rodzaju zasobu."""
+        base = self.resource_latency_ms.get(kind, self.latency_ms)
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, base + jitter) / 1000
+
+    def fails(self, kind: str, rng: random.Random) -> bool:
+        rate = self.resource_failure_rate.get(kind, self.failure_rate)
+        return rate > 0 and rng.random() < rate
+
+
+class Reply(NamedTuple):
+    status: int
+    content_type: str
+    body: str
+    kind: str = "page"
+    headers: tuple = ()
+
+
+HTML = "text/html; charset=utf-8"
+
+
+class ReplicaServer:
+    """
+    Lokalny serwer HTTP z markupem w stylu CS-Cart, odtwarzający elementy, na których
+    opierają się page objecty. Działa w wątku w tle - `with ReplicaServer() as server:`.
+    """
+
+    def __init__(self, config: ReplicaConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or ReplicaConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._sessions: dict[str, str] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "ReplicaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replica-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Replica server listening on {self.url}")
+        return self
+
+    def serve_forever(self):
+        logger.info(f"Replica server listening on {self.url}")
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplicaServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug("replica: " + format % args)
+
+            def do_GET(self):
+                self._respond(server.route("GET", self.path, cookies=self._cookies()))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+                self._respond(server.route("POST", self.path, form=form, cookies=self._cookies()))
+
+            def _cookies(self) -> dict[str, str]:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                return {name: morsel.value for name, morsel in cookie.items()}
+
+            def _respond(self, reply: Reply):
+                delay, failed = server._network_conditions(reply.kind)
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    reply = Reply(503, "text/plain; charset=utf-8", "Service Unavailable", reply.kind)
+                payload = reply.body.encode("utf-8")
+                self.send_response(reply.status)
+                self.send_header("Content-Type", reply.content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in reply.headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def _network_conditions(self, kind: str) -> tuple[float, bool]:
+        # random.Random nie jest bezpieczny wątkowo przy współdzielonym ziarnie - losujemy pod blokadą.
+        with self._rng_lock:
+            return self.config.delay_for(kind, self._rng), self.config.fails(kind, self._rng)
+
+    def route(self, method: str, raw_path: str, form: Optional[dict] = None,
+              cookies: Optional[dict] = None) -> Reply:
+        parsed = urlparse(raw_path)
+        path, query = parsed.path, parse_qs(parsed.query)
+        form, cookies = form or {}, cookies or {}
+        overlays = self.config.overlays
+
+        if path == "/":
+            return Reply(200, HTML, templates.home_page(**overlays))
+        if path == "/profil.html":
+            email = self._sessions.get(cookies.get(SESSION_COOKIE, ""))
+            if email:
+                return Reply(200, HTML, templates.profile_page(email, **overlays), "login")
+            return Reply(200, HTML, templates.login_page(**overlays), "login")
+        if path == "/index.php":
+            dispatch = query.get("dispatch", [""])[0]
+            if dispatch == "products.search":
+                return Reply(200, HTML, templates.search_results(query.get("q", [""])[0], **overlays), "search")
+            if method == "POST" and any(key.startswith("dispatch[checkout.add..") for key in form):
+                return Reply(200, "application/json", '{"cart_amount": 1}', "cart")
+            if "dispatch[auth.login]" in form and method == "POST":
+                return self._login(form)
+        if path == "/images/logo.svg":
+            return Reply(200, "image/svg+xml", templates.LOGO_SVG, "asset")
+        if path == "/replica/bhr-frame.html":
+            return Reply(200, HTML, templates.BHR_FRAME, "frame")
+        if path == "/replica/salesmanago-consent.html":
+            return Reply(200, HTML, templates.SALESMANAGO_FRAME, "frame")
+        for product_id, (name, href, price) in enumerate(templates.PRODUCTS, start=1):
+            if path == href:
+                return Reply(200, HTML, templates.product_page(name, price, product_id, **overlays))
+        for name, href in templates.MENU_CATEGORIES:
+            if path == href:
+                return Reply(200, HTML, templates.category_page(name, **overlays))
+        return Reply(404, "text/plain; charset=utf-8", "Not found")
+
+    def _login(self, form: dict) -> Reply:
+        email = form.get("user_login", [""])[0]
+        password = form.get("password", [""])[0]
+        accounts = self.config.accounts
+        valid = bool(email and password) and (not accounts or accounts.get(email) == password)
+        if not valid:
+            return Reply(200, HTML, templates.login_page("Błędny e-mail lub hasło", **self.config.overlays), "login")
+        token = f"{self._rng.getrandbits(64):016x}"
+        self._sessions[token] = email
+        return Reply(
+            200, HTML, templates.profile_page(email, just_logged_in=True, **self.config.overlays), "login",
+            headers=(("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"),),
+        )
@@ -0,0 +1,231 @@
+from html import escape
+
+MENU_CATEGORIES = [
+    ("Mac", "/mac/"),
+    ("iPhone", "/iphone/"),
+    ("iPad", "/ipad/"),
+    ("Watch", "/watch/"),
+    ("Muzyka", "/muzyka/"),
+    ("TV", "/tv/"),
+    ("Akcesoria", "/akcesoria/"),
+]
+
+PRODUCTS = [
+    ("Apple iPad 11 Wi-Fi 128GB (11 gen.) niebieski", "/ipad/apple-ipad-11-wi-fi-128gb-11-gen-niebieski.html", "1 799"),
+    ("Apple iPhone 15 128GB niebieski", "/iphone/apple-iphone-15/apple-iphone-15-128gb-niebieski.html", "3 499"),
+    ("Apple iPad Air 13 M2 128GB Wi-Fi + Cellular (6. gen.) gwiezdna szarość",
+     "/ipad/ipad-air/apple-ipad-air-13-m2-128gb-wi-fi-cellular-6.gen-gwiezdna-szarosc-2024.html", "4 999"),
+]
+
+SOCIAL_LINKS = [
+    "https://www.instagram.com/idream_pl/",
+    "https://www.facebook.com/iDreamPolska/",
+    "https://www.tiktok.com/@idream_pl",
+    "https://www.youtube.com/user/iDreamPL",
+]
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+.ut2-lfl-menu { display: none; }
+.ut2-lfl-menu.is-open { display: block; }
+.cookie-banner { position: fixed; bottom: 0; left: 0; right: 0; padding: 16px; background: #eee; z-index: 100; }
+.bhr-board__canvas.type--POPUP { position: fixed; inset: 20%; background: #fff; border: 1px solid #000; z-index: 200; }
+.cm-notification-content { position: fixed; top: 30%; left: 30%; padding: 24px; background: #fff; z-index: 150; }
+#bhr-items { position: fixed; right: 16px; bottom: 80px; z-index: 180; background: #fff; }
+#bhr-items iframe { width: 320px; height: 120px; border: 0; }
+iframe[title="salesmanago-consent-form-title"] { position: fixed; top: 0; right: 0; width: 360px; height: 140px;
+    border: 0; background: #fff; z-index: 190; }
+"""
+
+# Nakładki sterowane parametrami serwera: każde opóźnienie w ms albo -1 (nakładka wyłączona).
+OVERLAY_SCRIPT = """
+(() => {
+    const consentGiven = document.cookie.includes('cookie_consent=1');
+    const later = (delay, show) => { if (delay >= 0) setTimeout(show, delay); };
+    if (!consentGiven && %(cookie_banner)s) {
+        const banner = document.createElement('div');
+        banner.className = 'cookie-banner';
+        banner.innerHTML = '<button type="button">Zezwól na wszystkie</button>';
+        banner.querySelector('button').addEventListener('click', () => {
+            document.cookie = 'cookie_consent=1; path=/; max-age=31536000';
+            banner.remove();
+        });
+        document.body.appendChild(banner);
+    }
+    later(%(popup_delay_ms)s, () => {
+        const popup = document.createElement('div');
+        popup.className = 'bhr-board__canvas type--POPUP';
+        popup.innerHTML = '<p>Promocja!</p><a href="#" title="Kliknij tutaj!">×</a>';
+        popup.querySelector('a').addEventListener('click', event => {
+            event.preventDefault();
+            popup.remove();
+        });
+        document.body.appendChild(popup);
+    });
+    later(%(bhr_items_delay_ms)s, () => {
+        const items = document.createElement('div');
+        items.id = 'bhr-items';
+        items.innerHTML = '<div class="bhr-items__bar">Oferta dnia</div><iframe src="/replica/bhr-frame.html"></iframe>';
+        items.querySelector('.bhr-items__bar').addEventListener('click', event => event.currentTarget.remove());
+        document.body.appendChild(items);
+    });
+    later(%(salesmanago_delay_ms)s, () => {
+        const frame = document.createElement('iframe');
+        frame.title = 'salesmanago-consent-form-title';
+        frame.src = '/replica/salesmanago-consent.html';
+        document.body.appendChild(frame);
+    });
+    // Ramki zamykają się same, wysyłając komunikat do strony nadrzędnej.
+    window.addEventListener('message', event => {
+        const selectors = {
+            'bhr-close': '#bhr-items iframe',
+            'salesmanago-close': 'iframe[title="salesmanago-consent-form-title"]',
+        };
+        const target = selectors[event.data] && document.querySelector(selectors[event.data]);
+        if (target) target.remove();
+    });
+})();
+"""
+
+# Treść ramki z '#bhr-items': zamyka ją czwarty div (ten, który klika BHR_IFRAME).
+BHR_FRAME = """<!DOCTYPE html>
+<html><body>
+<div><div><div>Sprawdź ofertę dnia</div></div><div class="bhr-close" onclick="parent.postMessage('bhr-close', '*')">×</div></div>
+</body></html>"""
+
+SALESMANAGO_FRAME = """<!DOCTYPE html>
+<html><body>
+<p>Czy chcesz otrzymywać powiadomienia o promocjach?</p>
+<button type="button" onclick="parent.postMessage('salesmanago-close', '*')">Tak</button>
+<button type="button" onclick="parent.postMessage('salesmanago-close', '*')">Nie</button>
+</body></html>"""
+
+
+def layout(title: str, body: str, cookie_banner: bool = True, popup_delay_ms: int = -1,
+           bhr_items_delay_ms: int = -1, salesmanago_delay_ms: int = -1) -> str:
+    menu = "".join(
+        f'<div class="ut2-lfl"><p><a href="{href}">{name}</a></p></div>' for name, href in MENU_CATEGORIES
+    )
+    socials = "".join(f'<a href="{href}" target="_blank" rel="noopener">{href}</a> ' for href in SOCIAL_LINKS)
+    overlays = OVERLAY_SCRIPT % {"cookie_banner": "true" if cookie_banner else "false",
+                                 "popup_delay_ms": popup_delay_ms,
+                                 "bhr_items_delay_ms": bhr_items_delay_ms,
+                                 "salesmanago_delay_ms": salesmanago_delay_ms}
+    return f"""<!DOCTYPE html>
+<html lang="pl">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<style>{STYLE}</style>
+</head>
+<body>
+<header>
+  <div class="top-logo"><a href="/"><img src="/images/logo.svg" alt="Logo iDream" width="120" height="40"></a></div>
+  <form action="/index.php" method="get" name="search_form">
+    <input type="hidden" name="dispatch" value="products.search">
+    <input type="text" id="search_input" name="q" value="">
+    <button type="submit" class="ty-search-magnifier">Szukaj</button>
+  </form>
+  <div id="sw_dropdown_541"><i onclick="document.querySelector('.ut2-lfl-menu').classList.toggle('is-open')">☰</i></div>
+  <nav class="ut2-lfl-menu">{menu}</nav>
+  <a class="ut2-top-cart" href="/index.php?dispatch=checkout.cart">Koszyk <span class="ty-minicart-count">0</span></a>
+</header>
+<main>{body}</main>
+<footer>{socials}</footer>
+<script>{overlays}</script>
+</body>
+</html>"""
+
+
+def home_page(**overlays) -> str:
+    return layout(
+        "iDream | Apple sklep, autoryzowany sprzedawca Apple Premium Reseller Polska",
+        "<h1>iDream</h1>",
+        **overlays,
+    )
+
+
+def search_results(query: str, **overlays) -> str:
+    matches = [p for p in PRODUCTS if query.lower() in p[0].lower()] or PRODUCTS
+    items = "".join(
+        f'<div class="ut2-gl__item"><div class="ut2-gl__name"><a href="{href}" class="product-title">{escape(name)}</a></div>'
+        f'<span class="ty-price-num">{price}</span></div>'
+        for name, href, price in matches
+    )
+    body = (f'<h1><span class="ty-mainbox-title__left">Wyniki wyszukiwania</span></h1>'
+            f'<p>Szukana fraza: {escape(query)}</p><div class="grid-list">{items}</div>')
+    return layout("Wyniki wyszukiwania", body, **overlays)
+
+
+def product_page(name: str, price: str, product_id: int = 1, **overlays) -> str:
+    body = f"""
+<h1>{escape(name)}</h1>
+<span class="ty-price-num">{price}</span>
+<button type="button" class="ty-btn__add-to-cart" id="add_to_cart">Do koszyka</button>
+<div class="idr-accordion-title">Skrócony opis</div>
+<a class="ty-tabs__a" href="#features">Dane techniczne</a>
+<div class="ab__bt_box">
+  <div class="cm-ab__bt-submit ty-btn">Dodaj zestaw do koszyka</div>
+</div>
+<div class="cm-notification-content" hidden>
+  <p>Produkt został dodany do koszyka</p>
+  <a class="ty-btn ty-btn__secondary cm-notification-close" href="#">Kontynuuj zakupy</a>
+</div>
+<script>
+  const notification = document.querySelector('.cm-notification-content');
+  document.getElementById('add_to_cart').addEventListener('click', async () => {{
+      // Jak w CS-Cart: dispatch w treści formularza, nie w URL-u.
+      await fetch('/index.php', {{
+          method: 'POST',
+          body: new URLSearchParams({{ 'dispatch[checkout.add..{product_id}]': '', 'is_ajax': '1',
+                                      'product_data[{product_id}][amount]': '1' }}),
+      }});
+      notification.hidden = false;
+      const counter = document.querySelector('.ty-minicart-count');
+      counter.textContent = Number(counter.textContent) + 1;
+  }});
+  notification.querySelector('a').addEventListener('click', event => {{
+      event.preventDefault();
+      notification.hidden = true;
+  }});
+</script>
+"""
+    return layout(name, body, **overlays)
+
+
+def login_page(error: str = "", **overlays) -> str:
+    message = f'<div class="cm-notification-content notification-content alert-error">{escape(error)}</div>' if error else ""
+    body = f"""
+{message}
+<h1>Zaloguj się</h1>
+<form name="main_login_form" action="/index.php" method="post">
+  <input type="hidden" name="return_url" value="/profil.html">
+  <label for="login_main_login">E-mail</label>
+  <input type="text" id="login_main_login" name="user_login" value="">
+  <label for="psw_main_login">Hasło</label>
+  <input type="password" id="psw_main_login" name="password" value="">
+  <div class="buttons-container clearfix">
+    <button type="submit" class="ty-btn__login ty-btn__secondary ty-btn" name="dispatch[auth.login]">Zaloguj się</button>
+  </div>
+</form>
+"""
+    return layout("Zaloguj się", body, **overlays)
+
+
+def profile_page(email: str, just_logged_in: bool = False, **overlays) -> str:
+    message = ('<div class="cm-notification-content notification-content alert-success">'
+               'Użytkownik został poprawnie zalogowany</div>') if just_logged_in else ""
+    body = f"""
+{message}
+<h1>Mój profil</h1>
+<p class="ty-account-info__name">{escape(email)}</p>
+<a href="/index.php?dispatch=auth.logout">Wyloguj</a>
+"""
+    return layout("Mój profil", body, **overlays)
+
+
+def category_page(name: str, **overlays) -> str:
+    return layout(name, f"<h1>{escape(name)}</h1>", **overlays)
+
+
+LOGO_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="120" height="40"><text x="0" y="30">iDream</text></svg>"""
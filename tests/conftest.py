@@ -1,26 +1,699 @@
+import logging
+import os
+import re
+from dataclasses import asdict
+from typing import Optional
 import pytest
-from playwright.sync_api import Page
+from playwright.sync_api import Browser, BrowserContext, Error, Page, Playwright
+from pages.base_page import BasePage
 from pages.home_page import HomePage
 from pages.product_page import ProductPage # Zostawiamy, jeśli jest używane w innych testach
 from pages.login_page import LoginPage
+from pages.overlays import OVERLAY_REGISTRY
+from replica.server import ReplicaServer
+from utils.accounts import TEST_USER_EMAIL, TEST_USER_PASSWORD
+from utils.auth_state import AuthState
+from utils.base_url import ENV_VAR, apply_base_url
+from utils.browser_server import AttachReport, BrowserServer
+from utils.consent_state import ConsentState
+from utils.context_pool import ContextPool, PoolMetrics
+from utils.har_mode import DEFAULT_HAR_DIR, HAR_MODES, UNMATCHED_POLICIES, HarRecordingMissing, HarSession
+from utils.link_health import LinkHealthChecker
+from utils.network_profiles import PROFILES, BlockStats, RequestBlocker
+from utils.performance import PerformanceBudgetPlugin
+from utils.security_scanner import HttpSecurityScanner
+from utils.shared_page import ReadOnlyPageGuard
+from utils.sleep_detector import SleepDetectorPlugin
+from utils.step_timing import StepTimingPlugin, install_playwright_hooks
+from utils.visual_regression import DEFAULT_BASELINE_DIR, VisualBaselines
+from utils.web_vitals import DEFAULT_DB, VitalsStore, default_build_id
+
+logger = logging.getLogger(__name__)
+
+# Suma zablokowanych żądań ze wszystkich testów - wypisywana w podsumowaniu.
+_BLOCKED_TOTAL = BlockStats()
+_POOL_METRICS = []
+_BROWSER_ATTACH = []
+# Sesje HAR kontekstów z context_factory - żyją dłużej niż test, więc sprawdzamy je po każdym teście.
+_FACTORY_HAR_SESSIONS = []
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("idream", "Opcje testów idream.pl")
+    group.addoption(
+        "--consent-state",
+        action="store",
+        default="on",
+        choices=("on", "off", "rebuild"),
+        help="Wstrzykiwanie zapisanego stanu zgody (cookies + popup 'bhr') do każdego kontekstu. "
+             "'rebuild' wymusza zbudowanie snapshotu od nowa.",
+    )
+    group.addoption(
+        "--auth-state",
+        action="store",
+        default="on",
+        choices=("on", "rebuild"),
+        help="Zapisana sesja zalogowanego klienta dla fixtury logged_in_page. "
+             "'rebuild' wymusza nowe logowanie zamiast użycia sesji z dysku.",
+    )
+    group.addoption(
+        "--network-profile",
+        action="store",
+        default="functional-minimal",
+        choices=tuple(PROFILES),
+        help="Domyślny profil blokowania żądań. Pojedynczy test może go zmienić markerem "
+             "@pytest.mark.network_profile('full-fidelity').",
+    )
+    group.addoption(
+        "--har-mode",
+        action="store",
+        default="off",
+        choices=HAR_MODES,
+        help="record: zapisuje ruch każdego testu do HAR; replay: odtwarza go offline przez route_from_har.",
+    )
+    group.addoption(
+        "--har-dir",
+        action="store",
+        default=str(DEFAULT_HAR_DIR),
+        help="Katalog z nagraniami HAR (jeden plik na test).",
+    )
+    group.addoption(
+        "--har-unmatched",
+        action="store",
+        default="abort",
+        choices=UNMATCHED_POLICIES,
+        help="Co zrobić z żądaniem, którego nie ma w nagraniu: abort, fallback (do sieci) albo fail.",
+    )
+    group.addoption(
+        "--context-pool",
+        action="store",
+        type=int,
+        default=0,
+        help="Rozmiar puli rozgrzanych kontekstów na worker (0 = wyłączona, każdy test dostaje świeży kontekst).",
+    )
+    group.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="Podłącza się (CDP) do długo żyjącego Chromium zamiast uruchamiać nowy; pierwsze "
+             "uruchomienie go startuje. Zatrzymanie: python -m utils.browser_server stop.",
+    )
+    group.addoption(
+        "--reuse-tab",
+        action="store_true",
+        default=False,
+        help="Z --reuse-browser: testy tylko do odczytu (read_only_home_page) dostają tę samą, już otwartą "
+             "kartę idream.pl. Bez pytest-xdist.",
+    )
+    group.addoption(
+        "--replica",
+        action="store_true",
+        default=False,
+        help="Uruchamia lokalną replikę idream.pl i kieruje na nią wszystkie page objecty "
+             "(strojenie opóźnień: python -m replica + --base-url).",
+    )
+    group.addoption(
+        "--run-security",
+        action="store_true",
+        default=False,
+        help="Uruchamia testy bezpieczeństwa (marker 'security'), które wysyłają payloady ataków na sklep.",
+    )
+    group.addoption(
+        "--run-performance",
+        action="store_true",
+        default=False,
+        help="Uruchamia testy budżetów wydajności (marker 'performance'); pomiary po nawigacjach "
+             "(--performance-budgets) działają niezależnie od tej opcji.",
+    )
+    group.addoption(
+        "--update-visual-baselines",
+        action="store_true",
+        default=False,
+        help="Zapisuje bieżące zrzuty jako nowe baseline'y regresji wizualnej zamiast je porównywać.",
+    )
+    group.addoption(
+        "--visual-baseline-dir",
+        action="store",
+        default=str(DEFAULT_BASELINE_DIR),
+        help="Katalog z baseline'ami regresji wizualnej.",
+    )
+    group.addoption(
+        "--hard-sleep-budget-ms",
+        action="store",
+        type=float,
+        default=-1,
+        help="Limit łącznego czasu wait_for_timeout na test; przekroczenie oblewa test (-1 = tylko raport).",
+    )
+    group.addoption(
+        "--performance-budgets",
+        action="store",
+        default="report",
+        choices=("off", "report", "enforce"),
+        help="Pomiar wydajności po każdej nawigacji page objectu względem jego PERFORMANCE_BUDGET: "
+             "'report' dopisuje przekroczenia do raportu, 'enforce' oblewa test.",
+    )
+    group.addoption(
+        "--build-id",
+        action="store",
+        default=None,
+        help="Identyfikator builda dla próbek Core Web Vitals; włącza też zestaw 'vitals'. Domyślnie "
+             "z IDREAM_BUILD_ID/CI_PIPELINE_ID/GITHUB_RUN_ID - lokalnie bez niego próbki nie są zapisywane.",
+    )
+    group.addoption(
+        "--vitals-db",
+        action="store",
+        default=str(DEFAULT_DB),
+        help="Baza SQLite z trendami Core Web Vitals (raport: python -m utils.web_vitals).",
+    )
+    group.addoption(
+        "--vitals-samples",
+        action="store",
+        type=int,
+        default=3,
+        help="Liczba pomiarów Core Web Vitals na stronę i breakpoint (każdy w świeżym kontekście).",
+    )
+    group.addoption(
+        "--step-timing",
+        action="store_true",
+        default=False,
+        help="Mierzy czas metod page objectów i wywołań Playwrighta; zapisuje JSON per test, "
+             "kroki Allure i ranking najdroższych kroków.",
+    )
+    group.addoption(
+        "--step-timing-dir",
+        action="store",
+        default="test-results/step-timings",
+        help="Katalog na artefakty JSON z czasami kroków.",
+    )
+
+
+# Zestawy uruchamiane tylko na żądanie: marker -> opcja, która go włącza (działa też jawne `-m <marker>`).
+OPT_IN_MARKERS = {
+    "security": "--run-security",
+    "performance": "--run-performance",
+    "vitals": "--build-id",
+}
+
+
+def _opted_in(config, marker: str, option: str) -> bool:
+    if config.getoption(option):
+        return True
+    markexpr = config.getoption("markexpr", default="") or ""
+    return re.search(rf"(?<!not )\b{marker}\b", markexpr) is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    for marker, option in OPT_IN_MARKERS.items():
+        if _opted_in(config, marker, option):
+            continue
+        skip = pytest.mark.skip(reason=f"Zestaw '{marker}' jest opcjonalny - uruchom z -m {marker} albo {option}.")
+        for item in items:
+            if item.get_closest_marker(marker) is not None:
+                item.add_marker(skip)
+
+
+def pytest_configure(config):
+    # Adres sklepu: --replica (lokalna replika w tym procesie), --base-url z pytest-base-url
+    # albo zmienna IDREAM_BASE_URL. Bez żadnej z nich testujemy produkcyjne idream.pl.
+    base_url = config.getoption("--base-url", default=None) or os.environ.get(ENV_VAR)
+    if config.getoption("--replica"):
+        config._idream_replica = ReplicaServer().start()
+        base_url = config._idream_replica.url
+    if base_url:
+        apply_base_url(base_url, BasePage)
+
+    # Karta z długo żyjącej przeglądarki nie ma zgody z ConsentState, blokera ani browser_context_args
+    # i jest jedna na całą przeglądarkę - dostają ją tylko testy tylko do odczytu, w jednym procesie.
+    if config.getoption("--reuse-tab"):
+        if not config.getoption("--reuse-browser"):
+            raise pytest.UsageError("--reuse-tab wymaga --reuse-browser.")
+        if os.environ.get("PYTEST_XDIST_WORKER") or config.getoption("numprocesses", default=None):
+            raise pytest.UsageError("--reuse-tab nie działa z pytest-xdist - wszystkie workery dostałyby tę samą kartę.")
+
+    # Każde wait_for_timeout trafia do raportu (user_properties, sekcja testu i podsumowanie).
+    config.pluginmanager.register(SleepDetectorPlugin(config.getoption("--hard-sleep-budget-ms")),
+                                  "idream-sleep-detector")
+    config.pluginmanager.register(PerformanceBudgetPlugin(config.getoption("--performance-budgets")),
+                                  "idream-performance-budgets")
+
+    if config.getoption("--step-timing"):
+        install_playwright_hooks()
+        config.pluginmanager.register(StepTimingPlugin(config.getoption("--step-timing-dir")), "idream-step-timing")
+
+
+def pytest_unconfigure(config):
+    replica = getattr(config, "_idream_replica", None)
+    if replica is not None:
+        replica.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Zapamiętujemy wynik każdej fazy, żeby fixtury mogły w teardownie sprawdzić, czy test przeszedł.
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    # Kontrole po samym teście (a nie w teardownie fixtury), żeby oblewały test zamiast kończyć się ERROR-em:
+    # zmiana współdzielonej strony tylko do odczytu i żądania spoza nagrania HAR (--har-unmatched=fail).
+    guard = getattr(item, "_read_only_guard", None)
+    har_sessions = [getattr(item, "_har_session", None), *_FACTORY_HAR_SESSIONS]
+    try:
+        result = yield
+    except BaseException:
+        if guard is not None:
+            guard.release()
+        raise
+    failures = []
+    violations = guard.release() if guard is not None else []
+    if violations:
+        failures.append("Test zmienił współdzieloną stronę tylko do odczytu (zostanie załadowana od nowa):\n"
+                        + "\n".join(violations))
+    for har in filter(None, har_sessions):
+        unmatched = har.take_unmatched()
+        if unmatched:
+            failures.append(f"{len(unmatched)} żądań spoza nagrania {har.path}:\n" + "\n".join(unmatched[:20]))
+    if failures:
+        pytest.fail("\n\n".join(failures), pytrace=False)
+    return result
+
+
+def pytest_sessionfinish(session):
+    # Worker xdist: podsumowania zebrane w tym procesie odsyłamy do kontrolera (workeroutput),
+    # bo to on wypisuje pytest_terminal_summary.
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["idream_overlays"] = OVERLAY_REGISTRY.export()
+        workeroutput["idream_pool_metrics"] = [(worker_id, asdict(metrics)) for worker_id, metrics in _POOL_METRICS]
+        workeroutput["idream_browser_attach"] = [(worker_id, asdict(report)) for worker_id, report in _BROWSER_ATTACH]
+        workeroutput["idream_performance"] = session.config.pluginmanager.get_plugin(
+            "idream-performance-budgets").export()
+        workeroutput["idream_sleeps"] = session.config.pluginmanager.get_plugin(
+            "idream-sleep-detector").detector.export()
+        step_timing = session.config.pluginmanager.get_plugin("idream-step-timing")
+        if step_timing is not None:
+            workeroutput["idream_step_timing"] = step_timing.export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Kontroler xdist: dolicza podsumowania z zakończonego workera.
+    output = getattr(node, "workeroutput", None) or {}
+    OVERLAY_REGISTRY.merge(output.get("idream_overlays", {}))
+    _POOL_METRICS.extend((worker_id, PoolMetrics(**metrics)) for worker_id, metrics in
+                         output.get("idream_pool_metrics", []))
+    _BROWSER_ATTACH.extend((worker_id, AttachReport(**report)) for worker_id, report in
+                           output.get("idream_browser_attach", []))
+    node.config.pluginmanager.get_plugin("idream-performance-budgets").merge(output.get("idream_performance", {}))
+    node.config.pluginmanager.get_plugin("idream-sleep-detector").detector.merge(output.get("idream_sleeps", {}))
+    step_timing = node.config.pluginmanager.get_plugin("idream-step-timing")
+    if step_timing is not None:
+        step_timing.merge(output.get("idream_step_timing", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _BLOCKED_TOTAL.requests:
+        terminalreporter.section("Zablokowane żądania sieciowe")
+        terminalreporter.write_line(
+            f"Łącznie {_BLOCKED_TOTAL.requests} żądań (~{_BLOCKED_TOTAL.known_bytes / 1024 / 1024:.1f} MiB znanych): "
+            + ", ".join(f"{reason}: {count}" for reason, count in _BLOCKED_TOTAL.by_reason.most_common())
+        )
+
+    if _BROWSER_ATTACH:
+        terminalreporter.section("Przeglądarka (--reuse-browser)")
+        for worker_id, report in _BROWSER_ATTACH:
+            terminalreporter.write_line(f"[{worker_id}] {report.describe()}")
+
+    if _POOL_METRICS:
+        terminalreporter.section("Pula kontekstów")
+        for worker_id, metrics in _POOL_METRICS:
+            terminalreporter.write_line(f"[{worker_id}] {metrics.describe()}")
+
+    overlays = OVERLAY_REGISTRY.summary()
+    if overlays:
+        terminalreporter.section("Nakładki zamknięte przez locator handlery")
+        for name, stats in overlays:
+            terminalreporter.write_line(
+                f"{name}: {stats.hits} trafień, {stats.failures} błędów, "
+                f"łącznie {stats.total_ms:.0f} ms, max {stats.max_ms:.0f} ms"
+            )
+
+
+@pytest.fixture(scope="session")
+def browser(pytestconfig, playwright: Playwright, launch_browser, browser_name) -> Browser:
+    """Nowa przeglądarka na sesję albo, z --reuse-browser, podłączenie do długo żyjącego Chromium."""
+    if not pytestconfig.getoption("--reuse-browser") or browser_name != "chromium":
+        if pytestconfig.getoption("--reuse-browser"):
+            logger.warning("--reuse-browser works only with chromium (CDP) - launching a fresh browser.")
+        fresh_browser = launch_browser()
+        yield fresh_browser
+        fresh_browser.close()
+        return
+
+    server = BrowserServer(playwright, headless=not pytestconfig.getoption("--headed"))
+    attached_browser, report = server.connect()
+    _BROWSER_ATTACH.append((os.environ.get("PYTEST_XDIST_WORKER", "master"), report))
+    yield attached_browser
+    # Dla przeglądarki podłączonej przez CDP close() tylko się rozłącza - proces działa dalej.
+    attached_browser.close()
+
+
+@pytest.fixture(scope="session")
+def warm_tab(pytestconfig, browser: Browser) -> Page:
+    """
+    Karta idream.pl w domyślnym kontekście długo żyjącej przeglądarki (--reuse-tab). Profil przeglądarki
+    pamięta zgodę, a karta zostaje otwarta między uruchomieniami. Używa jej tylko shared_home_page_guard,
+    który sam ładuje stronę, gdy karta jest gdzie indziej.
+    """
+    default_context = browser.contexts[0] if browser.contexts else browser.new_context()
+    for tab in default_context.pages:
+        if tab.url.startswith(BasePage.URL):
+            logger.info(f"Reusing open tab {tab.url}")
+            return tab
+    return default_context.new_page()
+
+
+def _dismiss_initial_popups(page: Page):
+    BasePage(page).open_page_and_handle_initial_popups()
+
+
+@pytest.fixture(scope="session")
+def consent_state(pytestconfig, browser: Browser):
+    """Stan zgody budowany raz na worker (lub odczytany z dysku, jeśli wciąż aktualny)."""
+    mode = pytestconfig.getoption("--consent-state")
+    if mode == "off":
+        yield None
+        return
+
+    state = ConsentState(base_url=BasePage.URL)
+    if pytestconfig.getoption("--har-mode") == "replay":
+        # Odtwarzanie jest offline - nie przebudowujemy snapshotu, używamy tego, co jest na dysku.
+        yield state if state.storage_path.exists() else None
+        return
+    if mode == "rebuild":
+        state.mark_stale("rebuild requested with --consent-state=rebuild")
+    state.ensure(browser, _dismiss_initial_popups)
+    yield state
+
+
+def _skip_live_http_in_replay(config, what: str):
+    """Żądania spoza przeglądarki (requests, APIRequestContext) nie przechodzą przez route_from_har."""
+    if config.getoption("--har-mode") == "replay":
+        pytest.skip(f"{what} łączy się z siecią poza przeglądarką - nie da się tego odtworzyć z HAR (--har-mode=replay).")
+
+
+def _perform_login(page: Page, email: str, password: str):
+    login_page = LoginPage(page)
+    login_page.navigate_to_login_page()
+    login_page.login(email, password)
+    login_page.assert_login_is_successful()
+
+
+@pytest.fixture(scope="session")
+def auth_state(pytestconfig, playwright: Playwright, browser: Browser, browser_context_args) -> AuthState:
+    """Sesja klienta zalogowanego raz na worker (albo odczytana z dysku i sprawdzona jednym żądaniem)."""
+    state = AuthState(
+        base_url=BasePage.URL,
+        email=TEST_USER_EMAIL,
+        password=TEST_USER_PASSWORD,
+        profile_url=LoginPage.LOGIN_URL,
+        login_form_marker=LoginPage.LOGIN_FORM_MARKER,
+    )
+    if pytestconfig.getoption("--har-mode") == "replay":
+        # Bez sprawdzania sesji na serwerze - odtworzone odpowiedzi i tak pochodzą z zalogowanego nagrania.
+        if not state.storage_path.exists():
+            pytest.skip(f"Brak zapisanej sesji {state.storage_path} - zaloguj się raz bez --har-mode=replay.")
+        return state
+    state.ensure(playwright, browser, _perform_login, browser_context_args,
+                 force=pytestconfig.getoption("--auth-state") == "rebuild")
+    return state
+
+
+@pytest.fixture
+def logged_in_page(context_factory, auth_state: AuthState) -> Page:
+    """Strona w nowym kontekście z sesją zalogowanego klienta - bez przechodzenia przez formularz."""
+    logged_in_context = context_factory(storage_state=str(auth_state.storage_path))
+    yield logged_in_context.new_page()
+    logged_in_context.close()
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args, consent_state):
+    # Domyślny rozmiar okna dla wszystkich kontekstów; --device i pojedynczy test
+    # (@pytest.mark.browser_context_args(viewport=...)) mogą go nadpisać.
+    args = {"viewport": DEFAULT_VIEWPORT, **browser_context_args}
+    if consent_state is None:
+        return args
+    return {**args, "storage_state": str(consent_state.storage_path)}
+
+
+def _network_profile_name(request) -> str:
+    marker = request.node.get_closest_marker("network_profile")
+    if marker:
+        return marker.args[0]
+    return request.config.getoption("--network-profile")
+
+
+def _record_blocked(request, blocker: RequestBlocker):
+    _BLOCKED_TOTAL.add(blocker.stats)
+    request.node.user_properties.append(("blocked_requests", blocker.stats.requests))
+    request.node.user_properties.append(("blocked_bytes_known", blocker.stats.known_bytes))
+    logger.info(f"Network: {blocker.describe()}")
+
+
+def _har_session(config, test_id: str) -> HarSession:
+    return HarSession(
+        mode=config.getoption("--har-mode"),
+        test_id=test_id,
+        directory=config.getoption("--har-dir"),
+        unmatched=config.getoption("--har-unmatched"),
+    )
+
+
+def _current_test_id() -> str:
+    # PYTEST_CURRENT_TEST ma postać "<node id> (setup|call|teardown)".
+    return os.environ.get("PYTEST_CURRENT_TEST", "session").rsplit(" ", 1)[0]
+
+
+@pytest.fixture
+def context(context: BrowserContext, consent_state, request) -> BrowserContext:
+    if consent_state is not None:
+        consent_state.apply(context)
+
+    har = _har_session(request.config, request.node.nodeid)
+    blocker = RequestBlocker.for_profile(_network_profile_name(request))
+
+    # Kolejność ma znaczenie: Playwright sprawdza najpierw trasy zarejestrowane najpóźniej.
+    har.install_unmatched_guard(context)
+    blocker.install(context)
+    try:
+        har.install(context)
+    except HarRecordingMissing as e:
+        pytest.skip(str(e))
+    # Żądania spoza nagrania oblewają sam test - sprawdza je pytest_runtest_call.
+    request.node._har_session = har
+
+    yield context
+
+    _record_blocked(request, blocker)
+
+
+@pytest.fixture(scope="session")
+def context_factory(pytestconfig, browser: Browser, browser_context_args, consent_state):
+    """
+    Tworzy konteksty żyjące dłużej niż pojedynczy test (np. dla fixtur o zasięgu modułu)
+    z tym samym stanem zgody, profilem sieci i trybem HAR co zwykły `context`.
+
+    Nagranie HAR jest kluczowane przez `har_id` (domyślnie node id bieżącego testu) i numer
+    kolejnego kontekstu z tym kluczem. Fixtury o zasięgu modułu podają własny, stały `har_id`,
+    bo pierwszy test modułu zależy od wybranych testów.
+    """
+    created = []
+    har_counts = {}
+
+    def factory(profile: str = None, har_id: str = None, **context_args) -> BrowserContext:
+        new_context = browser.new_context(**{**browser_context_args, **context_args})
+        created.append(new_context)
+        if consent_state is not None:
+            consent_state.apply(new_context)
+        har_id = har_id or _current_test_id()
+        har = _har_session(pytestconfig, f"{har_id}#{har_counts.setdefault(har_id, 0)}")
+        har_counts[har_id] += 1
+        # Ta sama kolejność tras co w fixturze `context`.
+        har.install_unmatched_guard(new_context)
+        RequestBlocker.for_profile(profile or pytestconfig.getoption("--network-profile")).install(new_context)
+        try:
+            har.install(new_context)
+        except HarRecordingMissing as e:
+            pytest.skip(str(e))
+        if har.enabled:
+            _FACTORY_HAR_SESSIONS.append(har)
+        return new_context
+
+    yield factory
+    for created_context in created:
+        created_context.close()
+
+
+@pytest.fixture(scope="session")
+def context_pool(pytestconfig, browser: Browser, browser_context_args, consent_state):
+    size = pytestconfig.getoption("--context-pool")
+    if size <= 0:
+        yield None
+        return
+    if pytestconfig.getoption("--har-mode") != "off":
+        # HAR jest zapisywany przy zamknięciu kontekstu, więc wymaga świeżego kontekstu na test.
+        logger.warning("--context-pool is ignored together with --har-mode.")
+        yield None
+        return
+
+    pool = ContextPool(
+        browser,
+        context_args=browser_context_args,
+        base_url=BasePage.URL,
+        size=size,
+        prepare=consent_state.apply if consent_state is not None else None,
+    )
+    pool.fill()
+    yield pool
+    pool.close()
+    _POOL_METRICS.append((pool.worker_id, pool.metrics))
+
+
+@pytest.fixture
+def pooled_context(context_pool, request) -> BrowserContext:
+    """Kontekst wypożyczony z puli; po teście wraca do niej po resecie (albo jest wyrzucany, gdy test padł)."""
+    if context_pool is None:
+        pytest.skip("Pula kontekstów jest wyłączona (--context-pool=0).")
+    context = context_pool.lease()
+    blocker = RequestBlocker.for_profile(_network_profile_name(request))
+    blocker.install(context)
+
+    yield context
+
+    _record_blocked(request, blocker)
+    # Kontekst wraca do puli - bez tego każde wypożyczenie dokładałoby kolejny listener "response".
+    try:
+        blocker.uninstall(context)
+    except Error:
+        pass
+    report = getattr(request.node, "rep_call", None)
+    context_pool.release(context, dirty=report is None or report.failed)
+
+
+@pytest.fixture
+def app_page(request) -> Page:
+    """Strona dla page objectów: z puli kontekstów, jeśli jest włączona, w przeciwnym razie zwykła `page`."""
+    # Konteksty z puli mają wspólne ustawienia, więc test z własnymi browser_context_args dostaje świeży.
+    if request.config.getoption("--context-pool") > 0 and request.config.getoption("--har-mode") == "off" \
+            and request.node.get_closest_marker("browser_context_args") is None:
+        return request.getfixturevalue("pooled_context").new_page()
+    return request.getfixturevalue("page")
+
+
+@pytest.fixture(scope="session")
+def security_scanner(pytestconfig) -> HttpSecurityScanner:
+    """Jedna sesja HTTP na cały przebieg - połączenia keep-alive są współdzielone między testami."""
+    _skip_live_http_in_replay(pytestconfig, "Skaner bezpieczeństwa")
+    scanner = HttpSecurityScanner()
+    yield scanner
+    scanner.close()
+
+
+@pytest.fixture
+def link_health_checker(pytestconfig) -> LinkHealthChecker:
+    _skip_live_http_in_replay(pytestconfig, "Sprawdzanie linków")
+    checker = LinkHealthChecker()
+    yield checker
+    checker.close()
+
+
+@pytest.fixture(scope="session")
+def visual_baselines(pytestconfig) -> VisualBaselines:
+    return VisualBaselines(
+        baseline_dir=pytestconfig.getoption("--visual-baseline-dir"),
+        update=pytestconfig.getoption("--update-visual-baselines"),
+    )
+
+
+@pytest.fixture(scope="session")
+def build_id(pytestconfig) -> Optional[str]:
+    return pytestconfig.getoption("--build-id") or default_build_id()
+
+
+@pytest.fixture(scope="session")
+def vitals_store(pytestconfig, build_id: Optional[str]) -> Optional[VitalsStore]:
+    """Baza trendów; None dla lokalnego uruchomienia bez builda - pomiary trafiają wtedy tylko do logu."""
+    if build_id is None:
+        logger.info("No build id (--build-id or CI variable) - Core Web Vitals samples will not be recorded.")
+        yield None
+        return
+    store = VitalsStore(pytestconfig.getoption("--vitals-db"))
+    yield store
+    store.close()
+
 
 @pytest.fixture(scope="function")
-def home_page_fixture(page: Page) -> HomePage:
-    home_page_instance = HomePage(page)
+def home_page_fixture(app_page: Page) -> HomePage:
+    home_page_instance = HomePage(app_page)
     home_page_instance.open_page_and_handle_initial_popups()
     yield home_page_instance
 
+@pytest.fixture(scope="session")
+def shared_home_page_guard(pytestconfig, request) -> ReadOnlyPageGuard[HomePage]:
+    """
+    Jedna strona główna na worker dla testów, które tylko ją czytają. Z --reuse-tab jest nią karta
+    długo żyjącej przeglądarki - przy pierwszym użyciu nie przeładowujemy jej, jeśli już jest na stronie głównej.
+    """
+    reuse_tab = pytestconfig.getoption("--reuse-tab")
+    if reuse_tab and pytestconfig.getoption("--har-mode") != "off":
+        # Karta długo żyjącej przeglądarki ma kontekst bez tras HAR.
+        logger.warning("--reuse-tab is ignored together with --har-mode.")
+        reuse_tab = False
+
+    def open_home(page: Page) -> HomePage:
+        home_page_instance = HomePage(page)
+        if reuse_tab:
+            # Karta z domyślnego kontekstu przeglądarki nie ma viewportu z browser_context_args.
+            home_page_instance.set_viewport(DEFAULT_VIEWPORT)
+        if not (reuse_tab and guard.reloads == 0 and page.url == HomePage.URL):
+            home_page_instance.open_page_and_handle_initial_popups()
+        return home_page_instance
+
+    if reuse_tab:
+        page = request.getfixturevalue("warm_tab")
+    else:
+        page = request.getfixturevalue("context_factory")(har_id="shared_home_page").new_page()
+    guard = ReadOnlyPageGuard(page, open_home)
+    return guard
+
+
+@pytest.fixture(scope="function")
+def read_only_home_page(shared_home_page_guard: ReadOnlyPageGuard[HomePage], request) -> HomePage:
+    """
+    Strona główna współdzielona między testami bez nawigacji i bez interakcji. Test, który
+    ją zmieni (nawigacja, klik, wpisywanie), oblewa, a kolejny dostaje stronę załadowaną od nowa.
+    """
+    home_page_instance = shared_home_page_guard.lease()
+    request.node._read_only_guard = shared_home_page_guard
+    yield home_page_instance
+    request.node._read_only_guard = None
+
 @pytest.fixture(scope="function")
-def product_page_fixture(page: Page) -> ProductPage:
-    product_page_instance = ProductPage(page)
+def product_page_fixture(app_page: Page) -> ProductPage:
+    product_page_instance = ProductPage(app_page)
     # Jeśli ProductPage też potrzebuje obsługi popupów, musisz dodać podobną metodę
     # product_page_instance.open_page_and_handle_initial_popups()
     yield product_page_instance
 
 @pytest.fixture(scope="function")
-def login_page_fixture(page: Page) -> LoginPage:
+def login_page_fixture(app_page: Page) -> LoginPage:
     """
     Prosta fixtura, która tylko inicjalizuje instancję LoginPage.
     Nie nawiguje na żadną stronę - to zadanie dla testu.
     """
-    yield LoginPage(page)
\ No newline at end of file
+    yield LoginPage(app_page)
\ No newline at end of file
@@ -0,0 +1,83 @@
+# tests/test_browser_server.py
+# Zarządzanie procesem długo żyjącej przeglądarki bez uruchamiania Chromium - w jego roli
+# występuje proces Pythona z tą samą linią poleceń.
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.browser_server import AttachReport, BrowserServer
+
+PORT = 9444
+
+needs_proc = pytest.mark.skipif(not Path("/proc/self/cmdline").exists(), reason="Wymaga /proc (Linux).")
+
+
+def _server(tmp_path) -> BrowserServer:
+    return BrowserServer(playwright=None, directory=tmp_path, port=PORT)
+
+
+def _spawn(*args: str) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)", *args])
+    # Tuż po fork() /proc/<pid>/cmdline pokazuje jeszcze linię poleceń rodzica.
+    cmdline = Path(f"/proc/{process.pid}/cmdline")
+    deadline = time.monotonic() + 5
+    while cmdline.exists() and b"time.sleep(60)" not in cmdline.read_bytes() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return process
+
+
+def _write_state(server: BrowserServer, pid: int):
+    server.state_path.write_text(json.dumps({"pid": pid, "port": PORT}), encoding="utf-8")
+
+
+def test_attach_report_describes_fresh_start_and_saving():
+    assert AttachReport(started=True, attach_ms=1500, cold_launch_ms=1500).describe() \
+        == "uruchomiono nową przeglądarkę (1500 ms)"
+    assert AttachReport(started=False, attach_ms=120, cold_launch_ms=1500).describe() \
+        == "podłączono do działającej przeglądarki w 120 ms (zimny start 1500 ms, oszczędność 1380 ms)"
+    # Bez zapisanego zimnego startu nie ma z czym porównać.
+    assert AttachReport(started=False, attach_ms=120, cold_launch_ms=None).describe().startswith("uruchomiono")
+
+
+@needs_proc
+def test_stop_terminates_own_browser_and_waits_for_exit(tmp_path):
+    server = _server(tmp_path)
+    process = _spawn(f"--remote-debugging-port={PORT}", f"--user-data-dir={server.profile_dir}")
+    _write_state(server, process.pid)
+
+    server.stop()
+
+    assert process.poll() is not None
+    assert not server.state_path.exists()
+
+
+@needs_proc
+def test_stop_leaves_unrelated_process_with_stale_pid(tmp_path):
+    server = _server(tmp_path)
+    process = _spawn(f"--remote-debugging-port={PORT + 1}")
+    _write_state(server, process.pid)
+    try:
+        server.stop()
+
+        assert process.poll() is None
+        assert not server.state_path.exists()
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_stop_with_dead_pid_only_clears_state(tmp_path):
+    server = _server(tmp_path)
+    process = _spawn()
+    process.kill()
+    process.wait()
+    _write_state(server, process.pid)
+
+    server.stop()
+
+    assert not server.state_path.exists()
+    assert server.state() == {}
@@ -6,7 +6,7 @@ from tests.conftest import home_page_fixture # Importujemy fixturę (niepotrzebn
 
 logger = logging.getLogger(__name__)
 
-def test_home_page_title(home_page_fixture):
+def test_home_page_title(read_only_home_page: HomePage):
     logger.info("Test: sprawdzenie tytułu strony głównej.")
-    expect(home_page_fixture.page).to_have_title("iDream | Apple sklep, autoryzowany sprzedawca Apple Premium Reseller Polska")
+    expect(read_only_home_page.page).to_have_title("iDream | Apple sklep, autoryzowany sprzedawca Apple Premium Reseller Polska")
     logger.info("✅ Tytuł strony głównej jest poprawny.")
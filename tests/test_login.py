@@ -1,8 +1,6 @@
-import pytest
+from playwright.sync_api import Page, expect
 from pages.login_page import LoginPage
-
-TEST_USER_EMAIL = "mszylejko2@eurotel.pl"
-TEST_USER_PASSWORD = "rickandmorty"
+from utils.accounts import TEST_USER_EMAIL, TEST_USER_PASSWORD
 
 def test_successful_login(login_page_fixture: LoginPage):
     """
@@ -17,4 +15,14 @@ def test_successful_login(login_page_fixture: LoginPage):
     login_page.login(TEST_USER_EMAIL, TEST_USER_PASSWORD)
 
     # Krok 3: Sprawdź, czy logowanie się powiodło
-    login_page.assert_login_is_successful()
\ No newline at end of file
+    login_page.assert_login_is_successful()
+
+
+def test_cached_session_is_logged_in(logged_in_page: Page):
+    """
+    Test weryfikuje, że sesja z fixtury logged_in_page (zalogowana raz na worker)
+    otwiera profil bez formularza logowania.
+    """
+    login_page = LoginPage(logged_in_page)
+    logged_in_page.goto(LoginPage.LOGIN_URL, wait_until="domcontentloaded")
+    expect(login_page.email_input).to_be_hidden(timeout=10000)
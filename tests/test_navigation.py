@@ -1,20 +1,29 @@
 # W pliku: tests/test_navigation.py
-import requests
 from pages.home_page import HomePage
+from utils.link_health import LinkHealthChecker, format_report
 import logging
 
 logger = logging.getLogger(__name__)
 
-def test_main_menu_link_health(home_page_fixture: HomePage):
+def test_main_menu_link_health(read_only_home_page: HomePage, link_health_checker: LinkHealthChecker):
     """
     Sprawdza wszystkie linki w menu głównym w ramach jednego, prostego testu.
     Zbiera wszystkie błędy i raportuje je na końcu.
     """
-    home_page = home_page_fixture
+    home_page = read_only_home_page
 
-    # Krok 1: Pobierz liczbę linków z menu za pomocą naszej nowej metody
-    menu_links = home_page.get_main_menu_links()
+    # Krok 1: Pobierz linki z menu prosto z DOM - bez klikania, strona jest współdzielona
+    menu_links = home_page.get_main_menu_links(open_menu=False)
 
     # Asercja: Czy liczba linków jest większa niż 0?
     assert len(menu_links) > 0, "Nie znaleziono żadnych linków w menu głównym."
-    logger.info(f"✅ Znaleziono {menu_links} linków po otwarciu menu.")
\ No newline at end of file
+    logger.info(f"✅ Znaleziono {len(menu_links)} linków w menu.")
+
+    # Krok 2: Sprawdź równolegle, czy każdy link odpowiada poprawnie
+    results = link_health_checker.check(link["href"] for link in menu_links)
+
+    report = format_report(results)
+    logger.info(f"Raport linków menu:\n{report}")
+
+    broken = [r for r in results if not r.ok]
+    assert not broken, f"❌ {len(broken)} z {len(results)} linków menu nie działa:\n{report}"
@@ -0,0 +1,96 @@
+# tests/test_payload_report.py
+# Werdykty i raport payloadów bez przeglądarki - logika oceny testów bezpieczeństwa
+# (które same są opcjonalne) sprawdzana przy każdym uruchomieniu.
+from types import SimpleNamespace
+
+import requests
+
+from pages.home_page import HomePage, SearchResult
+from utils.payload_executor import PayloadExecutor, PayloadReport, PayloadVerdict
+from utils.security_scanner import HttpSecurityScanner
+
+
+def _verdict(payload="<script>alert(1)</script>", **fields) -> PayloadVerdict:
+    return PayloadVerdict(**{"payload": payload, "status": 200, "elapsed_ms": 100.0, "waf_blocked": False, **fields})
+
+
+def test_dialog_is_always_vulnerable_even_behind_waf():
+    assert _verdict(dialogs=["XSS"], waf_blocked=True).vulnerable
+
+
+def test_findings_count_only_when_waf_did_not_block():
+    assert _verdict(findings=["payload odbity"]).vulnerable
+    assert not _verdict(findings=["payload odbity"], waf_blocked=True).vulnerable
+    assert not _verdict().vulnerable
+
+
+def test_report_splits_vulnerable_and_errors():
+    report = PayloadReport(verdicts=[
+        _verdict("ok"),
+        _verdict("xss", dialogs=["1"]),
+        _verdict("broken", status=None, error="timeout after 30000 ms"),
+    ], wall_ms=250.0)
+
+    assert [v.payload for v in report.vulnerable] == ["xss"]
+    assert [v.payload for v in report.errors] == ["broken"]
+    text = report.format()
+    assert text.startswith("3 payloadów w 250 ms")
+    assert "PODATNOŚĆ" in text and "BŁĄD (timeout after 30000 ms)" in text
+
+
+def test_verdict_from_search_result_detects_reflected_payload():
+    payload = "<svg onload=alert(1)>"
+    result = SearchResult(query=payload, url="https://idream.pl/", status=200, heading=None, elapsed_ms=80.0,
+                          waf_blocked=False, content=f"<html>Wyniki dla {payload}</html>")
+
+    verdict = PayloadExecutor._verdict(result, PayloadExecutor.reflected_payload)
+
+    assert verdict.reflected and verdict.vulnerable
+    assert verdict.findings == [f"payload odbity w treści: {payload}"]
+
+
+def test_verdict_without_content_has_no_findings():
+    result = SearchResult(query="x", url="https://idream.pl/", status=403, heading=None, elapsed_ms=10.0,
+                          waf_blocked=True, error=None)
+
+    verdict = PayloadExecutor._verdict(result, PayloadExecutor.reflected_payload)
+
+    assert not verdict.reflected and not verdict.vulnerable and verdict.findings == []
+
+
+class _FakeSession:
+    """Odpowiada treścią zależną od adresu; nieznany adres = błąd połączenia."""
+
+    def __init__(self, pages: dict[str, tuple[int, str]]):
+        self.pages = pages
+
+    def get(self, url, timeout):
+        if url not in self.pages:
+            raise requests.ConnectionError(f"connection refused: {url}")
+        status, text = self.pages[url]
+        return SimpleNamespace(status_code=status, content=text.encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+def test_http_scanner_matches_payload_and_waf_indicators_in_input_order():
+    waf = HomePage.WAF_INDICATORS[0]
+    session = _FakeSession({
+        "ok": (200, "<html>brak wyników</html>"),
+        "sql": (200, "You have an error in your SQL syntax near 'x'"),
+        "{{7*7}}": (200, "<p>Wyniki dla 49</p>"),
+        "blocked": (200, f"<h1>{waf}</h1> SQL syntax"),
+    })
+    scanner = HttpSecurityScanner(url_for=lambda payload: payload, max_workers=4, session=session)
+
+    report = scanner.scan(["ok", "sql", "{{7*7}}", "blocked", "down"], ["SQL syntax"],
+                          payload_indicators=lambda p: ["49"] if p == "{{7*7}}" else [])
+
+    assert [v.payload for v in report.verdicts] == ["ok", "sql", "{{7*7}}", "blocked", "down"]
+    ok, sql, template, blocked, down = report.verdicts
+    assert not ok.vulnerable and ok.reflected is False
+    assert sql.findings == ["SQL syntax"] and sql.vulnerable
+    assert template.findings == ["49"] and template.vulnerable
+    assert blocked.waf_blocked and not blocked.vulnerable
+    assert down.error and down.status is None
@@ -1,17 +1,20 @@
+import json
 import pytest
 import logging
 from playwright.sync_api import Page, expect
 from pages.product_page import ProductPage
+from utils.base_url import site_url
+from utils.pdp_sweep import PdpSweep
 
 logger = logging.getLogger(__name__)
 
 # Parametryzacja testu dla 3 różnych stron PDP (tu można dodawać kolejne URL-e).
 # Zgodnie z Twoją prośbą, można łatwo rozbudować tę listę.
-PRODUCT_URLS = [
+PRODUCT_URLS = [site_url(url) for url in (
     "https://idream.pl/iphone/apple-iphone-15/apple-iphone-15-128gb-niebieski.html",
     "https://idrim.ovh/iphone/apple-iphone-15/apple-iphone-15-128gb-niebieski.html",
     "https://idream.pl/ipad/ipad-air/apple-ipad-air-13-m2-128gb-wi-fi-cellular-6.gen-gwiezdna-szarosc-2024.html"
-]
+)]
 
 @pytest.mark.parametrize("product_url", PRODUCT_URLS)
 def test_pdp_bundle_offer_presence(page: Page, product_url: str):
@@ -28,13 +31,11 @@ def test_pdp_bundle_offer_presence(page: Page, product_url: str):
     # 1. Przejdź na stronę i obsłuż popupy (cookies, BHR itp.)
     product_page.open_specific_product_and_handle_popups(product_url)
 
-    # Upewniamy się, że strona została w całości załadowana
-    # (sekcja bundle często ładuje się chwilę po wczytaniu DOM-u docelowego - np. jako AJAX)
-    page.wait_for_load_state("networkidle", timeout=30000)
-
     # Lekkie przewinięcie, żeby aktywować lazy-loading dla sekcji niżej na stronie.
+    # Sekcja bundle często ładuje się chwilę po wczytaniu DOM-u (AJAX) - czekamy,
+    # aż DOM przestanie się zmieniać, zamiast na 'networkidle' i stałą pauzę.
     page.evaluate("window.scrollTo(0, 1000)")
-    page.wait_for_timeout(1000)
+    product_page.wait_for_dom_quiet(replaces="networkidle + 1 s sleep", budget_ms=31000)
 
     # 2. Definicja lokatorów
     # UWAGA: Klasa CSS to "ab__bt_box" (dwa podkreślenia), potwierdzone inspekcją DOM.
@@ -64,3 +65,20 @@ def test_pdp_bundle_offer_presence(page: Page, product_url: str):
     expect(bundle_add_btn_locator).to_contain_text("Dodaj zestaw do koszyka")
 
     logger.info(f"✅ Przycisk 'Dodaj zestaw do koszyka' widoczny i aktywny dla {product_url}")
+
+
+def test_pdp_sweep_streams_records(context_factory, tmp_path):
+    """
+    TC_PDP_SWEEP_001: Przegląd tych samych PDP przez PdpSweep (2 konteksty x 2 strony).
+    Każdy produkt musi dać jeden rekord JSONL z nazwą i ceną; zestaw jest tylko raportowany.
+    """
+    output = tmp_path / "pdp.jsonl"
+    sweep = PdpSweep([context_factory(), context_factory()], output=str(output),
+                     checkpoint=str(tmp_path / "pdp.checkpoint.json"), pages_per_context=2)
+    summary = sweep.run(PRODUCT_URLS)
+    logger.info(f"PDP sweep: {summary.describe()}")
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(record["index"] for record in records) == list(range(len(PRODUCT_URLS)))
+    failures = [f"{record['url']}: {record['failure']}" for record in records if record["failure"]]
+    assert not failures, "❌ Błędy przeglądu PDP: " + "; ".join(failures)
@@ -0,0 +1,36 @@
+# tests/test_performance_budgets.py
+import logging
+import pytest
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
+from pages.product_page import ProductPage
+
+logger = logging.getLogger(__name__)
+
+# Zestaw opcjonalny: pytest -m performance albo --run-performance.
+# Budżety mierzymy na pełnym ruchu - przy blokowaniu obrazów i skryptów zewnętrznych
+# bajty i udział third-party byłyby zaniżone.
+pytestmark = [pytest.mark.performance, pytest.mark.network_profile("full-fidelity")]
+
+
+def test_home_page_performance_budget(home_page_fixture: HomePage):
+    check = home_page_fixture.check_performance_budget(wait_for_load=True)
+    assert check.ok, f"❌ Strona główna przekracza budżet: {check.describe()}"
+
+
+def test_search_results_performance_budget(home_page_fixture: HomePage):
+    home_page_fixture.perform_search("iPhone", via_url=True)
+    check = home_page_fixture.check_performance_budget(HomePage.SEARCH_RESULTS_BUDGET, wait_for_load=True)
+    assert check.ok, f"❌ Wyniki wyszukiwania przekraczają budżet: {check.describe()}"
+
+
+def test_product_page_performance_budget(product_page_fixture: ProductPage):
+    product_page_fixture.open_specific_product_and_handle_popups(ProductPage.URL)
+    check = product_page_fixture.check_performance_budget(wait_for_load=True)
+    assert check.ok, f"❌ Strona produktu przekracza budżet: {check.describe()}"
+
+
+def test_login_page_performance_budget(login_page_fixture: LoginPage):
+    login_page_fixture.navigate_to_login_page()
+    check = login_page_fixture.check_performance_budget(wait_for_load=True)
+    assert check.ok, f"❌ Strona logowania przekracza budżet: {check.describe()}"
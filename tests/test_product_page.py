@@ -29,7 +29,7 @@ def test_verify_product_details_via_search(page):
 
     # 1. Lokator celujący w kontener produktu, który zawiera link
     # Szukamy linku, który jest tytułem produktu (zazwyczaj klasa .product-title lub wewnątrz .ut2-gl__name)
-    first_product_link = page.locator("a.product-title, .ut2-gl__name a, .ut2-gl__body a").first
+    first_product_link = page.locator(HomePage.SEARCH_RESULT_LINKS).first
 
     try:
         # Zwiększamy nieco timeout i czekamy na stan 'attached', aby upewnić się, że DOM jest gotowy
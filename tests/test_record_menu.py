@@ -1,6 +1,9 @@
 # W nowym, tymczasowym pliku: tests/test_record_menu.py
+import pytest
 from pages.home_page import HomePage
 
+# Do nagrywania potrzebujemy strony dokładnie takiej, jaką widzi klient (widgety, obrazki, nakładki).
+@pytest.mark.network_profile("full-fidelity")
 def test_placeholder_for_recording(home_page_fixture: HomePage):
     """
     Ten test służy tylko jako punkt startowy dla Inspektora Playwright.
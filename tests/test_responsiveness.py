@@ -1,47 +1,49 @@
 # tests/test_responsiveness.py
 import pytest
 import logging
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Playwright
 
-# Importujemy fixturę home_page_fixture
-from tests.conftest import home_page_fixture
 from pages.home_page import HomePage
+from utils.responsiveness import DEFAULT_BREAKPOINTS, ResponsivenessSweep
 
 logger = logging.getLogger(__name__)
 
-# Używamy parametryzacji, aby uruchomić ten sam test dla różnych widoków
-@pytest.mark.parametrize("viewport_size, device_name", [
-    ({"width": 1920, "height": 1080}, "desktopie"),
-    ({"width": 768, "height": 1024}, "tablecie"),
-    ({"width": 375, "height": 812}, "mobile"),
-])
-def test_page_responsiveness(page: Page, viewport_size: dict, device_name: str):
+# Urządzenia sprawdzane w osobnych kontekstach (prawdziwy user agent i dotyk, a nie tylko rozmiar okna).
+EMULATED_DEVICES = ("iPhone 13", "iPad Mini")
+
+
+@pytest.fixture(scope="module")
+def responsiveness_sweep() -> ResponsivenessSweep:
+    # Logo jest sprawdzane zawsze; pole wyszukiwania tylko na desktopie (na mobile chowa się za ikoną).
+    return ResponsivenessSweep(DEFAULT_BREAKPOINTS).register("search input", HomePage.SEARCH_INPUT, only=("desktop",))
+
+
+@pytest.fixture(scope="module")
+def breakpoint_results(context_factory, responsiveness_sweep) -> dict:
+    """Jedna nawigacja dla wszystkich breakpointów - kolejne rozmiary to tylko zmiana okna."""
+    # Logo jest obrazkiem, więc ten test potrzebuje pełnego ruchu sieciowego.
+    page = context_factory("full-fidelity", har_id="breakpoint_results").new_page()
+    results = responsiveness_sweep.run(HomePage(page))
+    return {result.breakpoint: result for result in results}
+
+
+@pytest.mark.parametrize("breakpoint", DEFAULT_BREAKPOINTS, ids=lambda breakpoint: breakpoint.name)
+def test_page_responsiveness(breakpoint_results: dict, breakpoint):
     """
     Testuje responsywność strony głównej poprzez weryfikację widoczności logo
-    na różnych rozmiarach ekranu.
-    :type viewport_size: object
+    (i elementów zarejestrowanych dla danego breakpointu) na różnych rozmiarach ekranu.
     """
-    logger.info(f"Test responsywności na {device_name} (rozmiar: {viewport_size['width']}x{viewport_size['height']}).")
-
-    # Ustawienie rozmiaru okna przeglądarki na początku testu
-    page.set_viewport_size(viewport_size)
-
-    # Nawigacja do strony i obsługa popupów
-    # Tworzymy instancję HomePage, aby nie polegać na fixture, która otwiera już stronę
-    # z domyślnym rozmiarem okna.
-    home_page = HomePage(page)
-    home_page.open_page_and_handle_initial_popups()
-
-    # Lokator logo z Page Objecta (z BasePage, bo logo jest na każdej stronie)
-    logo_locator = home_page.page.locator(".top-logo img[alt='Logo iDream']").first
-
-    # Asercja z Playwrighta. Oczekuje, że logo będzie widoczne w ciągu 10s.
-    try:
-        expect(logo_locator).to_be_visible(timeout=10000)
-        logger.info(f"✅ Logo jest widoczne na {device_name}. Strona wyświetla się poprawnie.")
-    except TimeoutError:
-        error_message = f"❌ BŁĄD: Logo nie zostało znalezione na {device_name}. Strona nie wyświetla się poprawnie."
-        logger.error(error_message)
-        # Zrzut ekranu jest bardzo pomocny przy debugowaniu responsywności
-        page.screenshot(path=f"screenshot_error_{device_name}.png")
-        pytest.fail(error_message)
\ No newline at end of file
+    result = breakpoint_results[breakpoint.name]
+    logger.info(f"Test responsywności {breakpoint.name} ({breakpoint.width}x{breakpoint.height}): {result.describe()}")
+    assert result.ok, f"❌ BŁĄD: strona nie wyświetla się poprawnie - {result.describe()}"
+
+
+def test_page_responsiveness_on_emulated_devices(playwright: Playwright, context_factory,
+                                                 responsiveness_sweep: ResponsivenessSweep):
+    """Ta sama kontrola na emulowanych urządzeniach - konteksty ładują się równolegle."""
+    devices = {name: playwright.devices[name] for name in EMULATED_DEVICES}
+    results = responsiveness_sweep.run_on_devices(
+        lambda **device: context_factory("full-fidelity", **device), devices, page_object_cls=HomePage,
+    )
+    failures = [result.describe() for result in results if not result.ok]
+    assert not failures, "❌ BŁĄD: strona nie wyświetla się poprawnie na: " + "; ".join(failures)
@@ -0,0 +1,41 @@
+# tests/test_sleep_detector.py
+# Detektor stałych pauz bez przeglądarki.
+from playwright.sync_api import TimeoutError
+
+from utils.sleep_detector import SleepDetector, poll_pause
+
+
+class _Page:
+    """Strona, na której żadne zdarzenie nie nadchodzi - wait_for_event kończy się timeoutem."""
+
+    def __init__(self):
+        self.waits = []
+
+    def wait_for_event(self, event, predicate=None, timeout=None):
+        self.waits.append((event, timeout))
+        raise TimeoutError(f"Timeout {timeout}ms exceeded while waiting for event \"{event}\"")
+
+
+def test_poll_pause_waits_without_recording_a_hard_sleep():
+    detector = SleepDetector()
+    detector.current = []
+    page = _Page()
+
+    poll_pause(page, 50)
+    poll_pause(page, 0)
+
+    assert page.waits == [("console", 50)]
+    assert detector.current == [] and not detector.per_site
+
+
+def test_merge_adds_worker_sleeps_to_controller_summary():
+    controller, worker = SleepDetector(), SleepDetector()
+    for detector in (controller, worker):
+        detector.current = []
+        detector.record("tests/test_a.py:10 (test_a)", 500)
+        detector.per_test[f"tests/test_a.py::test_{id(detector)}"] = 500
+
+    controller.merge(worker.export())
+
+    assert controller.per_site["tests/test_a.py:10 (test_a)"] == {"calls": 2, "total_ms": 1000.0}
+    assert len(controller.per_test) == 2
@@ -0,0 +1,26 @@
+# tests/test_step_timing.py
+# Ranking kroków i nazwy artefaktów bez przeglądarki.
+from utils.artifacts import artifact_name
+from utils.step_timing import StepRecorder, StepTimingPlugin
+
+
+def test_merge_adds_worker_totals_to_controller_ranking(tmp_path):
+    controller, worker = StepTimingPlugin(tmp_path), StepTimingPlugin(tmp_path)
+    for plugin in (controller, worker):
+        recorder = StepRecorder(f"tests/test_a.py::test_{id(plugin)}")
+        with recorder.step("HomePage.open_page", "page-object"):
+            pass
+        plugin._store(recorder)
+
+    controller.merge(worker.export())
+
+    assert controller.totals["HomePage.open_page"]["calls"] == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_artifact_names_stay_distinct_after_truncation():
+    prefix = "tests/test_a.py::test_a[" + "x" * 200
+    first, second = artifact_name(prefix + "1]"), artifact_name(prefix + "2]")
+
+    assert first != second
+    assert first.rsplit("-", 1)[0] == second.rsplit("-", 1)[0]
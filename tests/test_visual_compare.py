@@ -0,0 +1,58 @@
+# tests/test_visual_compare.py
+# Porównanie zrzutów na syntetycznych obrazach - bez przeglądarki.
+import numpy as np
+from PIL import Image
+
+from utils.visual_regression import CompareJob, compare
+
+
+def _save(tmp_path, name: str, pixels: np.ndarray) -> str:
+    path = tmp_path / f"{name}.png"
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+
+def _page(height: int = 300, width: int = 400) -> np.ndarray:
+    gradient = np.linspace(40, 220, width, dtype=np.uint8)
+    return np.repeat(np.repeat(gradient[None, :, None], height, axis=0), 3, axis=2).copy()
+
+
+def _job(tmp_path, baseline: np.ndarray, current: np.ndarray, masks=()) -> CompareJob:
+    return CompareJob(key="home/desktop", baseline=_save(tmp_path, "baseline", baseline),
+                      current=_save(tmp_path, "current", current), masks=list(masks),
+                      diff_path=str(tmp_path / "diff.png"))
+
+
+def test_identical_files_pass_by_digest(tmp_path):
+    result = compare(_job(tmp_path, _page(), _page()))
+
+    assert result.passed and result.skipped_by == "digest"
+
+
+def test_small_change_with_matching_hash_still_runs_full_diff(tmp_path):
+    current = _page()
+    current[140:150, 200:210] = (255, 0, 0)
+    job = _job(tmp_path, _page(), current)
+    job.max_diff_ratio = 0.0005
+
+    result = compare(job)
+
+    assert result.hash_distance == 0 and result.skipped_by is None
+    assert not result.passed and result.changed_pixels == 100
+    assert result.diff_path and (tmp_path / "diff.png").exists()
+
+
+def test_large_change_fails_fast_on_hash(tmp_path):
+    result = compare(_job(tmp_path, _page(), _page()[:, ::-1].copy()))
+
+    assert not result.passed and result.skipped_by == "phash"
+    assert result.hash_distance > 32 and "pełny diff pominięty" in result.describe()
+
+
+def test_change_inside_mask_passes_after_full_diff(tmp_path):
+    current = _page()
+    current[10:60, 10:110] = 0
+
+    result = compare(_job(tmp_path, _page(), current, masks=[[10, 10, 100, 50]]))
+
+    assert result.passed and result.skipped_by is None and result.changed_pixels == 0
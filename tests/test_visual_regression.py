@@ -0,0 +1,67 @@
+# tests/test_visual_regression.py
+# Pierwsze uruchomienie (albo z --update-visual-baselines) zapisuje baseline'y w tests/visual_baselines.
+import pytest
+import logging
+from playwright.sync_api import Page
+
+from pages.base_page import BasePage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from utils.responsiveness import DEFAULT_BREAKPOINTS
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.visual
+
+
+def _open_home(page: Page) -> BasePage:
+    home_page = HomePage(page)
+    home_page.open_page_and_handle_initial_popups()
+    return home_page
+
+
+def _open_pdp(page: Page) -> BasePage:
+    product_page = ProductPage(page)
+    product_page.open_specific_product_and_handle_popups(ProductPage.URL)
+    return product_page
+
+
+def _open_search_results(page: Page) -> BasePage:
+    home_page = _open_home(page)
+    home_page.perform_search("iPad", via_url=True)
+    return home_page
+
+
+VISUAL_TARGETS = {
+    "home": _open_home,
+    "pdp": _open_pdp,
+    "search-results": _open_search_results,
+}
+
+
+@pytest.fixture(scope="module")
+def visual_results(context_factory, visual_baselines) -> dict:
+    """
+    Każda strona jest otwierana raz i fotografowana na wszystkich breakpointach;
+    porównanie wszystkich zrzutów odbywa się na końcu, równolegle w puli procesów.
+    """
+    # Zrzuty muszą zawierać obrazki i fonty, więc potrzebny jest pełny ruch sieciowy.
+    page = context_factory("full-fidelity", har_id="visual_results").new_page()
+    snapshots = []
+    for name, open_target in VISUAL_TARGETS.items():
+        page_object = open_target(page)
+        page.wait_for_load_state("load")
+        for breakpoint in DEFAULT_BREAKPOINTS:
+            page_object.set_viewport(breakpoint.viewport)
+            page_object.wait_for_layout_stable()
+            snapshots.append(visual_baselines.capture(page, name, breakpoint.name))
+    return visual_baselines.compare(snapshots)
+
+
+@pytest.mark.parametrize("breakpoint", DEFAULT_BREAKPOINTS, ids=lambda breakpoint: breakpoint.name)
+@pytest.mark.parametrize("target", VISUAL_TARGETS)
+def test_visual_regression(visual_results: dict, target: str, breakpoint):
+    """TC_VISUAL_001: Zrzut strony na danym breakpoincie nie odbiega od baseline (poza regionami dynamicznymi)."""
+    result = visual_results[f"{target}/{breakpoint.name}"]
+    logger.info(f"Regresja wizualna {result.describe()}")
+    assert result.passed, f"❌ Regresja wizualna {result.describe()}"
@@ -0,0 +1,71 @@
+# tests/test_web_vitals.py
+import logging
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Page
+
+from pages.base_page import BasePage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from utils.responsiveness import DEFAULT_BREAKPOINTS
+from utils.web_vitals import VitalsSample, VitalsStore
+
+logger = logging.getLogger(__name__)
+
+# Zestaw opcjonalny: pytest -m vitals albo --build-id <id>.
+pytestmark = pytest.mark.vitals
+
+
+def _open_home(page: Page) -> BasePage:
+    home_page = HomePage(page)
+    home_page.open_page_and_handle_initial_popups()
+    return home_page
+
+
+def _open_search_results(page: Page) -> BasePage:
+    home_page = HomePage(page)
+    home_page.perform_search("iPhone", via_url=True)
+    return home_page
+
+
+def _open_product(page: Page) -> BasePage:
+    product_page = ProductPage(page)
+    product_page.open_specific_product_and_handle_popups(ProductPage.URL)
+    return product_page
+
+
+VITALS_PAGES = {
+    "home": _open_home,
+    "search": _open_search_results,
+    "pdp": _open_product,
+}
+
+
+@pytest.mark.parametrize("breakpoint", DEFAULT_BREAKPOINTS, ids=lambda breakpoint: breakpoint.name)
+@pytest.mark.parametrize("page_name", VITALS_PAGES)
+def test_core_web_vitals(context_factory, vitals_store: Optional[VitalsStore], build_id: Optional[str],
+                         pytestconfig, page_name: str, breakpoint):
+    """
+    Mierzy LCP, CLS i TTFB strony na danym breakpoincie i dopisuje próbki do bazy
+    trendów (tylko z identyfikatorem builda). Regresje względem poprzednich buildów pokazuje
+    raport: python -m utils.web_vitals.
+    """
+    measurements = []
+    for _ in range(pytestconfig.getoption("--vitals-samples")):
+        # Każdy pomiar w świeżym kontekście (zimna pamięć podręczna) i na pełnym ruchu - LCP to zwykle obrazek.
+        context = context_factory("full-fidelity", viewport=breakpoint.viewport)
+        try:
+            vitals = VITALS_PAGES[page_name](context.new_page()).collect_web_vitals()
+        finally:
+            context.close()
+        logger.info(f"{page_name} @ {breakpoint.name}: {vitals.describe()}")
+        if vitals_store is not None:
+            vitals_store.append(VitalsSample.from_vitals(build_id, page_name, breakpoint.name, breakpoint.viewport,
+                                                         vitals))
+        measurements.append(vitals)
+
+    assert any(vitals.lcp_ms is not None for vitals in measurements), (
+        f"❌ Brak pomiaru LCP dla {page_name} @ {breakpoint.name} - przeglądarka nie wspiera "
+        f"largest-contentful-paint albo strona nic nie narysowała."
+    )
@@ -0,0 +1,75 @@
+# tests/test_web_vitals_trends.py
+# Statystyka raportu trendów Core Web Vitals na tymczasowej bazie SQLite - bez przeglądarki.
+import pytest
+
+from utils.web_vitals import VitalsSample, VitalsStore, mann_whitney_greater, percentile, trend_report
+
+URL = "https://idream.pl/"
+
+
+def test_percentile_interpolates_inclusively_and_handles_single_value():
+    assert percentile(list(range(1, 11)), 50) == 5.5
+    assert percentile(list(range(1, 101)), 95) == pytest.approx(95.05)
+    assert percentile([7.0], 95) == 7.0
+
+
+def test_mann_whitney_greater_matches_normal_approximation():
+    # U = 9, E[U] = 4.5, Var = 5.25 -> z = (9 - 4.5 - 0.5) / sqrt(5.25)
+    assert mann_whitney_greater([4, 5, 6], [1, 2, 3]) == pytest.approx(0.040428, abs=1e-6)
+    assert mann_whitney_greater([1, 2, 3], [4, 5, 6]) == pytest.approx(0.985452, abs=1e-6)
+
+
+def test_mann_whitney_greater_without_evidence_returns_one():
+    assert mann_whitney_greater([2, 2, 2], [2, 2, 2]) == 1.0  # same remisy - zerowa wariancja
+    assert mann_whitney_greater([], [1.0]) == 1.0
+    assert mann_whitney_greater([1.0], []) == 1.0
+
+
+@pytest.fixture
+def store(tmp_path):
+    vitals_store = VitalsStore(tmp_path / "vitals.sqlite")
+    yield vitals_store
+    vitals_store.close()
+
+
+def _record(store: VitalsStore, build_id: str, lcp_values, cls: float = 0.05, ttfb_ms: float = 300.0):
+    for lcp_ms in lcp_values:
+        store.append(VitalsSample(build_id=build_id, page="home", url=URL, viewport="desktop", width=1920,
+                                  height=1080, lcp_ms=lcp_ms, cls=cls, ttfb_ms=ttfb_ms))
+
+
+def test_trend_report_flags_significant_lcp_regression_only(store):
+    for build_id, base in (("b1", 1000), ("b2", 1020), ("b3", 990)):
+        _record(store, build_id, [base, base + 30, base + 60, base + 15])
+    _record(store, "b4", [1900, 1950, 2000, 2100])
+
+    rows = {row.metric: row for row in trend_report(store)}
+
+    lcp = rows["lcp_ms"]
+    assert lcp.samples == 4 and lcp.median == 1975.0
+    assert lcp.baseline_median == 1025.0
+    assert lcp.p_value < 0.05 and lcp.regression
+    assert "REGRESJA" in lcp.describe()
+    assert not rows["cls"].regression and not rows["ttfb_ms"].regression
+
+
+def test_trend_report_ignores_significant_but_small_change(store):
+    for build_id in ("b1", "b2", "b3"):
+        _record(store, build_id, [1000, 1005, 1010, 1015])
+    _record(store, "b4", [1060, 1065, 1070, 1075])  # +60 ms < MIN_ABSOLUTE_CHANGE (100 ms)
+
+    lcp = next(row for row in trend_report(store, metrics=("lcp_ms",)))
+
+    assert lcp.p_value < 0.05 and not lcp.regression
+
+
+def test_trend_report_for_earlier_build_uses_only_its_history(store):
+    _record(store, "b1", [1000, 1010])
+    _record(store, "b2", [3000, 3010])
+
+    first = next(trend_report(store, build="b1", metrics=("lcp_ms",)))
+
+    assert first.baseline_median is None and first.p_value is None and not first.regression
+    assert "brak bazy" in first.describe()
+    with pytest.raises(ValueError):
+        list(trend_report(store, build="missing"))
@@ -0,0 +1,5 @@
+import os
+
+# Konto testowe klienta; w CI nadpisywane zmiennymi środowiskowymi.
+TEST_USER_EMAIL = os.environ.get("IDREAM_TEST_EMAIL", "mszylejko2@eurotel.pl")
+TEST_USER_PASSWORD = os.environ.get("IDREAM_TEST_PASSWORD", "rickandmorty")
@@ -0,0 +1,12 @@
+import hashlib
+
+from slugify import slugify
+
+
+def artifact_name(test_id: str, max_length: int = 160) -> str:
+    """
+    Nazwa pliku artefaktu testu: czytelny slug node id i skrót pełnego id.
+    Długie, sparametryzowane node id po przycięciu mogą być identyczne - skrót je rozróżnia.
+    """
+    digest = hashlib.sha1(test_id.encode("utf-8")).hexdigest()[:10]
+    return f"{slugify(test_id, max_length=max_length)}-{digest}"
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from playwright.sync_api import Browser, Error, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = Path(__file__).resolve().parent.parent / ".auth"
+DEFAULT_TTL_SECONDS = 2 * 60 * 60
+
+
+class AuthState:
+    """
+    Zalogowana sesja klienta zapisana jako Playwright storage_state - jedna na worker
+    i zestaw danych logowania. Przed ponownym użyciem sprawdzana jednym żądaniem HTTP
+    (strona profilu nie może pokazywać formularza logowania); logujemy się od nowa
+    tylko wtedy, gdy sesja wygasła albo serwer jej już nie uznaje.
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, base_url: str, email: str, password: str, profile_url: str, login_form_marker: str,
+                 directory: Path = DEFAULT_DIRECTORY, worker_id: Optional[str] = None,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.profile_url = profile_url
+        self.login_form_marker = login_form_marker
+        self.worker_id = worker_id or os.environ.get("PYTEST_XDIST_WORKER", "master")
+        self.ttl_seconds = ttl_seconds
+        # Hasło trafia tylko do skrótu - w nazwie pliku nie ma danych logowania.
+        key = hashlib.sha256(f"{base_url}|{email}|{password}".encode("utf-8")).hexdigest()[:16]
+        self.storage_path = Path(directory) / f"auth-{self.worker_id}-{key}.json"
+        self.meta_path = Path(directory) / f"auth-{self.worker_id}-{key}.meta.json"
+
+    def staleness_reason(self) -> Optional[str]:
+        """Powód, dla którego trzeba się zalogować od nowa (bez zapytania do serwera), albo None."""
+        if not self.storage_path.exists() or not self.meta_path.exists():
+            return "session missing"
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            state = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            return f"session unreadable ({e})"
+        if meta.get("schema") != self.SCHEMA_VERSION:
+            return "schema version changed"
+        if time.time() - meta.get("created_at", 0) > self.ttl_seconds:
+            return "session older than TTL"
+        now = time.time()
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            if cookie.get("name") in meta.get("session_cookies", []) and 0 < expires < now:
+                return f"cookie '{cookie['name']}' expired"
+        return None
+
+    def is_accepted(self, playwright: Playwright) -> bool:
+        """Jedno lekkie żądanie z zapisanymi cookies: zalogowany klient nie dostaje formularza logowania."""
+        request_context = playwright.request.new_context(base_url=self.base_url,
+                                                         storage_state=str(self.storage_path))
+        try:
+            response = request_context.get(self.profile_url, timeout=15000)
+            return response.ok and self.login_form_marker not in response.text()
+        except Error as e:
+            logger.warning(f"Auth session check failed: {e}")
+            return False
+        finally:
+            request_context.dispose()
+
+    def login(self, browser: Browser, perform_login: Callable[[Page, str, str], None], context_args: dict):
+        """Loguje się w nowym kontekście przez `perform_login(page, email, password)` i zapisuje stan."""
+        logger.info(f"Logging in as {self.email} for worker '{self.worker_id}'...")
+        started = time.perf_counter()
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        # Cookies sprzed logowania (np. zgoda) też trafią do stanu - zapamiętujemy, które doszły przy logowaniu.
+        context = browser.new_context(**context_args)
+        try:
+            before = {cookie["name"] for cookie in context.cookies()}
+            page = context.new_page()
+            perform_login(page, self.email, self.password)
+            state = context.storage_state(path=str(self.storage_path))
+        finally:
+            context.close()
+
+        meta = {
+            "schema": self.SCHEMA_VERSION,
+            "base_url": self.base_url,
+            "email": self.email,
+            "created_at": time.time(),
+            "session_cookies": [cookie["name"] for cookie in state.get("cookies", [])
+                                if cookie["name"] not in before],
+        }
+        self.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        logger.info(f"✅ Auth session saved to {self.storage_path} in {time.perf_counter() - started:.1f}s.")
+
+    def ensure(self, playwright: Playwright, browser: Browser, perform_login: Callable[[Page, str, str], None],
+               context_args: dict, force: bool = False) -> bool:
+        """Loguje się, jeśli zapisana sesja jest nieaktualna albo odrzucona. Zwraca True po nowym logowaniu."""
+        reason = "rebuild requested" if force else self.staleness_reason()
+        if reason is None and not self.is_accepted(playwright):
+            reason = "session rejected by server"
+        if reason is None:
+            logger.info(f"Reusing auth session {self.storage_path}.")
+            return False
+        logger.info(f"Auth session needs login: {reason}.")
+        self.login(browser, perform_login, context_args)
+        return True
+
+    def invalidate(self, reason: str):
+        """Usuwa zapisaną sesję (np. gdy test ją wylogował) - następny `ensure` zaloguje się od nowa."""
+        logger.warning(f"Auth session invalidated: {reason}")
+        for path in (self.storage_path, self.meta_path):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,56 @@
+import logging
+from typing import Optional
+from urllib.parse import urlparse, urlunparse
+
+from utils.network_profiles import FIRST_PARTY_HOSTS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://idream.pl/"
+ENV_VAR = "IDREAM_BASE_URL"
+
+# Adres, na który przekierowano testy (np. lokalna replika), albo None - testujemy produkcję.
+_override: Optional[str] = None
+
+
+def _is_first_party(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == fp or host.endswith("." + fp) for fp in FIRST_PARTY_HOSTS)
+
+
+def rebase_url(url: str, base_url: str) -> str:
+    """Przenosi adres sklepu (idream.pl, idrim.ovh) pod `base_url`, zachowując ścieżkę i query."""
+    if not _is_first_party(url):
+        return url
+    base = urlparse(base_url)
+    source = urlparse(url)
+    path = base.path.rstrip("/") + source.path
+    return urlunparse((base.scheme, base.netloc, path, source.params, source.query, source.fragment))
+
+
+def site_url(url: str) -> str:
+    """
+    Adres sklepu z uwzględnieniem przekierowania: bez `--base-url` zwraca `url` bez zmian.
+    Stałe URL-i w testach budujemy przez tę funkcję, żeby trafiały tam, gdzie page objecty.
+    """
+    return rebase_url(url, _override) if _override else url
+
+
+def apply_base_url(base_url: str, root: type) -> list[str]:
+    """
+    Przepina atrybuty klas `*URL` (URL, LOGIN_URL, ...) klasy `root` i wszystkich jej podklas
+    na `base_url`. Zwraca listę zmienionych atrybutów (do logu).
+    """
+    global _override
+    _override = base_url if base_url.endswith("/") else base_url + "/"
+    changed = []
+    pending = [root]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        for name, value in list(vars(cls).items()):
+            if name.endswith("URL") and isinstance(value, str) and _is_first_party(value):
+                setattr(cls, name, rebase_url(value, _override))
+                changed.append(f"{cls.__name__}.{name}")
+    logger.info(f"Base URL -> {_override} ({', '.join(changed)})")
+    return changed
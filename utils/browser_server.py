@@ -0,0 +1,226 @@
+"""
+Długo żyjący Chromium dla szybkiej pętli lokalnej: pierwsze `pytest --reuse-browser` uruchamia
+przeglądarkę z portem CDP, kolejne tylko się do niej podłączają (connect_over_cdp).
+
+    python -m utils.browser_server status|start|stop
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from playwright.sync_api import Browser, Error, Playwright
+
+try:
+    import fcntl
+except ImportError:  # Windows - bez blokady, równoległe workery mogą wystartować przeglądarkę dwa razy
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = Path(__file__).resolve().parent.parent / ".browser-server"
+DEFAULT_PORT = 9333
+START_TIMEOUT_S = 20
+STOP_TIMEOUT_S = 5
+
+
+@dataclass
+class AttachReport:
+    started: bool
+    attach_ms: float
+    cold_launch_ms: Optional[float]
+
+    def describe(self) -> str:
+        if self.started or not self.cold_launch_ms:
+            return f"uruchomiono nową przeglądarkę ({self.attach_ms:.0f} ms)"
+        saved = self.cold_launch_ms - self.attach_ms
+        return (f"podłączono do działającej przeglądarki w {self.attach_ms:.0f} ms "
+                f"(zimny start {self.cold_launch_ms:.0f} ms, oszczędność {saved:.0f} ms)")
+
+
+class BrowserServer:
+    """
+    Chromium z `--remote-debugging-port` uruchomiony jako osobny proces (przeżywa pytest).
+    Stan (pid, port, czas zimnego startu) jest w pliku JSON; zdrowie sprawdzamy przez /json/version,
+    a martwy albo niedostępny proces jest ubijany i uruchamiany od nowa. Pid z pliku mógł już
+    dostać inny proces (restart systemu), więc ubijamy go tylko po sprawdzeniu, że to nasz Chromium.
+    """
+
+    def __init__(self, playwright: Playwright, directory: Path = DEFAULT_DIRECTORY, port: int = DEFAULT_PORT,
+                 headless: bool = True):
+        self.playwright = playwright
+        self.directory = Path(directory)
+        self.port = port
+        self.headless = headless
+        self.state_path = self.directory / "state.json"
+        self.profile_dir = self.directory / "profile"
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def healthy(self) -> bool:
+        try:
+            with urllib.request.urlopen(f"{self.endpoint}/json/version", timeout=1) as response:
+                return "webSocketDebuggerUrl" in json.loads(response.read())
+        except (OSError, ValueError):
+            return False
+
+    def start(self):
+        self.stop()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        args = [
+            self.playwright.chromium.executable_path,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        started = time.perf_counter()
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+        deadline = time.monotonic() + START_TIMEOUT_S
+        while not self.healthy():
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Chromium nie wystartował na porcie {self.port} (kod {process.poll()}).")
+            time.sleep(0.1)
+        self._write_state(pid=process.pid, port=self.port, headless=self.headless, started_at=time.time(),
+                          launch_ms=(time.perf_counter() - started) * 1000)
+        logger.info(f"Browser server started (pid {process.pid}) on {self.endpoint}.")
+
+    def stop(self):
+        """Zatrzymuje przeglądarkę z pliku stanu i czeka, aż proces się zakończy (port i profil są wolne)."""
+        state = self.state()
+        pid = state.get("pid")
+        if pid and _alive(pid):
+            if self._owns(pid, state.get("port", self.port)):
+                if not _terminate(pid, STOP_TIMEOUT_S):
+                    raise RuntimeError(f"Chromium (pid {pid}) nie zakończył się w {STOP_TIMEOUT_S} s.")
+                logger.info(f"Browser server (pid {pid}) stopped.")
+            else:
+                logger.warning(f"Pid {pid} from {self.state_path} is not our browser - leaving it alone.")
+        self.state_path.unlink(missing_ok=True)
+
+    def _owns(self, pid: int, port: int) -> bool:
+        """Proces `pid` to Chromium z naszym portem CDP i profilem (według jego linii poleceń)."""
+        try:
+            args = Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace").split("\0")
+        except OSError:
+            # Bez /proc (macOS, Windows) wystarczy, że na porcie ze stanu odpowiada CDP.
+            return port == self.port and self.healthy()
+        return f"--remote-debugging-port={port}" in args and f"--user-data-dir={self.profile_dir}" in args
+
+    def connect(self) -> tuple[Browser, AttachReport]:
+        """Podłącza się do działającej przeglądarki; jeśli nie odpowiada, uruchamia ją od nowa."""
+        started = time.perf_counter()
+        with self._lock():
+            fresh = not self.healthy()
+            if fresh:
+                logger.info("Browser server not running or unhealthy - starting a new one.")
+                self.start()
+            try:
+                browser = self.playwright.chromium.connect_over_cdp(self.endpoint, timeout=10000)
+            except Error as e:
+                # Proces odpowiada na /json/version, ale nie przyjmuje połączeń - restart.
+                logger.warning(f"Could not attach to browser server ({e}) - restarting.")
+                self.start()
+                fresh = True
+                browser = self.playwright.chromium.connect_over_cdp(self.endpoint, timeout=10000)
+        attach_ms = (time.perf_counter() - started) * 1000
+        if fresh:
+            # Pierwsze podłączenie po starcie to koszt zimnego uruchomienia - punkt odniesienia dla kolejnych.
+            self._write_state(**{**self.state(), "cold_launch_ms": attach_ms})
+        report = AttachReport(started=fresh, attach_ms=attach_ms, cold_launch_ms=self.state().get("cold_launch_ms"))
+        logger.info(f"Browser server: {report.describe()}")
+        return browser, report
+
+    def _write_state(self, **state):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+    @contextmanager
+    def _lock(self):
+        # Workery xdist podłączają się jednocześnie - tylko jeden może uruchomić przeglądarkę.
+        if fcntl is None:
+            yield
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "lock", "w") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        # Zakończony proces potomny (start i stop w tym samym procesie) trzeba odebrać, inaczej wisi jako zombie.
+        if hasattr(os, "WNOHANG") and os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _terminate(pid: int, timeout: float) -> bool:
+    """SIGTERM, a po `timeout` s SIGKILL; True, gdy proces się zakończył."""
+    for sig in (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            return True
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not _alive(pid):
+                return True
+            time.sleep(0.05)
+    return not _alive(pid)
+
+
+def main(argv=None):
+    from playwright.sync_api import sync_playwright
+
+    parser = argparse.ArgumentParser(prog="python -m utils.browser_server",
+                                     description="Długo żyjący Chromium dla pytest --reuse-browser.")
+    parser.add_argument("command", choices=("status", "start", "stop"))
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    with sync_playwright() as playwright:
+        server = BrowserServer(playwright, port=args.port, headless=not args.headed)
+        if args.command == "start":
+            server.start()
+        elif args.command == "stop":
+            server.stop()
+        else:
+            state = server.state()
+            print(f"{'działa' if server.healthy() else 'nie działa'}: {server.endpoint} {json.dumps(state)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+# Flaga ustawiana przez skrypt startowy - BasePage sprawdza ją, żeby pominąć sondowanie popupów.
+CONSENT_FLAG = "__idreamConsentSeeded"
+
+# Skrypt wstrzykiwany do każdego kontekstu: oznacza stronę jako "po zgodzie"
+# i ukrywa popup 'bhr', zanim zdąży się wyrenderować.
+SUPPRESS_POPUPS_SCRIPT = """
+(() => {
+    window.%s = true;
+    const css = 'div.bhr-board__canvas.type--POPUP { display: none !important; }';
+    const inject = () => {
+        const style = document.createElement('style');
+        style.dataset.consentState = 'seeded';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) {
+        inject();
+    } else {
+        document.addEventListener('DOMContentLoaded', inject);
+    }
+})();
+""" % CONSENT_FLAG
+
+# Dogrywa localStorage ze snapshotu (`origins` ze storage_state) do kontekstu, który już istnieje.
+# Marker sprawia, że dzieje się to tylko w pierwszym dokumencie danego originu - późniejsze zmiany
+# strony nie są nadpisywane przy każdej nawigacji.
+SEED_ORIGINS_SCRIPT = """
+(origins => {
+    const MARKER = '__idreamConsentOriginsSeeded';
+    const items = origins[location.origin];
+    try {
+        if (!items || localStorage.getItem(MARKER)) return;
+        for (const { name, value } of items) localStorage.setItem(name, value);
+        localStorage.setItem(MARKER, '1');
+    } catch (e) {}
+})(%s);
+"""
+
+DEFAULT_DIRECTORY = Path(__file__).resolve().parent.parent / ".consent"
+DEFAULT_MAX_AGE_SECONDS = 12 * 60 * 60
+
+_active: Optional["ConsentState"] = None
+
+
+def report_stale(reason: str):
+    """
+    Zgłasza, że zapisany stan zgody przestał działać (np. baner cookies pojawił się
+    mimo wstrzykniętego stanu). Snapshot zostanie przebudowany przy następnym kontekście.
+    """
+    if _active is not None:
+        _active.mark_stale(reason)
+
+
+class ConsentState:
+    """
+    Stan zgody (cookies + popup 'bhr') budowany raz na worker i zapisywany jako
+    Playwright storage_state. Każdy nowy kontekst dostaje ten stan oraz skrypt
+    ukrywający popup 'bhr', więc BasePage nie musi sondować popupów po nawigacji.
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, base_url: str, directory: Path = DEFAULT_DIRECTORY, worker_id: Optional[str] = None,
+                 max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS):
+        self.base_url = base_url
+        self.worker_id = worker_id or os.environ.get("PYTEST_XDIST_WORKER", "master")
+        self.max_age_seconds = max_age_seconds
+        self.storage_path = Path(directory) / f"consent-{self.worker_id}.json"
+        self.meta_path = Path(directory) / f"consent-{self.worker_id}.meta.json"
+        self._stale_reason: Optional[str] = None
+        self._browser: Optional[Browser] = None
+        self._dismiss: Optional[Callable[[Page], None]] = None
+
+    def staleness_reason(self) -> Optional[str]:
+        """Zwraca powód, dla którego snapshot trzeba przebudować, albo None, jeśli jest aktualny."""
+        if self._stale_reason:
+            return self._stale_reason
+        if not self.storage_path.exists() or not self.meta_path.exists():
+            return "snapshot missing"
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            state = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            return f"snapshot unreadable ({e})"
+        if meta.get("schema") != self.SCHEMA_VERSION:
+            return "schema version changed"
+        if meta.get("base_url") != self.base_url:
+            return f"base url changed ({meta.get('base_url')} -> {self.base_url})"
+        if time.time() - meta.get("created_at", 0) > self.max_age_seconds:
+            return "snapshot older than max age"
+        now = time.time()
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            if cookie.get("name") in meta.get("cookie_names", []) and 0 < expires < now:
+                return f"cookie '{cookie['name']}' expired"
+        return None
+
+    def mark_stale(self, reason: str):
+        logger.warning(f"Consent snapshot marked stale: {reason}")
+        self._stale_reason = reason
+
+    def build(self, browser: Browser, dismiss: Callable[[Page], None]):
+        """Otwiera czysty kontekst, zamyka popupy przez `dismiss` i zapisuje stan."""
+        logger.info(f"Building consent snapshot for worker '{self.worker_id}'...")
+        started = time.perf_counter()
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            dismiss(page)
+            state = context.storage_state(path=str(self.storage_path))
+        finally:
+            context.close()
+
+        meta = {
+            "schema": self.SCHEMA_VERSION,
+            "base_url": self.base_url,
+            "created_at": time.time(),
+            "cookie_names": [cookie["name"] for cookie in state.get("cookies", [])],
+        }
+        self.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        self._stale_reason = None
+        logger.info(f"✅ Consent snapshot saved to {self.storage_path} in {time.perf_counter() - started:.1f}s.")
+
+    def ensure(self, browser: Browser, dismiss: Callable[[Page], None]) -> bool:
+        """Przebudowuje snapshot, jeśli jest nieaktualny. Zwraca True, gdy doszło do przebudowy."""
+        global _active
+        self._browser, self._dismiss = browser, dismiss
+        _active = self
+
+        reason = self.staleness_reason()
+        if reason is None:
+            logger.info(f"Reusing consent snapshot {self.storage_path}.")
+            return False
+        logger.info(f"Consent snapshot needs rebuild: {reason}.")
+        self.build(browser, dismiss)
+        return True
+
+    def apply(self, context: BrowserContext):
+        """
+        Wstrzykuje skrypt ukrywający popupy do kontekstu. Jeśli w trakcie sesji snapshot
+        został uznany za nieaktualny, najpierw go przebudowuje i dogrywa świeży stan:
+        cookies oraz localStorage (`origins`), którego nie da się ustawić na gotowym kontekście wprost.
+        """
+        if self._stale_reason and self._browser is not None:
+            self.build(self._browser, self._dismiss)
+            state = json.loads(self.storage_path.read_text(encoding="utf-8"))
+            context.add_cookies(state.get("cookies", []))
+            origins = {origin["origin"]: origin.get("localStorage", []) for origin in state.get("origins", [])}
+            if origins:
+                context.add_init_script(SEED_ORIGINS_SCRIPT % json.dumps(origins))
+        context.add_init_script(SUPPRESS_POPUPS_SCRIPT)
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import urljoin
+
+from playwright.sync_api import Browser, BrowserContext, Error
+
+logger = logging.getLogger(__name__)
+
+RESET_PATH = "__context_pool_reset__"
+CLEAR_STORAGE_SCRIPT = """
+items => {
+    localStorage.clear();
+    sessionStorage.clear();
+    for (const { name, value } of items) {
+        localStorage.setItem(name, value);
+    }
+}
+"""
+
+
+@dataclass
+class PoolMetrics:
+    created: int = 0
+    leases: int = 0
+    resets: int = 0
+    discarded: int = 0
+    warmup_ms: float = 0.0
+    reset_ms: float = 0.0
+
+    def describe(self) -> str:
+        avg_reset = self.reset_ms / self.resets if self.resets else 0.0
+        return (f"created {self.created} (warm-up {self.warmup_ms / 1000:.1f}s), leases {self.leases}, "
+                f"resets {self.resets} (avg {avg_reset:.0f} ms), discarded {self.discarded}")
+
+
+class ContextPool:
+    """
+    Pula rozgrzanych kontekstów przeglądarki dla jednego procesu (workera xdist).
+    Kontekst jest tworzony z gotowym stanem zgody i raz ładuje stronę główną, żeby
+    zapełnić cache HTTP. Po teście kontekst wraca do puli po resecie, który czyści
+    cookies, storage, uprawnienia, trasy i strony, ale zostawia cache i skrypty startowe.
+    Kontekst, który się nie zresetował (albo test oznaczył go jako brudny), jest wyrzucany.
+    """
+
+    def __init__(self, browser: Browser, context_args: dict, base_url: str, size: int = 2,
+                 prepare: Optional[Callable[[BrowserContext], None]] = None, warm_up: bool = True):
+        self.browser = browser
+        self.context_args = context_args
+        self.base_url = base_url
+        self.size = size
+        self.prepare = prepare
+        self.warm_up = warm_up
+        self.worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+        self.metrics = PoolMetrics()
+        self._idle: list[BrowserContext] = []
+        self._baseline_cookies, self._baseline_local_storage = self._load_baseline_state()
+
+    def _load_baseline_state(self) -> tuple[list, list]:
+        """Cookies i localStorage ze storage_state - przywracamy je po każdym resecie."""
+        storage_state = self.context_args.get("storage_state")
+        if not storage_state:
+            return [], []
+        if isinstance(storage_state, dict):
+            state = storage_state
+        else:
+            with open(storage_state, encoding="utf-8") as f:
+                state = json.load(f)
+        local_storage = []
+        for origin in state.get("origins", []):
+            if self.base_url.startswith(origin.get("origin", "")):
+                local_storage.extend(origin.get("localStorage", []))
+        return state.get("cookies", []), local_storage
+
+    def fill(self):
+        """Tworzy z góry tyle kontekstów, ile wynosi rozmiar puli."""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+
+    def _create(self) -> BrowserContext:
+        started = time.perf_counter()
+        context = self.browser.new_context(**self.context_args)
+        if self.prepare:
+            self.prepare(context)
+        if self.warm_up:
+            page = context.new_page()
+            try:
+                page.goto(self.base_url, wait_until="load", timeout=45000)
+            except Error as e:
+                logger.warning(f"Context warm-up navigation failed: {e}")
+            page.close()
+        self.metrics.created += 1
+        self.metrics.warmup_ms += (time.perf_counter() - started) * 1000
+        return context
+
+    def lease(self) -> BrowserContext:
+        context = self._idle.pop() if self._idle else self._create()
+        self.metrics.leases += 1
+        return context
+
+    def release(self, context: BrowserContext, dirty: bool = False):
+        if dirty:
+            self._discard(context, "marked dirty")
+            return
+        started = time.perf_counter()
+        try:
+            self.reset(context)
+        except Error as e:
+            self._discard(context, f"reset failed: {e}")
+            return
+        self.metrics.resets += 1
+        self.metrics.reset_ms += (time.perf_counter() - started) * 1000
+        if len(self._idle) < self.size:
+            self._idle.append(context)
+        else:
+            context.close()
+
+    def reset(self, context: BrowserContext):
+        for page in list(context.pages):
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        if self._baseline_cookies:
+            context.add_cookies(self._baseline_cookies)
+
+        # localStorage jest per origin, więc potrzebujemy dokumentu z tego originu. Podstawiamy
+        # pustą odpowiedź przez route - reset nie dotyka sieci ani serwera.
+        reset_url = urljoin(self.base_url, RESET_PATH)
+        page = context.new_page()
+        page.route(reset_url, lambda route: route.fulfill(status=200, content_type="text/html", body="<html></html>"))
+        page.goto(reset_url)
+        page.evaluate(CLEAR_STORAGE_SCRIPT, self._baseline_local_storage)
+        page.close()
+
+    def _discard(self, context: BrowserContext, reason: str):
+        logger.info(f"Discarding pooled context ({reason}).")
+        self.metrics.discarded += 1
+        try:
+            context.close()
+        except Error:
+            pass
+
+    def close(self):
+        for context in self._idle:
+            context.close()
+        self._idle = []
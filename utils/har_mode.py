@@ -0,0 +1,72 @@
+import logging
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext, Route
+
+from utils.artifacts import artifact_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HAR_DIR = Path(__file__).resolve().parent.parent / "tests" / "har"
+
+HAR_MODES = ("off", "record", "replay")
+UNMATCHED_POLICIES = ("abort", "fallback", "fail")
+
+
+class HarRecordingMissing(Exception):
+    pass
+
+
+class HarSession:
+    """
+    Nagrywanie i odtwarzanie ruchu sieciowego pojedynczego testu przez `route_from_har`.
+
+    - record: ruch testu jest zapisywany do pliku HAR (przy zamknięciu kontekstu),
+    - replay: odpowiedzi są serwowane z HAR, bez sieci; żądania spoza nagrania są
+      obsługiwane zgodnie z polityką: abort (przerwij), fallback (przepuść do sieci)
+      albo fail (przerwij i oblej test z listą brakujących URL-i).
+    """
+
+    def __init__(self, mode: str, test_id: str, directory: Path = DEFAULT_HAR_DIR, unmatched: str = "abort"):
+        if mode not in HAR_MODES:
+            raise ValueError(f"Nieznany tryb HAR: '{mode}'")
+        if unmatched not in UNMATCHED_POLICIES:
+            raise ValueError(f"Nieznana polityka dla żądań spoza HAR: '{unmatched}'")
+        self.mode = mode
+        self.unmatched = unmatched
+        self.path = Path(directory) / f"{artifact_name(test_id)}.har.zip"
+        self.unmatched_urls: list[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def install_unmatched_guard(self, context: BrowserContext):
+        """
+        Trasa o najniższym priorytecie - rejestrujemy ją przed innymi trasami kontekstu.
+        Łapie żądania, których nie było w nagraniu (polityka 'fail').
+        """
+        if self.mode == "replay" and self.unmatched == "fail":
+            context.route("**/*", self._reject_unmatched)
+
+    def install(self, context: BrowserContext):
+        """Trasa HAR - rejestrujemy ją jako ostatnią, żeby była sprawdzana jako pierwsza."""
+        if self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Recording network traffic to {self.path}")
+            context.route_from_har(self.path, update=True, update_content="attach", update_mode="minimal")
+        elif self.mode == "replay":
+            if not self.path.exists():
+                raise HarRecordingMissing(f"Brak nagrania {self.path} - uruchom test z --har-mode=record.")
+            logger.info(f"Replaying network traffic from {self.path} (unmatched: {self.unmatched})")
+            not_found = "abort" if self.unmatched == "abort" else "fallback"
+            context.route_from_har(self.path, not_found=not_found)
+
+    def take_unmatched(self) -> list[str]:
+        """Zwraca żądania spoza nagrania zebrane od poprzedniego wywołania (każde jest zgłaszane raz)."""
+        urls, self.unmatched_urls = self.unmatched_urls, []
+        return urls
+
+    def _reject_unmatched(self, route: Route):
+        self.unmatched_urls.append(route.request.url)
+        route.abort()
@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Statusy, przy których serwer mógł po prostu nie obsłużyć HEAD - ponawiamy wtedy GET-em.
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 501}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class LinkCheckResult:
+    url: str
+    status: Optional[int] = None
+    method: str = "HEAD"
+    latency_ms: float = 0.0
+    attempts: int = 0
+    redirects: list[str] = field(default_factory=list)
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class LinkHealthChecker:
+    """
+    Równoległe sprawdzanie linków na wspólnej sesji keep-alive (pula wątków).
+    Każdy link: HEAD, a gdy serwer go nie obsługuje - GET (bez pobierania treści),
+    z zapisem łańcucha przekierowań, limitem równoległych zapytań na host
+    i ponowieniami z wykładniczym odstępem przy błędach sieci, 429 i 5xx.
+    """
+
+    def __init__(self, max_workers: int = 16, per_host: int = 6, timeout: float = 15.0, retries: int = 2,
+                 backoff: float = 0.5, user_agent: str = "idream-link-health/1.0"):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = user_agent
+        self._host_limits: dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_host))
+        self._host_lock = threading.Lock()
+
+    def check(self, urls: Iterable[str]) -> list[LinkCheckResult]:
+        """Sprawdza wszystkie (unikalne) linki i zwraca wyniki w kolejności wejścia."""
+        unique = list(dict.fromkeys(urls))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self.check_one, unique))
+        logger.info(f"Checked {len(results)} links in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        return results
+
+    def check_one(self, url: str) -> LinkCheckResult:
+        result = LinkCheckResult(url=url)
+        with self._host_limit(url):
+            started = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                result.attempts = attempt + 1
+                try:
+                    response = self._request("HEAD", url)
+                    result.method = "HEAD"
+                    if response.status_code in HEAD_FALLBACK_STATUSES:
+                        response = self._request("GET", url)
+                        result.method = "GET"
+                    result.status = response.status_code
+                    result.redirects = [f"{r.status_code} {r.url}" for r in response.history]
+                    result.final_url = response.url
+                    result.error = None
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                except requests.RequestException as e:
+                    result.error = f"{type(e).__name__}: {e}"
+                if attempt < self.retries:
+                    time.sleep(self.backoff * 2 ** attempt)
+            result.latency_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def _request(self, method: str, url: str) -> requests.Response:
+        response = self.session.request(method, url, timeout=self.timeout, allow_redirects=True, stream=True)
+        response.close()
+        return response
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            return self._host_limits[host]
+
+    def close(self):
+        self.session.close()
+
+
+def format_report(results: list[LinkCheckResult]) -> str:
+    lines = []
+    for r in sorted(results, key=lambda r: r.latency_ms, reverse=True):
+        state = "OK" if r.ok else f"BŁĄD ({r.error or r.status})"
+        redirects = f" via {' -> '.join(r.redirects)}" if r.redirects else ""
+        lines.append(f"  {state:<12} {r.method:<4} [{r.status}] {r.latency_ms:6.0f} ms "
+                     f"(prób: {r.attempts}) {r.url}{redirects}")
+    return "\n".join(lines)
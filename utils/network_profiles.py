@@ -0,0 +1,131 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import BrowserContext, Request, Response, Route
+
+logger = logging.getLogger(__name__)
+
+FIRST_PARTY_HOSTS = ("idream.pl", "idrim.ovh")
+
+# Skrypty i widgety firm trzecich, które nie mają znaczenia dla testów funkcjonalnych.
+THIRD_PARTY_HOSTS = (
+    "bhr",
+    "salesmanago",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "analytics.tiktok.com",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo",
+    "trustpilot",
+)
+
+# Rozmiary odpowiedzi (z nagłówka content-length) zapamiętane w tym procesie. Dzięki nim
+# możemy oszacować, ile bajtów zaoszczędziło zablokowanie żądania, którego nie pobieramy.
+_SIZE_HINTS: dict[str, int] = {}
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    blocked_resource_types: frozenset = frozenset()
+    blocked_hosts: tuple = ()
+
+    def block_reason(self, request: Request) -> Optional[str]:
+        """Zwraca powód zablokowania żądania albo None, jeśli ma przejść."""
+        host = urlparse(request.url).hostname or ""
+        if any(host == fp or host.endswith("." + fp) for fp in FIRST_PARTY_HOSTS):
+            if request.resource_type in self.blocked_resource_types:
+                return request.resource_type
+            return None
+        if any(pattern in host for pattern in self.blocked_hosts):
+            return "third-party"
+        if request.resource_type in self.blocked_resource_types:
+            return request.resource_type
+        return None
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_hosts)
+
+
+PROFILES = {
+    profile.name: profile for profile in (
+        NetworkProfile("full-fidelity"),
+        NetworkProfile("no-images", blocked_resource_types=frozenset({"image", "media"})),
+        NetworkProfile(
+            "functional-minimal",
+            blocked_resource_types=frozenset({"image", "media", "font"}),
+            blocked_hosts=THIRD_PARTY_HOSTS,
+        ),
+    )
+}
+
+
+@dataclass
+class BlockStats:
+    requests: int = 0
+    known_bytes: int = 0
+    by_reason: Counter = field(default_factory=Counter)
+
+    def add(self, other: "BlockStats"):
+        self.requests += other.requests
+        self.known_bytes += other.known_bytes
+        self.by_reason.update(other.by_reason)
+
+
+class RequestBlocker:
+    """
+    Warstwa `context.route` blokująca żądania zgodnie z wybranym profilem.
+    Żądania, które przechodzą, są oddawane dalej przez `route.fallback()`, więc
+    blocker można łączyć z innymi trasami (np. odtwarzaniem HAR).
+    """
+
+    def __init__(self, profile: NetworkProfile):
+        self.profile = profile
+        self.stats = BlockStats()
+
+    @classmethod
+    def for_profile(cls, name: str) -> "RequestBlocker":
+        if name not in PROFILES:
+            raise ValueError(f"Nieznany profil sieciowy: '{name}'. Dostępne: {', '.join(PROFILES)}")
+        return cls(PROFILES[name])
+
+    def install(self, context: BrowserContext):
+        context.on("response", self._learn_size)
+        if self.profile.blocks_anything:
+            context.route("**/*", self._handle)
+
+    def uninstall(self, context: BrowserContext):
+        """Zdejmuje listener i trasę - dla kontekstów z puli, które dostają nowy blocker w każdym teście."""
+        context.remove_listener("response", self._learn_size)
+        if self.profile.blocks_anything:
+            context.unroute("**/*", self._handle)
+
+    def _handle(self, route: Route):
+        reason = self.profile.block_reason(route.request)
+        if reason is None:
+            route.fallback()
+            return
+        self.stats.requests += 1
+        self.stats.known_bytes += _SIZE_HINTS.get(route.request.url, 0)
+        self.stats.by_reason[reason] += 1
+        route.abort("blockedbyclient")
+
+    @staticmethod
+    def _learn_size(response: Response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            _SIZE_HINTS[response.url] = int(length)
+
+    def describe(self) -> str:
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in self.stats.by_reason.most_common())
+        return (f"profile '{self.profile.name}' blocked {self.stats.requests} requests "
+                f"(~{self.stats.known_bytes / 1024:.0f} KiB known) [{reasons or 'none'}]")
@@ -0,0 +1,152 @@
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TypeVar, Union
+
+from playwright.sync_api import BrowserContext, Dialog, Error, Page, Response
+
+from utils.sleep_detector import poll_pause
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Nawigację startujemy z poziomu strony, więc wywołanie wraca od razu i kilka stron
+# może ładować się równolegle. Znacznik zostaje na starym dokumencie - jego brak
+# oznacza, że przeglądarka przełączyła się już na nowy.
+START_NAVIGATION_SCRIPT = "([url, token]) => { window.__poolToken = token; window.location.href = url; }"
+READY_SCRIPT = "() => window.__poolToken === undefined && document.readyState !== 'loading'"
+
+
+@dataclass
+class NavigationOutcome:
+    url: str
+    status: Optional[int] = None
+    elapsed_ms: float = 0.0
+    dialogs: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class _Slot:
+    def __init__(self, page: Page):
+        self.page = page
+        self.item = None
+        self.outcome: Optional[NavigationOutcome] = None
+        self.started = 0.0
+        self.ready_at: Optional[float] = None
+        page.on("response", self._on_response)
+        page.on("dialog", self._on_dialog)
+
+    @property
+    def busy(self) -> bool:
+        return self.outcome is not None
+
+    def _on_response(self, response: Response):
+        if self.outcome is not None and response.request.is_navigation_request() \
+                and response.frame == self.page.main_frame:
+            self.outcome.status = response.status
+
+    def _on_dialog(self, dialog: Dialog):
+        if self.outcome is not None:
+            self.outcome.dialogs.append(f"{dialog.type}: {dialog.message}")
+        dialog.dismiss()
+
+
+class PagePool:
+    """
+    Mała pula stron w jednym kontekście. `map_unordered` rozdziela elementy między strony,
+    startuje nawigacje bez blokowania i zwraca wyniki w kolejności, w jakiej strony
+    skończą się ładować - łączny czas jest bliski najwolniejszej stronie, a nie sumie.
+    Elementy są pobierane z iteratora dopiero, gdy zwolni się strona.
+    """
+
+    def __init__(self, context: Union[BrowserContext, Sequence[BrowserContext]], size: int = 3):
+        # Przy kilku kontekstach `size` to liczba stron na każdy z nich.
+        self.contexts = list(context) if isinstance(context, (list, tuple)) else [context]
+        self.size = size
+        self._slots: list[_Slot] = []
+
+    def __enter__(self) -> "PagePool":
+        self._slots = [_Slot(context.new_page()) for context in self.contexts for _ in range(self.size)]
+        return self
+
+    def __exit__(self, *exc):
+        for slot in self._slots:
+            slot.page.close()
+        self._slots = []
+
+    @property
+    def pages(self) -> list[Page]:
+        return [slot.page for slot in self._slots]
+
+    def map_unordered(self, items: Iterable[T], url_for: Callable[[T], str],
+                      finish: Callable[[Page, T, NavigationOutcome], R],
+                      timeout: int = 30000, settle: int = 0, poll: int = 50) -> Iterator[R]:
+        """
+        Dla każdego elementu nawiguje do `url_for(item)` i po załadowaniu (DOMContentLoaded
+        + opcjonalnie `settle` ms na spóźnione dialogi) woła `finish(page, item, outcome)`.
+        """
+        if not self._slots:
+            raise RuntimeError("PagePool musi być użyty jako context manager.")
+        pending = iter(items)
+        tokens = itertools.count(1)
+        exhausted = False
+
+        while True:
+            for slot in self._slots:
+                if not slot.busy and not exhausted:
+                    try:
+                        item = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    self._start(slot, item, url_for(item), next(tokens))
+
+            busy = [slot for slot in self._slots if slot.busy]
+            if not busy:
+                return
+
+            finished = False
+            for slot in busy:
+                if self._is_done(slot, timeout, settle):
+                    outcome, item = slot.outcome, slot.item
+                    outcome.elapsed_ms = (time.monotonic() - slot.started) * 1000
+                    yield finish(slot.page, item, outcome)
+                    slot.outcome, slot.item, slot.ready_at = None, None, None
+                    finished = True
+            if not finished:
+                # Nie time.sleep - w tym czasie Playwright obsługuje zdarzenia (response, framenavigated).
+                poll_pause(busy[0].page, poll)
+
+    @staticmethod
+    def _start(slot: _Slot, item, url: str, token: int):
+        slot.item = item
+        slot.outcome = NavigationOutcome(url=url)
+        slot.started = time.monotonic()
+        try:
+            slot.page.evaluate(START_NAVIGATION_SCRIPT, [url, token])
+        except Error as e:
+            slot.outcome.error = f"navigation not started: {e}"
+
+    @staticmethod
+    def _is_done(slot: _Slot, timeout: int, settle: int) -> bool:
+        now = time.monotonic()
+        if slot.outcome.error:
+            return True
+        if (now - slot.started) * 1000 > timeout:
+            slot.outcome.error = f"timeout after {timeout} ms"
+            return True
+        if slot.ready_at is None:
+            try:
+                if not slot.page.evaluate(READY_SCRIPT):
+                    return False
+            except Error:
+                # Kontekst wykonania zniknął w trakcie nawigacji - sprawdzimy w następnej rundzie.
+                return False
+            slot.ready_at = now
+            if slot.outcome.status is None:
+                slot.outcome.error = "navigation failed (no document response)"
+                return True
+        return (now - slot.ready_at) * 1000 >= settle
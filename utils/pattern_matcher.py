@@ -0,0 +1,36 @@
+import re
+from collections import defaultdict
+from typing import Iterable
+
+
+class MultiPatternMatcher:
+    """
+    Wyszukuje wiele fraz naraz w jednym przebiegu po tekście, bez rozróżniania wielkości liter.
+
+    Wszystkie frazy są kompilowane do jednego wyrażenia regularnego (alternatywa w lookahead,
+    od najdłuższej), które silnik `re` sprawdza na każdej pozycji w C - nie trzeba robić
+    `.lower()` na całym dokumencie ani przeszukiwać go osobno dla każdej frazy. Krótsze frazy
+    zawarte w dopasowaniu dłuższej (np. "root:" w "root:x:") są zaliczane automatycznie.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = sorted({p for p in patterns if p}, key=len, reverse=True)
+        if not self.patterns:
+            raise ValueError("MultiPatternMatcher wymaga co najmniej jednej frazy.")
+        alternation = "|".join(re.escape(p) for p in self.patterns)
+        self._regex = re.compile(f"(?=({alternation}))", re.IGNORECASE | re.DOTALL)
+
+        # Dla każdej frazy (po casefold) - wszystkie frazy, które się w niej zawierają.
+        self._implied: dict[str, set[str]] = defaultdict(set)
+        for outer in self.patterns:
+            for inner in self.patterns:
+                if inner.casefold() in outer.casefold():
+                    self._implied[outer.casefold()].add(inner)
+
+    def scan(self, text: str) -> set[str]:
+        found: set[str] = set()
+        for match in self._regex.finditer(text):
+            found |= self._implied[match.group(1).casefold()]
+            if len(found) == len(self.patterns):
+                break
+        return found
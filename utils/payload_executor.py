@@ -0,0 +1,103 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from pages.home_page import HomePage, SearchResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PayloadVerdict:
+    payload: str
+    status: Optional[int]
+    elapsed_ms: float
+    waf_blocked: bool
+    dialogs: list[str] = field(default_factory=list)
+    reflected: bool = False
+    findings: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def vulnerable(self) -> bool:
+        if self.dialogs:
+            return True
+        return not self.waf_blocked and bool(self.findings)
+
+
+@dataclass
+class PayloadReport:
+    verdicts: list[PayloadVerdict]
+    wall_ms: float
+
+    @property
+    def vulnerable(self) -> list[PayloadVerdict]:
+        return [v for v in self.verdicts if v.vulnerable]
+
+    @property
+    def errors(self) -> list[PayloadVerdict]:
+        return [v for v in self.verdicts if v.error]
+
+    def format(self) -> str:
+        slowest = max((v.elapsed_ms for v in self.verdicts), default=0.0)
+        lines = [f"{len(self.verdicts)} payloadów w {self.wall_ms:.0f} ms (najwolniejszy {slowest:.0f} ms):"]
+        for v in self.verdicts:
+            if v.error:
+                state = f"BŁĄD ({v.error})"
+            elif v.vulnerable:
+                state = f"PODATNOŚĆ (dialogi: {v.dialogs or '-'}, wskaźniki: {v.findings or '-'})"
+            elif v.waf_blocked:
+                state = "zablokowany przez WAF"
+            else:
+                state = "OK"
+            lines.append(f"  [{v.status}] {v.elapsed_ms:6.0f} ms  {v.payload[:60]!r}: {state}")
+        return "\n".join(lines)
+
+
+class PayloadExecutor:
+    """
+    Rozkłada listę payloadów na pulę stron w jednym kontekście (HomePage.perform_searches).
+    Każda strona ma nasłuch na dialogi, a na spóźnione alerty (np. onerror obrazka) dajemy
+    `dialog_grace_ms` po załadowaniu. Łączny czas jest bliski najwolniejszemu payloadowi.
+    """
+
+    def __init__(self, home_page: HomePage, pool_size: int = 5, dialog_grace_ms: int = 1500):
+        self.home_page = home_page
+        self.pool_size = pool_size
+        self.dialog_grace_ms = dialog_grace_ms
+
+    def run(self, payloads: Iterable[str],
+            inspect: Optional[Callable[[str, str], list[str]]] = None) -> PayloadReport:
+        """
+        `inspect(payload, page_source)` zwraca listę wykrytych wskaźników podatności.
+        Domyślnie sprawdzamy, czy payload wrócił w treści strony bez zakodowania.
+        """
+        inspect = inspect or self.reflected_payload
+        started = time.perf_counter()
+        verdicts = []
+        for result in self.home_page.perform_searches(payloads, pool_size=self.pool_size, with_content=True,
+                                                      settle_ms=self.dialog_grace_ms):
+            verdict = self._verdict(result, inspect)
+            logger.info(f"Payload {result.query[:60]!r}: {'PODATNOŚĆ' if verdict.vulnerable else 'ok'} "
+                        f"({verdict.elapsed_ms:.0f} ms)")
+            verdicts.append(verdict)
+        return PayloadReport(verdicts=verdicts, wall_ms=(time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    def reflected_payload(payload: str, page_source: str) -> list[str]:
+        return [f"payload odbity w treści: {payload}"] if payload in page_source else []
+
+    @staticmethod
+    def _verdict(result: SearchResult, inspect: Callable[[str, str], list[str]]) -> PayloadVerdict:
+        findings = inspect(result.query, result.content) if result.content is not None else []
+        return PayloadVerdict(
+            payload=result.query,
+            status=result.status,
+            elapsed_ms=result.elapsed_ms,
+            waf_blocked=result.waf_blocked,
+            dialogs=result.dialogs,
+            reflected=result.content is not None and result.query in result.content,
+            findings=findings,
+            error=result.error,
+        )
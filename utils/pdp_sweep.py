@@ -0,0 +1,303 @@
+"""
+Przegląd wielu stron produktu (PDP): adresy z pliku albo sitemapy, sprawdzane na puli stron
+w kilku kontekstach. Wyniki są dopisywane do JSONL w miarę napływania, a punkt kontrolny
+pozwala wznowić przegląd po awarii. Pamięć nie rośnie z rozmiarem katalogu.
+
+    python -m utils.pdp_sweep --sitemap https://idream.pl/sitemap.xml --output pdp.jsonl --resume
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import requests
+from playwright.sync_api import BrowserContext, Error, Page
+
+from pages.product_page import ProductPage
+from utils.page_pool import NavigationOutcome, PagePool
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_URL_PATTERN = r"\.html$"
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+# Zestaw na PDP doładowuje się AJAX-em po przewinięciu. Przewijamy od razu po DOMContentLoaded,
+# żeby doładował się w czasie `settle` puli - odczyt w _check już na nic nie czeka.
+SCROLL_ON_READY_SCRIPT = "document.addEventListener('DOMContentLoaded', () => window.scrollTo(0, 1000));"
+
+
+# ----------------------------------------------------------------------
+# Źródła adresów (strumieniowo - nie trzymamy całej listy w pamięci)
+# ----------------------------------------------------------------------
+
+def urls_from_file(path: str) -> Iterator[str]:
+    """Jeden adres na linię; puste linie i komentarze (#) są pomijane."""
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def urls_from_sitemap(location: str, session: Optional[requests.Session] = None,
+                      timeout: int = 30) -> Iterator[str]:
+    """
+    Adresy z sitemapy (URL albo plik) parsowanej przyrostowo przez iterparse.
+    Indeks sitemap (<sitemapindex>) jest rozwijany rekurencyjnie.
+    """
+    nested: list[str] = []
+    if re.match(r"https?://", location):
+        session = session or requests.Session()
+        with session.get(location, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield from _parse_sitemap(response.raw, nested)
+    else:
+        with open(location, "rb") as handle:
+            yield from _parse_sitemap(handle, nested)
+    # Podsitemapy czytamy po zamknięciu bieżącego strumienia; ich lista jest krótka.
+    for loc in nested:
+        yield from urls_from_sitemap(loc, session, timeout)
+
+
+def _parse_sitemap(stream, nested: list[str]) -> Iterator[str]:
+    events = ElementTree.iterparse(stream, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if event == "end" and element.tag in (f"{SITEMAP_NS}url", f"{SITEMAP_NS}sitemap"):
+            loc = (element.findtext(f"{SITEMAP_NS}loc") or "").strip()
+            if loc and element.tag == f"{SITEMAP_NS}url":
+                yield loc
+            elif loc:
+                nested.append(loc)
+            # Wyczyszczony element zostaje dzieckiem korzenia - bez root.clear() lista rośnie z katalogiem.
+            element.clear()
+            root.clear()
+
+
+# ----------------------------------------------------------------------
+# Punkt kontrolny
+# ----------------------------------------------------------------------
+
+class SweepCheckpoint:
+    """
+    Postęp przeglądu jako "low watermark" (wszystkie indeksy poniżej są zrobione) plus
+    zbiór ukończonych indeksów powyżej niego. Strony kończą się poza kolejnością tylko
+    w obrębie puli, więc zbiór pozostaje mały niezależnie od rozmiaru katalogu.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self.low_watermark = 0
+        self.completed: set[int] = set()
+
+    def load(self) -> "SweepCheckpoint":
+        if self.path and self.path.exists():
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            self.low_watermark = state["low_watermark"]
+            self.completed = set(state["completed"])
+        return self
+
+    def absorb_output(self, output: Path):
+        """
+        Uzupełnia postęp o rekordy zapisane do JSONL po ostatnim zapisie punktu kontrolnego,
+        żeby po awarii żaden produkt nie został sprawdzony dwa razy.
+        """
+        if not output.exists():
+            return
+        with open(output, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    self.mark(json.loads(line)["index"])
+                except (ValueError, KeyError):
+                    # Ostatnia linia mogła zostać ucięta w trakcie awarii.
+                    continue
+
+    def done(self, index: int) -> bool:
+        return index < self.low_watermark or index in self.completed
+
+    def mark(self, index: int):
+        if self.done(index):
+            return
+        self.completed.add(index)
+        while self.low_watermark in self.completed:
+            self.completed.remove(self.low_watermark)
+            self.low_watermark += 1
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"low_watermark": self.low_watermark, "completed": sorted(self.completed)}),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# ----------------------------------------------------------------------
+# Przegląd
+# ----------------------------------------------------------------------
+
+@dataclass
+class PdpRecord:
+    index: int
+    url: str
+    status: Optional[int] = None
+    name: Optional[str] = None
+    price: Optional[str] = None
+    bundle: bool = False
+    missing: list[str] = field(default_factory=list)
+    navigation_ms: float = 0.0
+    check_ms: float = 0.0
+    failure: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.failure is None
+
+
+@dataclass
+class SweepSummary:
+    checked: int = 0
+    failed: int = 0
+    with_bundle: int = 0
+    skipped: int = 0
+    wall_ms: float = 0.0
+
+    def describe(self) -> str:
+        rate = self.checked / (self.wall_ms / 1000) if self.wall_ms else 0
+        return (f"{self.checked} PDP ({self.failed} błędów, {self.with_bundle} z zestawem, "
+                f"{self.skipped} pominiętych z punktu kontrolnego) w {self.wall_ms / 1000:.1f} s ({rate:.1f}/s)")
+
+
+class PdpSweep:
+    """
+    Sprawdza strony produktu na `pages_per_context` stronach w każdym z `contexts`.
+    Każdy wynik jest od razu dopisywany do `output` (JSONL); w pamięci zostają tylko liczniki.
+    Produkt bez nazwy, ceny, opisu lub specyfikacji jest błędem; zestaw (`bundle`) jest tylko raportowany -
+    strona dostaje na niego `bundle_settle` ms po DOMContentLoaded, w czasie których pula obsługuje inne strony.
+    """
+    REQUIRED = ("name", "price", "description", "specification")
+
+    def __init__(self, contexts: Sequence[BrowserContext], output: str, checkpoint: Optional[str] = None,
+                 pages_per_context: int = 4, bundle_settle: int = 2000, nav_timeout: int = 30000,
+                 checkpoint_every: int = 25):
+        self.contexts = list(contexts)
+        for context in self.contexts:
+            context.add_init_script(SCROLL_ON_READY_SCRIPT)
+        self.output = Path(output)
+        self.checkpoint = SweepCheckpoint(checkpoint)
+        self.pages_per_context = pages_per_context
+        self.bundle_settle = bundle_settle
+        self.nav_timeout = nav_timeout
+        self.checkpoint_every = checkpoint_every
+
+    def run(self, urls: Iterable[str], resume: bool = False,
+            url_pattern: Optional[str] = PRODUCT_URL_PATTERN) -> SweepSummary:
+        summary = SweepSummary()
+        if resume:
+            self.checkpoint.load().absorb_output(self.output)
+        elif self.output.exists():
+            self.output.unlink()
+        pattern = re.compile(url_pattern) if url_pattern else None
+
+        def pending() -> Iterator[tuple[int, str]]:
+            index = 0
+            for url in urls:
+                if pattern and not pattern.search(url):
+                    continue
+                if self.checkpoint.done(index):
+                    summary.skipped += 1
+                else:
+                    yield index, url
+                index += 1
+
+        started = time.perf_counter()
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.output, "a", encoding="utf-8") as out, \
+                PagePool(self.contexts, size=self.pages_per_context) as pool:
+            records = pool.map_unordered(pending(), url_for=lambda item: item[1], finish=self._check,
+                                         timeout=self.nav_timeout, settle=self.bundle_settle)
+            for record in records:
+                out.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+                out.flush()
+                self.checkpoint.mark(record.index)
+                summary.checked += 1
+                summary.failed += not record.ok
+                summary.with_bundle += record.bundle
+                if summary.checked % self.checkpoint_every == 0:
+                    self.checkpoint.save()
+                    logger.info(f"PDP sweep: {summary.checked} checked, {summary.failed} failed")
+        self.checkpoint.save()
+        summary.wall_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"PDP sweep: {summary.describe()}")
+        return summary
+
+    def _check(self, page: Page, item: tuple[int, str], outcome: NavigationOutcome) -> PdpRecord:
+        index, url = item
+        record = PdpRecord(index=index, url=url, status=outcome.status, navigation_ms=round(outcome.elapsed_ms, 1))
+        if outcome.error:
+            record.failure = outcome.error
+            return record
+        if outcome.status and outcome.status >= 400:
+            record.failure = f"HTTP {outcome.status}"
+            return record
+        started = time.perf_counter()
+        try:
+            details = ProductPage(page).read_details(bundle_timeout=0)
+        except Error as e:
+            record.failure = f"{type(e).__name__}: {e}"
+            return record
+        finally:
+            record.check_ms = round((time.perf_counter() - started) * 1000, 1)
+        record.name, record.price, record.bundle = details["name"], details["price"], details["bundle"] is not None
+        record.missing = [name for name in self.REQUIRED if not details[name]]
+        if record.missing:
+            record.failure = f"brak: {', '.join(record.missing)}"
+        return record
+
+
+def main(argv=None):
+    from playwright.sync_api import sync_playwright
+    from utils.network_profiles import PROFILES, RequestBlocker
+
+    parser = argparse.ArgumentParser(prog="python -m utils.pdp_sweep", description="Przegląd stron produktu.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--urls", help="Plik z adresami PDP (jeden na linię).")
+    source.add_argument("--sitemap", help="URL albo plik sitemapy (także indeks sitemap).")
+    parser.add_argument("--output", default="test-results/pdp-sweep.jsonl")
+    parser.add_argument("--checkpoint", default=None, help="Domyślnie <output>.checkpoint.json.")
+    parser.add_argument("--resume", action="store_true", help="Wznawia przegląd z punktu kontrolnego.")
+    parser.add_argument("--contexts", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=4, help="Stron na kontekst.")
+    parser.add_argument("--bundle-settle", type=int, default=2000,
+                        help="Ile ms po DOMContentLoaded strona dostaje na doładowanie zestawu.")
+    parser.add_argument("--network-profile", default="functional-minimal", choices=tuple(PROFILES))
+    parser.add_argument("--url-pattern", default=PRODUCT_URL_PATTERN, help="Filtr adresów (regex, '' = bez filtra).")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    urls = urls_from_file(args.urls) if args.urls else urls_from_sitemap(args.sitemap)
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed)
+        contexts = []
+        for _ in range(args.contexts):
+            context = browser.new_context(viewport={"width": 1920, "height": 1080})
+            RequestBlocker.for_profile(args.network_profile).install(context)
+            contexts.append(context)
+        sweep = PdpSweep(contexts, args.output, args.checkpoint or f"{args.output}.checkpoint.json",
+                         pages_per_context=args.pages, bundle_settle=args.bundle_settle)
+        summary = sweep.run(urls, resume=args.resume, url_pattern=args.url_pattern or None)
+        browser.close()
+    print(summary.describe())
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
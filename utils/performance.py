@@ -0,0 +1,319 @@
+import json
+import logging
+import statistics
+import weakref
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Page
+
+logger = logging.getLogger(__name__)
+
+# Instalowany przed skryptami strony: zbiera długie zadania (>50 ms na głównym wątku), kandydatów LCP
+# i przesunięcia układu (CLS liczony oknami sesji jak w web-vitals). INP nie mierzymy - bez prawdziwych
+# interakcji użytkownika (i poniżej progu 16 ms Event Timing) dawałby brak pomiaru albo szum.
+# Powiększa też bufor Resource Timing (domyślnie 250 wpisów).
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.__perfObserver) return;
+    const state = window.__perfObserver = {
+        longTasks: [], lcp: null, cls: 0, unsupported: [],
+        _session: { value: 0, first: 0, last: 0 },
+    };
+    const observe = (type, options, onEntry) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(onEntry)).observe({ type, buffered: true, ...options });
+        } catch (e) {
+            state.unsupported.push(type);
+        }
+    };
+    try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+    observe('longtask', {}, entry => state.longTasks.push(entry.duration));
+    observe('largest-contentful-paint', {}, entry => { state.lcp = entry.startTime; });
+    observe('layout-shift', {}, entry => {
+        if (entry.hadRecentInput) return;
+        const session = state._session;
+        if (session.value && entry.startTime - session.last < 1000 && entry.startTime - session.first < 5000) {
+            session.value += entry.value;
+        } else {
+            session.value = entry.value;
+            session.first = entry.startTime;
+        }
+        session.last = entry.startTime;
+        state.cls = Math.max(state.cls, session.value);
+    });
+})();
+"""
+
+# Navigation Timing + Resource Timing + długie zadania jednym evaluate. Strona "własna" to ta sama
+# domena rejestrowa (idream.pl i jej subdomeny); wszystko inne liczymy jako third-party.
+COLLECT_SCRIPT = """
+() => {
+    const [nav] = performance.getEntriesByType('navigation');
+    const site = location.hostname.split('.').slice(-2).join('.');
+    const firstParty = host => host === site || host.endsWith('.' + site);
+    let transfer = nav ? nav.transferSize : 0, thirdPartyBytes = 0, requests = 0, thirdPartyRequests = 0;
+    for (const entry of performance.getEntriesByType('resource')) {
+        let host;
+        try { host = new URL(entry.name).hostname; } catch (e) { continue; }
+        const bytes = entry.transferSize || 0;
+        requests += 1;
+        transfer += bytes;
+        if (!firstParty(host)) {
+            thirdPartyRequests += 1;
+            thirdPartyBytes += bytes;
+        }
+    }
+    const observer = window.__perfObserver;
+    const longTasks = observer && !observer.unsupported.includes('longtask') ? observer.longTasks : null;
+    return {
+        url: location.href,
+        ttfb_ms: nav ? nav.responseStart : null,
+        dom_content_loaded_ms: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+        transfer_bytes: transfer,
+        third_party_bytes: thirdPartyBytes,
+        requests,
+        third_party_requests: thirdPartyRequests,
+        long_tasks: longTasks ? longTasks.length : null,
+        long_task_ms: longTasks ? longTasks.reduce((a, b) => a + b, 0) : null,
+    };
+}
+"""
+
+# Core Web Vitals z OBSERVER_SCRIPT; null, gdy obserwatora nie było (strona otwarta przed instalacją)
+# albo przeglądarka nie wspiera danego typu wpisu (LCP/CLS są tylko w Chromium).
+VITALS_SCRIPT = """
+() => {
+    const observer = window.__perfObserver;
+    const [nav] = performance.getEntriesByType('navigation');
+    const supported = type => observer && !observer.unsupported.includes(type);
+    return {
+        url: location.href,
+        lcp_ms: supported('largest-contentful-paint') ? observer.lcp : null,
+        cls: supported('layout-shift') ? observer.cls : null,
+        ttfb_ms: nav ? nav.responseStart : null,
+    };
+}
+"""
+
+_observed_pages = weakref.WeakSet()
+
+
+def install_performance_observer(page: Page):
+    """Dodaje OBSERVER_SCRIPT do strony (raz) - działa od następnej nawigacji."""
+    if page in _observed_pages:
+        return
+    page.add_init_script(OBSERVER_SCRIPT)
+    _observed_pages.add(page)
+
+
+@dataclass
+class PerformanceSnapshot:
+    """
+    Metryki bieżącego dokumentu (czasy w ms od początku nawigacji). Bajty cross-origin bez
+    Timing-Allow-Origin przeglądarka raportuje jako 0, dlatego udział third-party liczymy po żądaniach.
+    """
+    url: str
+    ttfb_ms: Optional[float]
+    dom_content_loaded_ms: Optional[float]
+    load_ms: Optional[float]
+    transfer_bytes: int
+    third_party_bytes: int
+    requests: int
+    third_party_requests: int
+    long_tasks: Optional[int]
+    long_task_ms: Optional[float]
+
+    @property
+    def complete(self) -> bool:
+        """Zdarzenie load się zakończyło - liczniki zasobów nie są już częściowe."""
+        return self.load_ms is not None
+
+    @property
+    def third_party_share(self) -> float:
+        return self.third_party_requests / self.requests if self.requests else 0.0
+
+    def describe(self) -> str:
+        def ms(value):
+            return f"{value:.0f} ms" if value is not None else "-"
+        return (f"TTFB {ms(self.ttfb_ms)}, DCL {ms(self.dom_content_loaded_ms)}, load {ms(self.load_ms)}, "
+                f"{self.transfer_bytes / 1024:.0f} KiB w {self.requests} żądaniach "
+                f"({self.third_party_share:.0%} third-party), długie zadania: {self.long_tasks}")
+
+
+@dataclass
+class WebVitals:
+    """LCP i TTFB w ms, CLS bez jednostki; None = brak pomiaru."""
+    url: str
+    lcp_ms: Optional[float]
+    cls: Optional[float]
+    ttfb_ms: Optional[float]
+
+    def describe(self) -> str:
+        def value(number, unit=" ms", digits=0):
+            return f"{number:.{digits}f}{unit}" if number is not None else "-"
+        return f"LCP {value(self.lcp_ms)}, CLS {value(self.cls, '', 3)}, TTFB {value(self.ttfb_ms)}"
+
+
+@dataclass
+class BudgetViolation:
+    metric: str
+    limit: float
+    actual: float
+
+    def describe(self) -> str:
+        def number(value):
+            return f"{value:.0f}" if value >= 10 else f"{value:.2f}"
+        return f"{self.metric} {number(self.actual)} > {number(self.limit)}"
+
+
+@dataclass(frozen=True)
+class PerformanceBudget:
+    """
+    Limity dla jednego typu strony; None = metryka nie jest sprawdzana. Czasy i bajty rosną
+    monotonicznie, więc przekroczenie jest pewne także przed zdarzeniem load; udział third-party
+    sprawdzamy dopiero na kompletnej stronie.
+    """
+    name: str
+    ttfb_ms: Optional[float] = None
+    dom_content_loaded_ms: Optional[float] = None
+    transfer_bytes: Optional[int] = None
+    third_party_share: Optional[float] = None
+    long_tasks: Optional[int] = None
+
+    def check(self, snapshot: PerformanceSnapshot) -> list[BudgetViolation]:
+        actual = {
+            "ttfb_ms": snapshot.ttfb_ms,
+            "dom_content_loaded_ms": snapshot.dom_content_loaded_ms,
+            "transfer_bytes": snapshot.transfer_bytes,
+            "third_party_share": round(snapshot.third_party_share, 3) if snapshot.complete else None,
+            "long_tasks": snapshot.long_tasks,
+        }
+        return [
+            BudgetViolation(metric, limit, actual[metric])
+            for metric, limit in asdict(self).items()
+            if metric != "name" and limit is not None and actual[metric] is not None and actual[metric] > limit
+        ]
+
+
+@dataclass
+class PerformanceCheck:
+    budget: str
+    snapshot: PerformanceSnapshot
+    violations: list[BudgetViolation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def describe(self) -> str:
+        status = "OK" if self.ok else "; ".join(v.describe() for v in self.violations)
+        # Automatyczny pomiar po nawigacji nie czeka na load - bajty i żądania są wtedy częściowe.
+        partial = "" if self.snapshot.complete else ", częściowy (przed load)"
+        return f"[{self.budget}] {self.snapshot.url}: {status} ({self.snapshot.describe()}{partial})"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PerformanceCheck":
+        return cls(budget=data["budget"], snapshot=PerformanceSnapshot(**data["snapshot"]),
+                   violations=[BudgetViolation(**v) for v in data["violations"]])
+
+
+class PerformanceRecorder:
+    """Zbiera sprawdzenia budżetów bieżącego testu; poza testem (current=None) nic nie zapisuje."""
+
+    def __init__(self):
+        self.enabled = False
+        self.current: Optional[list[PerformanceCheck]] = None
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self.current is not None
+
+    def record(self, check: PerformanceCheck):
+        if self.current is not None:
+            self.current.append(check)
+
+
+PERFORMANCE_RECORDER = PerformanceRecorder()
+
+
+class PerformanceBudgetPlugin:
+    """
+    Plugin pytest: sprawdzenia budżetów z każdego testu w user_properties i sekcji raportu,
+    podsumowanie per typ strony w terminalu. W trybie 'enforce' przekroczenie oblewa test.
+    Mediany w podsumowaniu liczymy tylko z pomiarów po zdarzeniu load (kompletnych).
+    """
+
+    def __init__(self, mode: str = "report"):
+        self.mode = mode
+        self.checks: dict[str, list[PerformanceCheck]] = defaultdict(list)
+        self.violations: dict[str, list[PerformanceCheck]] = {}
+        PERFORMANCE_RECORDER.enabled = mode != "off"
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        PERFORMANCE_RECORDER.current = []
+        try:
+            yield
+        finally:
+            PERFORMANCE_RECORDER.current = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        checks = PERFORMANCE_RECORDER.current
+        if report.when != "teardown" or not checks:
+            return
+        for check in checks:
+            self.checks[check.budget].append(check)
+        report.user_properties.append(("performance", json.dumps(
+            [{"budget": c.budget, **asdict(c.snapshot), "complete": c.snapshot.complete,
+              "violations": [v.describe() for v in c.violations]} for c in checks])))
+        report.sections.append(("performance budgets", "\n".join(check.describe() for check in checks)))
+        failed = [check for check in checks if not check.ok]
+        if not failed:
+            return
+        self.violations[item.nodeid] = failed
+        if self.mode == "enforce" and report.passed:
+            report.outcome = "failed"
+            report.longrepr = "Przekroczone budżety wydajności:\n" + "\n".join(c.describe() for c in failed)
+
+    def export(self) -> dict:
+        """Sprawdzenia w postaci do przesłania z workera xdist (workeroutput)."""
+        return {
+            "checks": {budget: [asdict(c) for c in checks] for budget, checks in self.checks.items()},
+            "violations": {nodeid: [asdict(c) for c in checks] for nodeid, checks in self.violations.items()},
+        }
+
+    def merge(self, exported: dict):
+        """Dolicza sprawdzenia z innego procesu (np. workera xdist) do podsumowania."""
+        for budget, checks in exported.get("checks", {}).items():
+            self.checks[budget].extend(PerformanceCheck.from_dict(c) for c in checks)
+        for nodeid, checks in exported.get("violations", {}).items():
+            self.violations[nodeid] = [PerformanceCheck.from_dict(c) for c in checks]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.checks:
+            return
+        terminalreporter.section("Budżety wydajności")
+        for budget, checks in sorted(self.checks.items()):
+            complete = [c.snapshot for c in checks if c.snapshot.complete]
+            ttfb = [s.ttfb_ms for s in complete if s.ttfb_ms is not None]
+            dcl = [s.dom_content_loaded_ms for s in complete if s.dom_content_loaded_ms is not None]
+            load = [s.load_ms for s in complete]
+            failed = sum(not c.ok for c in checks)
+
+            def median(values):
+                return f"{statistics.median(values):.0f} ms" if values else "-"
+            terminalreporter.write_line(
+                f"{budget}: {len(checks)} pomiarów ({len(checks) - len(complete)} częściowych), "
+                f"{failed} z przekroczeniem; z kompletnych: mediana TTFB {median(ttfb)}, "
+                f"DCL {median(dcl)}, load {median(load)}"
+            )
+        for nodeid, checks in self.violations.items():
+            for check in checks:
+                terminalreporter.write_line(f"  {nodeid}: {check.describe()}")
@@ -0,0 +1,151 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from playwright.sync_api import BrowserContext, Error, Page
+
+from pages.base_page import BasePage
+from utils.page_pool import READY_SCRIPT, START_NAVIGATION_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+LOGO = ".top-logo img[alt='Logo iDream']"
+
+# Widoczność wszystkich sprawdzanych elementów jednym wywołaniem: element jest "widoczny",
+# jeśli choć jedno dopasowanie ma niezerowy rozmiar i nie jest ukryte stylem.
+VISIBILITY_SCRIPT = """
+checks => Object.fromEntries(Object.entries(checks).map(([name, selector]) => {
+    const visible = Array.from(document.querySelectorAll(selector)).some(el => {
+        const rect = el.getBoundingClientRect();
+        const style = getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    });
+    return [name, visible];
+}))
+"""
+
+
+@dataclass(frozen=True)
+class Breakpoint:
+    name: str
+    width: int
+    height: int
+
+    @property
+    def viewport(self) -> dict:
+        return {"width": self.width, "height": self.height}
+
+
+DEFAULT_BREAKPOINTS = (
+    Breakpoint("desktop", 1920, 1080),
+    Breakpoint("tablet", 768, 1024),
+    Breakpoint("mobile", 375, 812),
+)
+
+
+@dataclass
+class BreakpointResult:
+    breakpoint: str
+    missing: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    screenshot: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and self.error is None
+
+    def describe(self) -> str:
+        if self.error:
+            return f"{self.breakpoint}: {self.error}"
+        if self.missing:
+            return f"{self.breakpoint}: niewidoczne {', '.join(self.missing)} (zrzut: {self.screenshot})"
+        return f"{self.breakpoint}: OK ({self.elapsed_ms:.0f} ms)"
+
+
+@dataclass(frozen=True)
+class _Check:
+    selector: str
+    only: Optional[frozenset] = None
+
+    def applies_to(self, name: str) -> bool:
+        return self.only is None or name in self.only
+
+
+class ResponsivenessSweep:
+    """
+    Sprawdza widoczność logo i zarejestrowanych elementów na kolejnych breakpointach
+    po jednej nawigacji: zmienia rozmiar okna, czeka na stabilny układ i sprawdza
+    wszystkie elementy jednym evaluate. Do prawdziwej emulacji urządzeń (user agent,
+    dotyk) służy `run_on_devices`.
+    """
+
+    def __init__(self, breakpoints: Sequence[Breakpoint] = DEFAULT_BREAKPOINTS, quiet_ms: int = 300,
+                 timeout: int = 10000, screenshot_prefix: str = "screenshot_error"):
+        self.breakpoints = tuple(breakpoints)
+        self.quiet_ms = quiet_ms
+        self.timeout = timeout
+        self.screenshot_prefix = screenshot_prefix
+        self._checks: dict[str, _Check] = {"logo": _Check(LOGO)}
+
+    def register(self, name: str, selector: str, only: Optional[Sequence[str]] = None) -> "ResponsivenessSweep":
+        """Dodaje element do sprawdzenia; `only` ogranicza go do wybranych breakpointów (po nazwie)."""
+        self._checks[name] = _Check(selector, frozenset(only) if only else None)
+        return self
+
+    def run(self, page_object: BasePage, open_page: bool = True) -> list[BreakpointResult]:
+        if open_page:
+            page_object.open_page_and_handle_initial_popups()
+        results = []
+        for breakpoint in self.breakpoints:
+            page_object.set_viewport(breakpoint.viewport)
+            results.append(self.check(page_object, breakpoint.name))
+        return results
+
+    def check(self, page_object: BasePage, name: str) -> BreakpointResult:
+        """Sprawdza elementy dla breakpointu `name` na stronie w jej obecnym rozmiarze."""
+        checks = {check_name: check.selector for check_name, check in self._checks.items()
+                  if check.applies_to(name)}
+        result = BreakpointResult(breakpoint=name)
+        started = time.perf_counter()
+        try:
+            page_object.wait_for_layout_stable(checks.values(), quiet_ms=self.quiet_ms, timeout=self.timeout)
+            visibility = page_object.page.evaluate(VISIBILITY_SCRIPT, checks)
+        except Error as e:
+            result.error = f"{type(e).__name__}: {e}"
+            return result
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        result.missing = [check_name for check_name, visible in visibility.items() if not visible]
+        if result.missing:
+            result.screenshot = f"{self.screenshot_prefix}_{name}.png"
+            page_object.page.screenshot(path=result.screenshot)
+        logger.info(f"Responsywność {result.describe()}")
+        return result
+
+    def run_on_devices(self, new_context: Callable[..., BrowserContext], devices: dict[str, dict],
+                       page_object_cls: type = BasePage, timeout: int = 45000) -> list[BreakpointResult]:
+        """
+        Emulacja urządzeń wymaga osobnych kontekstów (user agent, dotyk, DPR ustawia się przy tworzeniu).
+        Nawigacje startują na wszystkich kontekstach naraz, potem każdy jest sprawdzany po kolei.
+        `devices` to np. {"iPhone 13": playwright.devices["iPhone 13"]}.
+        """
+        pages: dict[str, Page] = {}
+        for name, descriptor in devices.items():
+            # Deskryptory z playwright.devices zawierają też typ przeglądarki, którego new_context nie przyjmuje.
+            context_args = {key: value for key, value in descriptor.items() if key != "default_browser_type"}
+            pages[name] = new_context(**context_args).new_page()
+        for token, (name, page) in enumerate(pages.items(), start=1):
+            page.evaluate(START_NAVIGATION_SCRIPT, [page_object_cls.URL, token])
+
+        results = []
+        for name, page in pages.items():
+            try:
+                page.wait_for_function(READY_SCRIPT, polling=100, timeout=timeout)
+            except Error as e:
+                results.append(BreakpointResult(breakpoint=name, error=f"navigation: {e}"))
+                continue
+            page_object = page_object_cls(page)
+            page_object.handle_initial_popups()
+            results.append(self.check(page_object, name))
+        return results
@@ -0,0 +1,81 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pages.home_page import HomePage
+from utils.payload_executor import PayloadReport, PayloadVerdict
+from utils.pattern_matcher import MultiPatternMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class HttpSecurityScanner:
+    """
+    Skaner payloadów bez renderowania: zapytania idą równolegle z ograniczonej puli wątków
+    na wspólnej sesji keep-alive (APIRequestContext Playwrighta w wersji sync nie jest
+    bezpieczny dla wątków). Treść odpowiedzi dekodujemy raz i przepuszczamy przez jeden
+    MultiPatternMatcher. Przeglądarka zostaje potrzebna tylko do wykrywania dialogów XSS.
+    """
+
+    def __init__(self, url_for: Callable[[str], str] = HomePage.search_url, max_workers: int = 8,
+                 timeout: float = 30.0, session: Optional[requests.Session] = None):
+        self.url_for = url_for
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def scan(self, payloads: Iterable[str], indicators: Iterable[str],
+             payload_indicators: Optional[Callable[[str], Iterable[str]]] = None) -> PayloadReport:
+        """
+        `indicators` - wspólne wskaźniki podatności (np. komunikaty błędów SQL),
+        `payload_indicators(payload)` - dodatkowe frazy zależne od payloadu (np. sam payload).
+        Wskaźniki WAF i frazy payloadu trafiają do tego samego matchera, więc treść czytamy jeden raz.
+        Werdykty są w kolejności payloadów.
+        """
+        indicators = list(indicators)
+        waf_indicators = set(HomePage.WAF_INDICATORS)
+        shared = MultiPatternMatcher(indicators + list(waf_indicators))
+
+        def scan_one(payload: str) -> PayloadVerdict:
+            extra = list(payload_indicators(payload)) if payload_indicators else []
+            matcher = MultiPatternMatcher(indicators + list(waf_indicators) + extra) if extra else shared
+            return self._scan_one(payload, matcher, waf_indicators)
+
+        payloads = list(payloads)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(payloads)))) as pool:
+            verdicts = list(pool.map(scan_one, payloads))
+        report = PayloadReport(verdicts=verdicts, wall_ms=(time.perf_counter() - started) * 1000)
+        logger.info(f"HTTP scan: {len(verdicts)} payloads in {report.wall_ms:.0f} ms "
+                    f"({self.max_workers} workers).")
+        return report
+
+    def _scan_one(self, payload: str, matcher: MultiPatternMatcher, waf_indicators: set) -> PayloadVerdict:
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.url_for(payload), timeout=self.timeout)
+            text = response.content.decode("utf-8", errors="replace")
+        except requests.RequestException as e:
+            return PayloadVerdict(payload=payload, status=None, waf_blocked=False,
+                                  elapsed_ms=(time.perf_counter() - started) * 1000, error=str(e))
+
+        found = matcher.scan(text)
+        return PayloadVerdict(
+            payload=payload,
+            status=response.status_code,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            waf_blocked=response.status_code == 403 or bool(found & waf_indicators),
+            reflected=payload in text,
+            findings=sorted(found - waf_indicators),
+        )
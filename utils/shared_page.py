@@ -0,0 +1,87 @@
+import itertools
+import logging
+from typing import Callable, Generic, Optional, TypeVar
+
+from playwright.sync_api import Error, Frame, Page
+
+from pages.base_page import BasePage
+
+logger = logging.getLogger(__name__)
+
+P = TypeVar("P", bound=BasePage)
+
+# Zdarzenia wywołane przez użytkownika (Playwright generuje je jako "trusted") - test tylko
+# do odczytu nie powinien ich wywołać. Skrypt działa w każdym dokumencie tej strony, a lease()
+# instaluje go też w dokumencie otwartym przed add_init_script (np. karta z --reuse-tab).
+GUARD_SCRIPT = """
+(() => {
+    if (window.__readOnlyGuard) return;
+    window.__readOnlyGuard = { events: [] };
+    for (const type of ['click', 'input', 'keydown', 'submit', 'change']) {
+        document.addEventListener(type, event => {
+            if (!event.isTrusted) return;
+            const el = event.target;
+            const name = el && el.tagName ? el.tagName.toLowerCase() + (el.id ? '#' + el.id : '') : '?';
+            window.__readOnlyGuard.events.push(`${type} on ${name}`);
+        }, true);
+    }
+})();
+"""
+READ_GUARD_SCRIPT = """
+token => {
+    const guard = window.__readOnlyGuard;
+    return { sameDocument: window.__readOnlyToken === token, events: guard ? guard.events.splice(0) : [] };
+}
+"""
+
+
+class ReadOnlyPageGuard(Generic[P]):
+    """
+    Jedna załadowana strona współdzielona przez testy, które tylko czytają. Przed każdym testem
+    zapamiętujemy znacznik dokumentu; po teście sprawdzamy, czy nie było nawigacji głównej ramki
+    ani zdarzeń użytkownika (klik, wpisywanie, submit). Naruszenie oblewa test, a następny
+    test dostaje stronę załadowaną od nowa.
+    """
+
+    def __init__(self, page: Page, open_page: Callable[[Page], P]):
+        self.page = page
+        self._open_page = open_page
+        self._page_object: Optional[P] = None
+        self._tokens = itertools.count(1)
+        self._token = 0
+        self._navigations: list[str] = []
+        self.reloads = 0
+        page.add_init_script(GUARD_SCRIPT)
+        page.on("framenavigated", self._on_navigated)
+
+    def _on_navigated(self, frame: Frame):
+        if frame == self.page.main_frame:
+            self._navigations.append(frame.url)
+
+    def lease(self) -> P:
+        """Zwraca page object gotowej strony; po naruszeniu w poprzednim teście ładuje ją od nowa."""
+        if self._page_object is None:
+            if self.reloads:
+                logger.info("Shared read-only page was modified by the previous test - reloading.")
+            self._page_object = self._open_page(self.page)
+            self.reloads += 1
+        self._token = next(self._tokens)
+        self.page.evaluate(GUARD_SCRIPT)
+        self.page.evaluate("token => { window.__readOnlyToken = token; }", self._token)
+        self.page.evaluate(READ_GUARD_SCRIPT, self._token)  # zdarzenia z ładowania strony się nie liczą
+        self._navigations.clear()
+        return self._page_object
+
+    def release(self) -> list[str]:
+        """Zwraca listę naruszeń z bieżącego testu (pusta = strona nietknięta)."""
+        violations = [f"navigation to {url}" for url in self._navigations]
+        try:
+            state = self.page.evaluate(READ_GUARD_SCRIPT, self._token)
+            if not state["sameDocument"] and not violations:
+                violations.append("document replaced")
+            violations += [f"user event: {event}" for event in state["events"]]
+        except Error as e:
+            violations.append(f"page unusable: {e}")
+        if violations:
+            self._page_object = None
+        return violations
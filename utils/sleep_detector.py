@@ -0,0 +1,146 @@
+import functools
+import logging
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Frame, Page, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Ramki Playwrighta i wrapperów pomiarowych pomijamy przy szukaniu miejsca wywołania.
+_PLAYWRIGHT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(sys.modules[Page.__module__].__file__)))
+_WRAPPER_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "step_timing.py"),
+)
+
+
+def poll_pause(page: Page, ms: float):
+    """
+    Krótka pauza w pętli odpytywania page objectów i narzędzi (nie testu). W odróżnieniu od
+    time.sleep Playwright w tym czasie obsługuje zdarzenia strony, a w odróżnieniu od
+    wait_for_timeout nie trafia do detektora stałych pauz ani do pomiaru kroków.
+    """
+    if ms <= 0:
+        return
+    try:
+        page.wait_for_event("console", predicate=lambda message: False, timeout=ms)
+    except TimeoutError:
+        pass
+
+
+@dataclass
+class HardSleep:
+    call_site: str
+    ms: float
+
+
+def _call_site() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename not in _WRAPPER_FILES and not filename.startswith(_PLAYWRIGHT_DIR):
+            return f"{os.path.relpath(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class SleepDetector:
+    """
+    Rejestruje każde `wait_for_timeout` (stała pauza) z miejscem wywołania, osobno dla każdego testu.
+    Pauzy są liczone według żądanego czasu - tyle kosztują niezależnie od szybkości strony.
+    """
+
+    def __init__(self):
+        self.current: Optional[list[HardSleep]] = None
+        self.per_test: dict[str, float] = {}
+        self.per_site = defaultdict(lambda: {"calls": 0, "total_ms": 0.0})
+
+    def install(self):
+        for cls in (Page, Frame):
+            original = cls.wait_for_timeout
+            if getattr(original, "__sleep_detected__", False):
+                continue
+            setattr(cls, "wait_for_timeout", self._wrap(original))
+
+    def _wrap(self, original):
+        detector = self
+
+        @functools.wraps(original)
+        def wait_for_timeout(self, timeout: float):
+            detector.record(_call_site(), timeout)
+            return original(self, timeout)
+
+        wait_for_timeout.__sleep_detected__ = True
+        return wait_for_timeout
+
+    def record(self, call_site: str, ms: float):
+        if self.current is None:
+            return
+        self.current.append(HardSleep(call_site, ms))
+        self.per_site[call_site]["calls"] += 1
+        self.per_site[call_site]["total_ms"] += ms
+        logger.warning(f"Hard sleep {ms:.0f} ms at {call_site}")
+
+    def export(self) -> dict:
+        """Pauzy w postaci do przesłania z workera xdist (workeroutput)."""
+        return {"per_test": dict(self.per_test), "per_site": {site: dict(t) for site, t in self.per_site.items()}}
+
+    def merge(self, exported: dict):
+        """Dolicza pauzy z innego procesu (np. workera xdist) do podsumowania."""
+        self.per_test.update(exported.get("per_test", {}))
+        for call_site, totals in exported.get("per_site", {}).items():
+            self.per_site[call_site]["calls"] += totals["calls"]
+            self.per_site[call_site]["total_ms"] += totals["total_ms"]
+
+
+class SleepDetectorPlugin:
+    """Plugin pytest: suma pauz na test w user_properties, opcjonalny limit i podsumowanie w terminalu."""
+
+    def __init__(self, budget_ms: float = -1):
+        self.budget_ms = budget_ms
+        self.detector = SleepDetector()
+        self.detector.install()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.detector.current = []
+        try:
+            yield
+        finally:
+            self.detector.current = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        sleeps = self.detector.current
+        if report.when != "teardown" or sleeps is None:
+            return
+        total = sum(sleep.ms for sleep in sleeps)
+        if not total:
+            return
+        self.detector.per_test[item.nodeid] = total
+        report.user_properties.append(("hard_sleep_ms", total))
+        report.user_properties.append(("hard_sleeps", "; ".join(f"{s.ms:.0f} ms @ {s.call_site}" for s in sleeps)))
+        report.sections.append(("hard sleeps", "\n".join(f"{s.ms:8.0f} ms  {s.call_site}" for s in sleeps)))
+        if 0 <= self.budget_ms < total and report.passed:
+            report.outcome = "failed"
+            report.longrepr = (f"Stałe pauzy (wait_for_timeout) łącznie {total:.0f} ms przekraczają limit "
+                               f"{self.budget_ms:.0f} ms")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.detector.per_test:
+            return
+        terminalreporter.section("Stałe pauzy (wait_for_timeout)")
+        total = sum(self.detector.per_test.values())
+        terminalreporter.write_line(f"Łącznie {total / 1000:.1f} s w {len(self.detector.per_test)} testach.")
+        ranked = sorted(self.detector.per_site.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for call_site, totals in ranked:
+            terminalreporter.write_line(f"{totals['total_ms'] / 1000:8.2f}s  {totals['calls']:5d}x  {call_site}")
+        for nodeid, ms in sorted(self.detector.per_test.items(), key=lambda item: item[1], reverse=True):
+            terminalreporter.write_line(f"{ms / 1000:8.2f}s  {nodeid}")
@@ -0,0 +1,219 @@
+import functools
+import inspect
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from playwright.sync_api import Locator, LocatorAssertions, Page, PageAssertions, TimeoutError
+
+try:
+    import allure
+except ImportError:  # allure-pytest jest opcjonalny przy lokalnym uruchamianiu
+    allure = None
+
+from utils.artifacts import artifact_name
+
+logger = logging.getLogger(__name__)
+
+PAGE_METHODS = (
+    "goto", "reload", "go_back", "wait_for_load_state", "wait_for_url", "wait_for_function",
+    "wait_for_selector", "wait_for_timeout", "screenshot", "content", "evaluate", "set_viewport_size",
+)
+LOCATOR_METHODS = (
+    "click", "dblclick", "fill", "type", "press", "check", "hover", "is_visible", "is_enabled", "wait_for",
+    "text_content", "inner_text", "get_attribute", "evaluate_all", "all", "all_text_contents",
+    "scroll_into_view_if_needed", "screenshot",
+)
+
+
+@dataclass
+class Step:
+    name: str
+    kind: str
+    detail: Optional[str] = None
+    duration_ms: float = 0.0
+    timed_out: bool = False
+    timeout_ms: Optional[float] = None
+    error: Optional[str] = None
+    children: list["Step"] = field(default_factory=list)
+
+
+class StepRecorder:
+    """Zbiera drzewo kroków (metody page objectów i wywołania Playwrighta) dla jednego testu."""
+
+    def __init__(self, test_id: str):
+        self.test_id = test_id
+        self.roots: list[Step] = []
+        self._stack: list[Step] = []
+
+    @contextmanager
+    def step(self, name: str, kind: str, detail: Optional[str] = None, timeout_ms: Optional[float] = None):
+        step = Step(name=name, kind=kind, detail=detail, timeout_ms=timeout_ms)
+        (self._stack[-1].children if self._stack else self.roots).append(step)
+        self._stack.append(step)
+        started = time.perf_counter()
+        title = f"{name}({detail})" if detail else name
+        try:
+            with (allure.step(title) if allure is not None else nullcontext()):
+                yield step
+        except (TimeoutError, AssertionError) as e:
+            # Czekanie skończyło się bez spełnienia warunku - cały timeout poszedł na marne.
+            step.timed_out = True
+            step.error = type(e).__name__
+            raise
+        except Exception as e:
+            step.error = type(e).__name__
+            raise
+        finally:
+            step.duration_ms = (time.perf_counter() - started) * 1000
+            self._stack.pop()
+
+    def walk(self):
+        pending = list(self.roots)
+        while pending:
+            step = pending.pop()
+            yield step
+            pending.extend(step.children)
+
+    def summary(self) -> dict:
+        return {
+            "test": self.test_id,
+            "total_ms": sum(step.duration_ms for step in self.roots),
+            "timed_out_ms": sum(s.duration_ms for s in self.walk() if s.timed_out),
+            "sleep_ms": sum(s.duration_ms for s in self.walk() if s.kind == "sleep"),
+            "steps": [asdict(step) for step in self.roots],
+        }
+
+
+_current: Optional[StepRecorder] = None
+
+
+def current_recorder() -> Optional[StepRecorder]:
+    return _current
+
+
+def _detail(args) -> Optional[str]:
+    if args and isinstance(args[0], (str, int, float)):
+        return str(args[0])[:120]
+    return None
+
+
+def _timeout_reader(func):
+    """Zwraca funkcję wyciągającą `timeout` z argumentów wywołania - także podany pozycyjnie."""
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return lambda args, kwargs: kwargs.get("timeout")
+    if "timeout" not in signature.parameters:
+        return lambda args, kwargs: None
+
+    def read(args, kwargs):
+        try:
+            return signature.bind_partial(*args, **kwargs).arguments.get("timeout")
+        except TypeError:  # złe argumenty - oryginalna metoda i tak zgłosi błąd
+            return kwargs.get("timeout")
+    return read
+
+
+def _timed(name: str, kind: str, func):
+    step_kind = "sleep" if func.__name__ == "wait_for_timeout" else kind
+    read_timeout = _timeout_reader(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _current
+        if recorder is None:
+            return func(*args, **kwargs)
+        with recorder.step(name, step_kind, detail=_detail(args[1:]), timeout_ms=read_timeout(args, kwargs)):
+            return func(*args, **kwargs)
+
+    wrapper.__step_timed__ = True
+    return wrapper
+
+
+def instrument_page_object(cls):
+    """
+    Opakowuje metody zdefiniowane w klasie page objectu pomiarem czasu. Bez aktywnego
+    rekordera (opcja --step-timing wyłączona) wrapper od razu woła oryginalną metodę.
+    Pomijamy generatory i context managery - ich czas nie mieści się w jednym wywołaniu.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("__") or not inspect.isfunction(value) or getattr(value, "__step_timed__", False):
+            continue
+        if inspect.isgeneratorfunction(value) or hasattr(value, "__wrapped__"):
+            continue
+        setattr(cls, attr, _timed(f"{cls.__name__}.{attr}", "page-object", value))
+    return cls
+
+
+def install_playwright_hooks():
+    """Podpina pomiar pod wybrane metody Page, Locator i asercji `expect` (raz na proces)."""
+    targets = [(Page, PAGE_METHODS), (Locator, LOCATOR_METHODS)]
+    for assertions in (LocatorAssertions, PageAssertions):
+        targets.append((assertions, tuple(n for n in dir(assertions) if n.startswith(("to_", "not_to_")))))
+    for cls, names in targets:
+        for attr in names:
+            original = getattr(cls, attr, None)
+            if original is None or getattr(original, "__step_timed__", False):
+                continue
+            setattr(cls, attr, _timed(f"{cls.__name__}.{attr}", "playwright", original))
+
+
+class StepTimingPlugin:
+    """Plugin pytest: rekorder na czas całego testu (setup + call + teardown), artefakt JSON i ranking."""
+
+    def __init__(self, output_dir: Path, top: int = 15):
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.totals = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "timed_out_ms": 0.0})
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        global _current
+        _current = StepRecorder(item.nodeid)
+        try:
+            yield
+        finally:
+            recorder, _current = _current, None
+            self._store(recorder)
+
+    def _store(self, recorder: StepRecorder):
+        summary = recorder.summary()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{artifact_name(recorder.test_id)}.json"
+        path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        for step in recorder.walk():
+            totals = self.totals[step.name]
+            totals["calls"] += 1
+            totals["total_ms"] += step.duration_ms
+            if step.timed_out or step.kind == "sleep":
+                totals["timed_out_ms"] += step.duration_ms
+
+    def export(self) -> dict:
+        """Sumy kroków w postaci do przesłania z workera xdist (workeroutput)."""
+        return {name: dict(totals) for name, totals in self.totals.items()}
+
+    def merge(self, exported: dict):
+        """Dolicza sumy kroków z innego procesu (np. workera xdist) do rankingu."""
+        for name, totals in exported.items():
+            for key, value in totals.items():
+                self.totals[name][key] += value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.totals:
+            return
+        terminalreporter.section(f"Najdroższe kroki (top {self.top})")
+        ranked = sorted(self.totals.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:self.top]
+        for name, totals in ranked:
+            terminalreporter.write_line(
+                f"{totals['total_ms'] / 1000:8.2f}s  {totals['calls']:5d}x  "
+                f"(w tym timeouty/sleepy {totals['timed_out_ms'] / 1000:6.2f}s)  {name}"
+            )
+        terminalreporter.write_line(f"Szczegóły per test: {self.output_dir}")
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+from playwright.sync_api import Page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_DIR = Path(__file__).resolve().parent.parent / "tests" / "visual_baselines"
+DEFAULT_OUTPUT_DIR = Path("test-results/visual")
+
+# Regiony, które zmieniają się między uruchomieniami (ceny, karuzele, nakładki) - nie porównujemy ich pikseli.
+DYNAMIC_REGIONS = (
+    ".ty-price-num",
+    ".ty-price",
+    ".owl-carousel",
+    ".slick-slider",
+    ".ut2-banner",
+    "div.bhr-board__canvas",
+    "#bhr-items",
+    "iframe[title='salesmanago-consent-form-title']",
+    "[class*='cookie']",
+)
+
+# Prostokąty (w pikselach zrzutu, czyli z uwzględnieniem devicePixelRatio) wszystkich widocznych
+# dopasowań selektorów - maska zapisywana razem ze zrzutem.
+MASK_RECTS_SCRIPT = """
+selectors => {
+    const dpr = window.devicePixelRatio || 1;
+    const rects = [];
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            const r = el.getBoundingClientRect();
+            if (r.width > 0 && r.height > 0) {
+                rects.push([r.x, r.y, r.width, r.height].map(v => Math.round(v * dpr)));
+            }
+        }
+    }
+    return rects;
+}
+"""
+
+
+@dataclass
+class Snapshot:
+    name: str
+    variant: str  # np. nazwa breakpointu
+    path: str
+    masks: list[list[int]] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}/{self.variant}"
+
+
+@dataclass
+class CompareJob:
+    key: str
+    baseline: str
+    current: str
+    masks: list[list[int]]
+    diff_path: str
+    pixel_threshold: int = 16
+    max_diff_ratio: float = 0.001
+    # Ile z 256 bitów dHash może się różnić, zanim uznamy zmianę za dużą i pominiemy pełny diff; None = zawsze diff.
+    phash_fail_bits: Optional[int] = 32
+
+
+@dataclass
+class CompareResult:
+    key: str
+    passed: bool
+    diff_ratio: float = 0.0
+    changed_pixels: int = 0
+    # "digest" - pliki identyczne; "phash" - hash różni się tak bardzo, że test oblewamy bez pełnego diffu.
+    skipped_by: Optional[str] = None
+    hash_distance: Optional[int] = None
+    diff_path: Optional[str] = None
+    error: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.error:
+            return f"{self.key}: {self.error}"
+        if self.skipped_by == "phash":
+            return f"{self.key}: duża zmiana (dHash różni się o {self.hash_distance} bitów), pełny diff pominięty"
+        if self.skipped_by:
+            return f"{self.key}: bez zmian ({self.skipped_by})"
+        return (f"{self.key}: {self.changed_pixels} zmienionych pikseli ({self.diff_ratio:.4%})"
+                + ("" if self.passed else f", diff: {self.diff_path}"))
+
+
+def _load(path: str) -> np.ndarray:
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def _mask(shape: tuple, rects: Iterable[Sequence[int]]) -> np.ndarray:
+    """Maska True dla pikseli do porównania (poza regionami dynamicznymi)."""
+    keep = np.ones(shape[:2], dtype=bool)
+    height, width = shape[:2]
+    for x, y, w, h in rects:
+        keep[max(y, 0):min(y + h, height), max(x, 0):min(x + w, width)] = False
+    return keep
+
+
+def dhash(pixels: np.ndarray, keep: np.ndarray, hash_size: int = 16) -> np.ndarray:
+    """
+    Hash różnicowy (dHash): szarość z wyzerowanymi regionami dynamicznymi, zmniejszona
+    do (hash_size+1) x hash_size i porównanie sąsiednich kolumn. Zwraca wektor bitów.
+    """
+    gray = (pixels @ np.array([0.299, 0.587, 0.114])) * keep
+    small = np.asarray(Image.fromarray(gray.astype(np.uint8)).resize((hash_size + 1, hash_size), Image.BILINEAR),
+                       dtype=np.int16)
+    return (small[:, 1:] > small[:, :-1]).ravel()
+
+
+def compare(job: CompareJob) -> CompareResult:
+    """Porównuje zrzut z baseline (funkcja modułu, żeby dało się ją wysłać do procesu roboczego)."""
+    result = CompareResult(key=job.key, passed=False)
+    try:
+        if _digest(job.baseline) == _digest(job.current):
+            result.passed, result.skipped_by = True, "digest"
+            return result
+        baseline, current = _load(job.baseline), _load(job.current)
+        if baseline.shape != current.shape:
+            result.error = f"inny rozmiar: baseline {baseline.shape[1]}x{baseline.shape[0]}, " \
+                           f"obecny {current.shape[1]}x{current.shape[0]}"
+            return result
+
+        keep = _mask(current.shape, job.masks)
+        # Hash liczony z maską służy tylko do szybkiego oblania dużej zmiany. Zgodny hash niczego
+        # nie dowodzi (przesunięty przycisk czy zmieniony tekst go nie ruszają), więc wtedy zawsze pełny diff.
+        if job.phash_fail_bits is not None:
+            result.hash_distance = int(np.count_nonzero(dhash(baseline, keep) != dhash(current, keep)))
+            if result.hash_distance > job.phash_fail_bits:
+                result.skipped_by = "phash"
+                return result
+
+        delta = np.abs(baseline.astype(np.int16) - current.astype(np.int16)).max(axis=2)
+        changed = (delta > job.pixel_threshold) & keep
+        result.changed_pixels = int(changed.sum())
+        result.diff_ratio = result.changed_pixels / max(int(keep.sum()), 1)
+        result.passed = result.diff_ratio <= job.max_diff_ratio
+        if not result.passed:
+            _write_diff(current, changed, keep, job.diff_path)
+            result.diff_path = job.diff_path
+    except (OSError, ValueError) as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _digest(path: str) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _write_diff(current: np.ndarray, changed: np.ndarray, keep: np.ndarray, path: str):
+    # Przygaszony obecny zrzut, zmienione piksele na czerwono, zamaskowane regiony na szaro.
+    overlay = (current * 0.35).astype(np.uint8)
+    overlay[~keep] = (128, 128, 128)
+    overlay[changed] = (255, 0, 0)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(overlay).save(path)
+
+
+class VisualComparator:
+    """Porównuje wiele zrzutów równolegle w puli procesów - diff pikseli jest ograniczony przez CPU."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def compare_all(self, jobs: Sequence[CompareJob]) -> list[CompareResult]:
+        if len(jobs) <= 1 or self.max_workers == 1:
+            return [compare(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            return list(pool.map(compare, jobs))
+
+
+class VisualBaselines:
+    """
+    Zrzuty nazwane (strona + wariant, np. breakpoint) zapisywane obok maski regionów dynamicznych.
+    Brakujący baseline (albo `update=True`) jest zapisywany z bieżącego zrzutu zamiast porównania.
+    """
+
+    def __init__(self, baseline_dir: Path = DEFAULT_BASELINE_DIR, output_dir: Path = DEFAULT_OUTPUT_DIR,
+                 update: bool = False, pixel_threshold: int = 16, max_diff_ratio: float = 0.001,
+                 comparator: Optional[VisualComparator] = None):
+        self.baseline_dir = Path(baseline_dir)
+        self.output_dir = Path(output_dir)
+        self.update = update
+        self.pixel_threshold = pixel_threshold
+        self.max_diff_ratio = max_diff_ratio
+        self.comparator = comparator or VisualComparator()
+        self.written: list[str] = []
+
+    def baseline_path(self, snapshot: Snapshot) -> Path:
+        return self.baseline_dir / snapshot.name / f"{snapshot.variant}.png"
+
+    def capture(self, page: Page, name: str, variant: str,
+                dynamic_regions: Sequence[str] = DYNAMIC_REGIONS) -> Snapshot:
+        """Robi zrzut widocznej części strony i zapisuje prostokąty regionów dynamicznych."""
+        path = self.output_dir / "current" / name / f"{variant}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        masks = page.evaluate(MASK_RECTS_SCRIPT, list(dynamic_regions))
+        page.screenshot(path=str(path), animations="disabled", caret="hide")
+        return Snapshot(name=name, variant=variant, path=str(path), masks=masks)
+
+    def compare(self, snapshots: Sequence[Snapshot]) -> dict[str, CompareResult]:
+        jobs = []
+        results = {}
+        for snapshot in snapshots:
+            baseline = self.baseline_path(snapshot)
+            if self.update or not baseline.exists():
+                self._write_baseline(snapshot, baseline)
+                results[snapshot.key] = CompareResult(key=snapshot.key, passed=True, skipped_by="baseline written")
+                continue
+            jobs.append(CompareJob(
+                key=snapshot.key,
+                baseline=str(baseline),
+                current=snapshot.path,
+                masks=snapshot.masks + self._baseline_masks(baseline),
+                diff_path=str(self.output_dir / "diff" / snapshot.name / f"{snapshot.variant}.png"),
+                pixel_threshold=self.pixel_threshold,
+                max_diff_ratio=self.max_diff_ratio,
+            ))
+        for result in self.comparator.compare_all(jobs):
+            results[result.key] = result
+        return results
+
+    def _write_baseline(self, snapshot: Snapshot, baseline: Path):
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(snapshot.path, baseline)
+        baseline.with_suffix(".masks.json").write_text(json.dumps(snapshot.masks), encoding="utf-8")
+        self.written.append(snapshot.key)
+        logger.info(f"Visual baseline written: {baseline}")
+
+    @staticmethod
+    def _baseline_masks(baseline: Path) -> list[list[int]]:
+        # Region dynamiczny mógł się przesunąć - maskujemy jego położenie z obu zrzutów.
+        masks_path = baseline.with_suffix(".masks.json")
+        if not masks_path.exists():
+            return []
+        return json.loads(masks_path.read_text(encoding="utf-8"))
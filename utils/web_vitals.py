@@ -0,0 +1,278 @@
+"""
+Trendy Core Web Vitals (LCP, CLS) i TTFB z cyklicznych uruchomień: próbki trafiają do
+lokalnej bazy SQLite z kluczem build + URL + viewport, a raport porównuje ostatni build z poprzednimi
+(mediany kroczące, percentyle, test Manna-Whitneya dla regresji).
+
+    pytest -m vitals --build-id "$CI_PIPELINE_ID"   # bez builda (lokalnie) pomiary są tylko logowane
+    python -m utils.web_vitals --db test-results/web-vitals.sqlite [--build ID] [--metric lcp_ms]
+"""
+import argparse
+import math
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from utils.performance import WebVitals
+
+DEFAULT_DB = Path("test-results") / "web-vitals.sqlite"
+METRICS = ("lcp_ms", "cls", "ttfb_ms")
+# Zmiana mniejsza niż to nie jest zgłaszana jako regresja, nawet jeśli jest istotna statystycznie.
+MIN_ABSOLUTE_CHANGE = {"lcp_ms": 100.0, "cls": 0.02, "ttfb_ms": 50.0}
+BUILD_ENV_VARS = ("IDREAM_BUILD_ID", "CI_PIPELINE_ID", "GITHUB_RUN_ID", "BUILD_NUMBER")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    build_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    build_id TEXT NOT NULL REFERENCES builds(build_id),
+    recorded_at REAL NOT NULL,
+    page TEXT NOT NULL,
+    url TEXT NOT NULL,
+    viewport TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    lcp_ms REAL,
+    cls REAL,
+    ttfb_ms REAL
+);
+CREATE INDEX IF NOT EXISTS samples_key ON samples (url, viewport, build_id);
+"""
+
+
+def default_build_id() -> Optional[str]:
+    """
+    Numer builda z CI (albo jawnie ustawionego IDREAM_BUILD_ID); lokalnie None - uruchomienia
+    na maszynie dewelopera nie trafiają do bazy trendów, żeby nie zaburzać porównań buildów.
+    """
+    for name in BUILD_ENV_VARS:
+        if os.environ.get(name):
+            return os.environ[name]
+    return None
+
+
+@dataclass
+class VitalsSample:
+    build_id: str
+    page: str
+    url: str
+    viewport: str
+    width: int
+    height: int
+    lcp_ms: Optional[float]
+    cls: Optional[float]
+    ttfb_ms: Optional[float]
+
+    @classmethod
+    def from_vitals(cls, build_id: str, page: str, viewport: str, size: dict, vitals: WebVitals) -> "VitalsSample":
+        return cls(build_id=build_id, page=page, url=vitals.url, viewport=viewport, width=size["width"],
+                   height=size["height"], lcp_ms=vitals.lcp_ms, cls=vitals.cls, ttfb_ms=vitals.ttfb_ms)
+
+
+class VitalsStore:
+    """
+    Baza trendów w jednym pliku SQLite. WAL i timeout pozwalają dopisywać próbki z kilku
+    workerów xdist jednocześnie; kolejność buildów wyznacza pierwsza zapisana próbka.
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def append(self, sample: VitalsSample):
+        now = time.time()
+        with self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO builds (build_id, started_at) VALUES (?, ?)",
+                                     (sample.build_id, now))
+            self._connection.execute(
+                "INSERT INTO samples (build_id, recorded_at, page, url, viewport, width, height, "
+                "lcp_ms, cls, ttfb_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sample.build_id, now, sample.page, sample.url, sample.viewport, sample.width, sample.height,
+                 sample.lcp_ms, sample.cls, sample.ttfb_ms),
+            )
+
+    def builds(self) -> list[str]:
+        """Buildy od najstarszego do najnowszego."""
+        rows = self._connection.execute("SELECT build_id FROM builds ORDER BY started_at, build_id")
+        return [build_id for (build_id,) in rows]
+
+    def keys(self) -> list[tuple[str, str, str]]:
+        """(page, url, viewport) obecne w bazie."""
+        return list(self._connection.execute(
+            "SELECT DISTINCT page, url, viewport FROM samples ORDER BY page, url, viewport"))
+
+    def values(self, url: str, viewport: str, metric: str, builds: Sequence[str]) -> dict[str, list[float]]:
+        """Wartości metryki per build (bez brakujących pomiarów)."""
+        if metric not in METRICS:
+            raise ValueError(f"Nieznana metryka '{metric}'")
+        if not builds:
+            return {}
+        placeholders = ", ".join("?" * len(builds))
+        rows = self._connection.execute(
+            f"SELECT build_id, {metric} FROM samples WHERE url = ? AND viewport = ? AND {metric} IS NOT NULL "
+            f"AND build_id IN ({placeholders})",
+            (url, viewport, *builds),
+        )
+        series: dict[str, list[float]] = {build_id: [] for build_id in builds}
+        for build_id, value in rows:
+            series[build_id].append(value)
+        return series
+
+
+# ----------------------------------------------------------------------
+# Statystyka
+# ----------------------------------------------------------------------
+
+def percentile(values: Sequence[float], q: int) -> float:
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    return statistics.quantiles(ordered, n=100, method="inclusive")[q - 1]
+
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    Jednostronne p dla hipotezy "`current` jest stochastycznie większe niż `baseline`" (test U
+    Manna-Whitneya, przybliżenie normalne z poprawką na remisy i ciągłość). Nie zakłada rozkładu
+    normalnego czasów - ważne dla LCP, który ma długi ogon.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    ties = 0.0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        size = end - start + 1
+        ties += size ** 3 - size
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class TrendRow:
+    page: str
+    url: str
+    viewport: str
+    metric: str
+    samples: int
+    median: float
+    p75: float
+    p95: float
+    rolling_median: float
+    baseline_median: Optional[float] = None
+    p_value: Optional[float] = None
+    regression: bool = False
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline_median:
+            return None
+        return self.median / self.baseline_median - 1
+
+    def describe(self) -> str:
+        digits = 3 if self.metric == "cls" else 0
+        baseline = (f"baza {self.baseline_median:.{digits}f} ({self.change:+.0%}, p={self.p_value:.3f})"
+                    if self.baseline_median is not None and self.change is not None else "brak bazy")
+        flag = "  REGRESJA" if self.regression else ""
+        return (f"{self.page:8} {self.viewport:8} {self.metric:13} n={self.samples:<3} "
+                f"p50 {self.median:.{digits}f}  p75 {self.p75:.{digits}f}  p95 {self.p95:.{digits}f}  "
+                f"krocząca {self.rolling_median:.{digits}f}  {baseline}{flag}  {self.url}")
+
+
+def trend_report(store: VitalsStore, build: Optional[str] = None, metrics: Sequence[str] = METRICS,
+                 window: int = 5, baseline_builds: int = 5, alpha: float = 0.05,
+                 min_change: float = 0.1) -> Iterator[TrendRow]:
+    """
+    Dla każdego (strona, viewport, metryka) z próbkami w `build` (domyślnie ostatnim):
+    percentyle tego builda, mediana krocząca median z ostatnich `window` buildów oraz porównanie
+    z próbkami `baseline_builds` wcześniejszych buildów. Regresja = istotny wzrost (p < alpha)
+    większy niż `min_change` względnie i MIN_ABSOLUTE_CHANGE bezwzględnie.
+    """
+    builds = store.builds()
+    if not builds:
+        return
+    build = build or builds[-1]
+    if build not in builds:
+        raise ValueError(f"Brak builda '{build}' w bazie {store.path}")
+    history = builds[:builds.index(build) + 1]
+    previous = history[:-1][-baseline_builds:]
+
+    for page, url, viewport in store.keys():
+        for metric in metrics:
+            series = store.values(url, viewport, metric, history[-max(window, baseline_builds + 1):])
+            current = series.get(build) or []
+            if not current:
+                continue
+            medians = [statistics.median(series[b]) for b in history[-window:] if series.get(b)]
+            row = TrendRow(page=page, url=url, viewport=viewport, metric=metric, samples=len(current),
+                           median=statistics.median(current), p75=percentile(current, 75),
+                           p95=percentile(current, 95), rolling_median=statistics.median(medians))
+            baseline = [value for b in previous for value in series.get(b, [])]
+            if baseline:
+                row.baseline_median = statistics.median(baseline)
+                row.p_value = mann_whitney_greater(current, baseline)
+                increase = row.median - row.baseline_median
+                row.regression = (row.p_value < alpha
+                                  and increase > MIN_ABSOLUTE_CHANGE[metric]
+                                  and increase > min_change * row.baseline_median)
+            yield row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.web_vitals",
+                                     description="Raport trendów Core Web Vitals z bazy SQLite.")
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    parser.add_argument("--build", default=None, help="Build do porównania (domyślnie ostatni).")
+    parser.add_argument("--metric", action="append", choices=METRICS, help="Domyślnie wszystkie.")
+    parser.add_argument("--window", type=int, default=5, help="Buildów w medianie kroczącej.")
+    parser.add_argument("--baseline-builds", type=int, default=5, help="Wcześniejszych buildów jako baza.")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--min-change", type=float, default=0.1, help="Minimalny względny wzrost mediany.")
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        parser.error(f"Brak bazy {args.db} - uruchom najpierw: pytest -m vitals")
+    store = VitalsStore(args.db)
+    try:
+        rows = list(trend_report(store, build=args.build, metrics=args.metric or METRICS, window=args.window,
+                                 baseline_builds=args.baseline_builds, alpha=args.alpha,
+                                 min_change=args.min_change))
+        builds = store.builds()
+    finally:
+        store.close()
+    print(f"Build {args.build or (builds[-1] if builds else '-')} ({len(builds)} buildów w bazie)")
+    for row in rows:
+        print(row.describe())
+    regressions = [row for row in rows if row.regression]
+    print(f"{len(regressions)} regresji w {len(rows)} seriach.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())